@@ -7,6 +7,8 @@ Automatically detects the next chapter number and runs the complete workflow.
 
 Usage:
     ./generate_chapter.py [chapter_number]    # Generate a chapter (auto-detects next if not specified)
+    ./generate_chapter.py --no-cache          # Call the LLMs even for requests answered before
+    ./generate_chapter.py --no-cache=writer   # Skip the response cache for some stages (outline, writer, editor)
     ./generate_chapter.py --help              # Show this help message
 """
 
@@ -20,6 +22,13 @@ from pathlib import Path
 # Filter out pysbd warnings
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+# Writer/editor runs cancelled by the streaming validator are retried up to this many times in total
+MAX_GENERATION_ATTEMPTS = 3
+
+# Stages whose LLM completions are cached on disk (see mysticscribe.core.llm_cache)
+CACHE_STAGES = ('outline', 'writer', 'editor')
+NO_CACHE_FLAG = '--no-cache'
+
 
 def activate_virtual_environment():
     """Activate the virtual environment if it exists."""
@@ -63,15 +72,33 @@ def get_next_chapter_number(project_root: Path) -> int:
     return max(chapter_numbers) + 1
 
 
-def load_knowledge_context(project_root: Path) -> str:
-    """Load all knowledge files into a single context string."""
+def load_knowledge_context(project_root: Path, query: str = None, chapter_number: int = None,
+                           top_k: int = None) -> str:
+    """
+    Load knowledge files into a single context string.
+    
+    Without a query every knowledge file is included verbatim. With a query,
+    only the top-k heading sections ranked by BM25 relevance are included.
+    """
     knowledge_dir = project_root / "knowledge"
+    
+    if query is not None:
+        from mysticscribe.core import KnowledgeManager
+        from mysticscribe.core.knowledge_retrieval import DEFAULT_TOP_K
+        manager = KnowledgeManager(project_root)
+        return manager.load_relevant_knowledge(
+            query,
+            top_k=top_k or DEFAULT_TOP_K,
+            chapter_number=chapter_number
+        )
+    
+    from mysticscribe.utils.file_cache import cached_read_text
     context_parts = []
     
     if knowledge_dir.exists():
         for knowledge_file in knowledge_dir.glob("*.txt"):
             try:
-                content = knowledge_file.read_text(encoding='utf-8')
+                content = cached_read_text(knowledge_file)
                 context_parts.append(f"=== {knowledge_file.name} ===\n{content}")
             except Exception as e:
                 print(f"⚠️  Warning: Could not load {knowledge_file.name}: {e}")
@@ -79,6 +106,60 @@ def load_knowledge_context(project_root: Path) -> str:
     return "\n\n".join(context_parts) if context_parts else ""
 
 
+def assemble_crew_inputs(chapter_number: int, project_root: Path, agent_names: list,
+                         outline: str = '', outline_action: str = 'create_new',
+                         approved: bool = False) -> dict:
+    """
+    Build crew inputs packed into the token budget of the given agents.
+    
+    The outline, previous chapter ending, this chapter's plan and the most
+    relevant world sections are added in that order of value; whatever does
+    not fit the budget is dropped and reported.
+    """
+    from mysticscribe.core import KnowledgeManager
+    from mysticscribe.core.context_assembler import (
+        ContextAssembler, budget_for_agents,
+        PRIORITY_OUTLINE, PRIORITY_PREVIOUS_CHAPTER, PRIORITY_CHAPTER_PLAN, PRIORITY_KNOWLEDGE
+    )
+    from mysticscribe.core.knowledge_retrieval import (
+        build_retrieval_query, format_sections, is_chapter_plan, sort_by_source
+    )
+    
+    previous_context = get_previous_chapter_context(chapter_number, project_root)
+    outline_key = 'approved_outline' if approved else 'existing_outline'
+    
+    assembler = ContextAssembler(budget_for_agents(agent_names))
+    assembler.add(outline_key, outline, PRIORITY_OUTLINE, label='chapter outline', truncatable=True)
+    assembler.add('previous_chapter_context', previous_context, PRIORITY_PREVIOUS_CHAPTER,
+                  label='previous chapter ending', truncatable=True, keep_tail=True)
+    
+    manager = KnowledgeManager(project_root)
+    query = build_retrieval_query(chapter_number, outline, previous_context)
+    for section in manager.rank_knowledge(query, chapter_number):
+        priority = PRIORITY_CHAPTER_PLAN if is_chapter_plan(section, chapter_number) else PRIORITY_KNOWLEDGE
+        assembler.add('knowledge_context', section.text, priority,
+                      label=f"{section.source} / {section.heading}", payload=section)
+    assembler.set_formatter('knowledge_context', lambda fragments: format_sections(
+        sort_by_source([f.payload for f in fragments], KnowledgeManager.KNOWLEDGE_FILES)
+    ))
+    
+    assembled = assembler.assemble()
+    print(f"📏 {assembled.report()}")
+    
+    inputs = {
+        'chapter_number': str(chapter_number),
+        'current_year': str(datetime.now().year),
+        'existing_draft': '',
+        'outline_action': outline_action,
+        'existing_outline': '',
+        'approved_outline': '',
+    }
+    inputs.update(assembled.inputs)
+    if approved:
+        inputs['existing_outline'] = inputs['approved_outline']
+    return inputs
+
+
 def get_user_outline_decision(chapter_number: int, project_root: Path) -> tuple[str, str, bool]:
     """
     Check for existing outline and get user's decision on whether to use it or create new.
@@ -156,10 +237,12 @@ def get_previous_chapter_context(chapter_number: int, project_root: Path) -> str
     
     if previous_chapter_file.exists():
         try:
-            content = previous_chapter_file.read_text(encoding='utf-8')
-            # Take the last 1000 characters for context
-            if len(content) > 1000:
-                content = "..." + content[-1000:]
+            from mysticscribe.utils.file_utils import read_tail_text
+            
+            # Take the last 1000 characters for context, reading only the end of the file
+            content, truncated = read_tail_text(previous_chapter_file, 1000)
+            if truncated:
+                content = "..." + content
             return f"=== Previous Chapter ({chapter_number - 1}) Context ===\n{content}"
         except Exception as e:
             return f"Could not load previous chapter context: {e}"
@@ -199,8 +282,127 @@ def validate_chapter_content(content: str, chapter_number: int) -> None:
         print("✅ No AI meta-commentary detected")
 
 
-def run_workflow(chapter_number: int, project_root: Path) -> None:
-    """Run the unified MysticScribe workflow with approval gates."""
+def check_voice_drift(content: str, chapter_number: int, project_root: Path) -> None:
+    """Compare the chapter's style fingerprint with the chapters before it."""
+    try:
+        from mysticscribe.core.style_features import chapter_drift
+        result = chapter_drift(project_root, chapter_number, content)
+    except Exception as e:
+        print(f"⚠️  Could not check voice drift: {e}")
+        return
+    
+    if result is None:
+        return
+    if result.flagged:
+        differences = ', '.join(f"{name} {deviation:+.1f}" for name, deviation in result.deviations)
+        print(f"⚠️  WARNING: Voice drifts from previous chapters (drift {result.drift:.2f}; {differences})")
+        print("   Consider another editing pass focused on voice")
+    else:
+        print(f"✅ Voice consistent with previous chapters (drift {result.drift:.2f})")
+
+
+def check_duplicate_paragraphs(content: str, chapter_number: int, project_root: Path) -> None:
+    """Look for paragraphs recycled from earlier chapters."""
+    try:
+        from mysticscribe.core.duplicate_index import DuplicateIndex
+        index = DuplicateIndex(project_root)
+        index.refresh()
+        matches = index.find_duplicates(content, chapter_number)
+    except Exception as e:
+        print(f"⚠️  Could not check for duplicate paragraphs: {e}")
+        return
+    
+    if matches:
+        print(f"⚠️  WARNING: {len(matches)} paragraphs nearly duplicate earlier chapters:")
+        for match in matches:
+            print(f"   ¶{match.paragraph} ~ Chapter {match.other_chapter} ¶{match.other_paragraph} "
+                  f"(similarity {match.similarity:.2f})")
+    else:
+        print("✅ No paragraphs recycled from earlier chapters")
+
+
+def report_cache_replays(crew_instance, hits_before: int, stages: str) -> None:
+    """Tell the user when a stage was served from the LLM response cache."""
+    replayed = crew_instance.response_cache.hits - hits_before
+    if replayed:
+        print(f"♻️  {replayed} {stages} responses replayed from the LLM cache "
+              f"(--no-cache={stages} to call the model)")
+
+
+def kickoff_writing_crew(crew_instance, inputs: dict):
+    """
+    Run the writer and editor, validating their output as it streams.
+    
+    A stage whose output opens with meta-commentary ("Here is Chapter 5...")
+    or runs past the maximum length is cancelled and the crew restarted
+    straight away. Other AI patterns are reported after the chapter is
+    written, as they also occur in legitimate prose. The last attempt runs
+    unguarded so a draft is always produced for review; it bypasses the
+    response cache, so an unchecked draft is never replayed.
+    """
+    from crewai import Crew, Process
+    from mysticscribe.core.validation import GenerationAborted, StreamingValidator
+    from mysticscribe.crew import FINAL_ANSWER_MARKER, guard_llm_stream
+    
+    hits_before = crew_instance.response_cache.hits
+    for attempt in range(1, MAX_GENERATION_ATTEMPTS + 1):
+        writing_crew = Crew(
+            agents=[crew_instance.writer(), crew_instance.editor()],
+            tasks=[crew_instance.create_writing_task_with_context(), crew_instance.create_editing_task_with_context()],
+            process=Process.sequential,
+            verbose=True
+        )
+        if attempt == MAX_GENERATION_ATTEMPTS:
+            result = writing_crew.kickoff(inputs=inputs)
+            report_cache_replays(crew_instance, hits_before, 'writer,editor')
+            return result
+        
+        try:
+            with guard_llm_stream(StreamingValidator(start_marker=FINAL_ANSWER_MARKER)):
+                result = writing_crew.kickoff(inputs=inputs)
+            report_cache_replays(crew_instance, hits_before, 'writer,editor')
+            return result
+        except GenerationAborted as e:
+            print(f"\n⛔ Attempt {attempt} cancelled: {e.issue.message}")
+            print(f"🔁 Retrying generation ({attempt + 1}/{MAX_GENERATION_ATTEMPTS})...")
+
+
+def parse_cache_flags(args: list) -> tuple:
+    """
+    Split the response cache flags off the command-line arguments.
+    
+    ``--no-cache`` disables the cache for every stage and
+    ``--no-cache=writer,editor`` for the listed stages only.
+    
+    Returns:
+        (remaining arguments, stages to cache)
+    """
+    remaining = []
+    cache_stages = set(CACHE_STAGES)
+    for arg in args:
+        if arg == NO_CACHE_FLAG:
+            cache_stages.clear()
+        elif arg.startswith(NO_CACHE_FLAG + '='):
+            stages = {stage.strip() for stage in arg.split('=', 1)[1].split(',') if stage.strip()}
+            unknown = stages - set(CACHE_STAGES)
+            if unknown:
+                raise ValueError(f"Unknown stages for {NO_CACHE_FLAG}: {', '.join(sorted(unknown))} "
+                                 f"(choose from {', '.join(CACHE_STAGES)})")
+            cache_stages -= stages
+        else:
+            remaining.append(arg)
+    return remaining, tuple(stage for stage in CACHE_STAGES if stage in cache_stages)
+
+
+def run_workflow(chapter_number: int, project_root: Path, cache_stages: tuple = CACHE_STAGES) -> None:
+    """
+    Run the unified MysticScribe workflow with approval gates.
+    
+    Completions of the stages in ``cache_stages`` are cached by request, so
+    rerunning after a failure late in the workflow replays the outline,
+    writer and editor calls instead of paying for them again. A rejected
+    outline is always regenerated live.
+    """
     print(f"\n🚀 MysticScribe Workflow - Chapter {chapter_number}")
     print("=" * 60)
     
@@ -221,53 +423,30 @@ def run_workflow(chapter_number: int, project_root: Path) -> None:
         # If using existing outline, skip directly to writer
         if skip_architect:
             print(f"🤖 Initializing AI agents...")
-            crew_instance = Mysticscribe()
+            crew_instance = Mysticscribe(cache_stages=cache_stages, project_root=project_root)
             
             # Prepare inputs for writer (skipping architect)
-            inputs = {
-                'chapter_number': str(chapter_number),
-                'current_year': str(datetime.now().year),
-                'knowledge_context': load_knowledge_context(project_root),
-                'previous_chapter_context': get_previous_chapter_context(chapter_number, project_root),
-                'existing_draft': '',
-                'existing_outline': existing_outline,
-                'outline_action': 'use_existing',
-                'approved_outline': existing_outline
-            }
+            inputs = assemble_crew_inputs(
+                chapter_number, project_root, ['writer', 'editor'],
+                outline=existing_outline, outline_action='use_existing', approved=True
+            )
             
             print(f"✍️  Skipping to writer - using existing outline...")
             
-            # Create a workflow with only writer and editor
-            from crewai import Crew, Process
-            writing_task = crew_instance.create_writing_task_with_context()
-            editing_task = crew_instance.create_editing_task_with_context()
-            
-            limited_crew = Crew(
-                agents=[crew_instance.writer(), crew_instance.editor()],
-                tasks=[writing_task, editing_task],
-                process=Process.sequential,
-                verbose=True
-            )
-            
-            result = limited_crew.kickoff(inputs=inputs)
+            # Run a workflow with only writer and editor
+            result = kickoff_writing_crew(crew_instance, inputs)
         else:
             # Full workflow with outline generation and approval
             outline_approved = False
             while not outline_approved:
                 print(f"🤖 Initializing AI agents...")
-                crew_instance = Mysticscribe()
+                crew_instance = Mysticscribe(cache_stages=cache_stages, project_root=project_root)
                 
                 # Prepare initial inputs
-                inputs = {
-                    'chapter_number': str(chapter_number),
-                    'current_year': str(datetime.now().year),
-                    'knowledge_context': load_knowledge_context(project_root),
-                    'previous_chapter_context': get_previous_chapter_context(chapter_number, project_root),
-                    'existing_draft': '',
-                    'existing_outline': existing_outline,
-                    'outline_action': outline_action,
-                    'approved_outline': ''  # Will be set after approval
-                }
+                inputs = assemble_crew_inputs(
+                    chapter_number, project_root, ['architect'],
+                    outline=existing_outline, outline_action=outline_action
+                )
                 
                 print(f"📋 Generating outline for Chapter {chapter_number}...")
                 
@@ -280,7 +459,9 @@ def run_workflow(chapter_number: int, project_root: Path) -> None:
                     verbose=True
                 )
                 
+                hits_before = crew_instance.response_cache.hits
                 outline_result = outline_crew.kickoff(inputs=inputs)
+                report_cache_replays(crew_instance, hits_before, 'outline')
                 
                 # Extract and save the outline
                 if hasattr(outline_result, 'raw'):
@@ -302,26 +483,20 @@ def run_workflow(chapter_number: int, project_root: Path) -> None:
                 if not outline_approved:
                     existing_outline = ''  # Clear existing outline for regeneration
                     outline_action = 'create_new'
+                    # The same inputs would replay the rejected outline from the cache
+                    cache_stages = tuple(stage for stage in cache_stages if stage != 'outline')
             
             # Now run writer and editor with approved outline
             print(f"✍️  Continuing with writer and editor...")
             
-            # Update inputs with approved outline
-            inputs['approved_outline'] = outline_content
-            inputs['existing_outline'] = outline_content
-            
-            # Create crew for writing and editing
-            writing_task = crew_instance.create_writing_task_with_context()
-            editing_task = crew_instance.create_editing_task_with_context()
-            
-            writing_crew = Crew(
-                agents=[crew_instance.writer(), crew_instance.editor()],
-                tasks=[writing_task, editing_task],
-                process=Process.sequential,
-                verbose=True
+            # Re-pack inputs around the approved outline for the writer and editor
+            inputs = assemble_crew_inputs(
+                chapter_number, project_root, ['writer', 'editor'],
+                outline=outline_content, outline_action=outline_action, approved=True
             )
             
-            result = writing_crew.kickoff(inputs=inputs)
+            # Run the writer and editor
+            result = kickoff_writing_crew(crew_instance, inputs)
         
         # Save the final result
         chapters_dir = project_root / "chapters"
@@ -339,8 +514,17 @@ def run_workflow(chapter_number: int, project_root: Path) -> None:
         # Save to file
         output_file.write_text(content, encoding='utf-8')
         
+        # Keep the "story so far" digest current for the next chapter
+        try:
+            from mysticscribe.core.story_digest import StoryDigest
+            StoryDigest(project_root).update_chapter(chapter_number, content)
+        except Exception as e:
+            print(f"⚠️  Could not update story digest: {e}")
+        
         # Validate the content
         validate_chapter_content(content, chapter_number)
+        check_voice_drift(content, chapter_number, project_root)
+        check_duplicate_paragraphs(content, chapter_number, project_root)
         
         print(f"\n🎉 Chapter {chapter_number} Complete!")
         print(f"📖 Saved to: {output_file}")
@@ -367,6 +551,7 @@ def print_help():
     print("\nExamples:")
     print("  ./generate_chapter.py           # Generate next chapter automatically")
     print("  ./generate_chapter.py 5         # Generate chapter 5 specifically")
+    print("  ./generate_chapter.py 5 --no-cache=writer,editor   # Regenerate the prose, reuse the outline call")
     print("\nPrerequisites:")
     print("  1. Activate virtual environment: source .venv/bin/activate")
     print("  2. Install dependencies: pip install -r requirements.txt")
@@ -385,20 +570,26 @@ def main():
         print_help()
         return
     
+    try:
+        args, cache_stages = parse_cache_flags(sys.argv[1:])
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    
     # Check virtual environment
     if not activate_virtual_environment():
         sys.exit(1)
     
     # Get chapter number
     chapter_number = None
-    if len(sys.argv) > 1:
+    if args:
         try:
-            chapter_number = int(sys.argv[1])
+            chapter_number = int(args[0])
             if chapter_number < 1:
                 print("❌ Error: Chapter number must be positive")
                 sys.exit(1)
         except ValueError:
-            print(f"❌ Error: '{sys.argv[1]}' is not a valid chapter number")
+            print(f"❌ Error: '{args[0]}' is not a valid chapter number")
             print("Use a positive integer or no argument for auto-detection")
             sys.exit(1)
     
@@ -409,7 +600,7 @@ def main():
     
     try:
         # Run the workflow
-        run_workflow(chapter_number, project_root)
+        run_workflow(chapter_number, project_root, cache_stages)
         
     except KeyboardInterrupt:
         print("\n⏹️  Workflow interrupted by user")
@@ -0,0 +1,305 @@
+"""
+Command-line interface for MysticScribe maintenance tasks.
+
+Usage:
+    mysticscribe knowledge compile [--output PATH]   # Compile knowledge/*.txt into a pack
+    mysticscribe knowledge info                      # Show the compiled pack's contents
+    mysticscribe digest rebuild                      # Re-digest every chapter for the story-so-far summary
+    mysticscribe style report [--workers N]          # Style analysis of every chapter written so far
+    mysticscribe style drift [--chapter N]           # Check a chapter against the established voice
+    mysticscribe validate --all [--workers N]        # Validate every chapter, writing a JSONL report
+    mysticscribe duplicates [--chapter N]            # Find paragraphs recycled from other chapters
+
+Chapter generation itself is run with ./generate_chapter.py.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+from .core import ChapterManager, ContentValidator, KnowledgeManager
+from .core.batch_validation import ValidationResultCache, validate_many
+from .core.duplicate_index import DUPLICATE_THRESHOLD, DuplicateIndex
+from .core.knowledge_pack import KnowledgePack, default_pack_path
+from .core.story_digest import StoryDigest
+from .core.style_features import StyleAggregate, StyleFeatureCache, chapter_drift, extract_many
+from .core.style_fingerprint import DRIFT_THRESHOLD, load_style_profiles
+from .core.validation import VALIDATION_CACHE_DIRNAME, ValidationIssue
+from .utils.file_utils import CACHE_DIR_NAME
+
+# Characters of each paragraph shown in duplicate reports
+SNIPPET_CHARS = 80
+
+
+def cmd_knowledge_compile(args: argparse.Namespace) -> int:
+    """Compile the knowledge base into a pack."""
+    manager = KnowledgeManager(args.project_root)
+    output_path = manager.compile_pack(args.output)
+
+    with KnowledgePack.open(output_path) as pack:
+        sections = pack.sections()
+        total_tokens = sum(f['tokens'] for f in pack.files.values())
+        print(f"✅ Compiled {len(pack.files)} knowledge files ({len(sections)} sections, "
+              f"~{total_tokens:,} tokens)")
+        print(f"📦 Pack: {output_path}")
+        print(f"🔑 Content hash: {pack.content_hash}")
+    return 0
+
+
+def cmd_knowledge_info(args: argparse.Namespace) -> int:
+    """Print a summary of the compiled knowledge pack."""
+    pack_path = Path(args.output) if args.output else default_pack_path(args.project_root)
+    if not pack_path.exists():
+        print(f"❌ No knowledge pack found at {pack_path}")
+        print("💡 Run: mysticscribe knowledge compile")
+        return 1
+
+    knowledge_dir = Path(args.project_root) / "knowledge"
+    with KnowledgePack.open(pack_path) as pack:
+        sections = pack.sections()
+        status = "up to date" if pack.is_fresh(knowledge_dir) else "STALE - recompile"
+        print(f"📦 {pack_path} ({status})")
+        print(f"🔑 Content hash: {pack.content_hash}")
+        for name, entry in pack.files.items():
+            file_sections = [s for s in sections if s.source == name]
+            print(f"   {name}: {len(file_sections)} sections, ~{entry['tokens']:,} tokens")
+    return 0
+
+
+def cmd_digest_rebuild(args: argparse.Namespace) -> int:
+    """Rebuild the story digest from the chapters on disk."""
+    digest = StoryDigest(args.project_root)
+    count = digest.rebuild()
+    print(f"✅ Digested {count} chapters into {digest.digest_dir}")
+    return 0
+
+
+def cmd_style_report(args: argparse.Namespace) -> int:
+    """Print a style analysis of the chapters on disk."""
+    # The tool module imports crewai, so only load it when needed
+    from .tools.style_analysis import format_style_analysis
+
+    manager = ChapterManager(args.project_root)
+    chapters = [info for info in manager.list_chapters() if info.draft_exists]
+    if args.last:
+        chapters = chapters[-args.last:]
+    if not chapters:
+        print(f"❌ No chapters found in {manager.chapters_dir}")
+        return 1
+
+    contents = [manager.load_chapter_content(info.number) for info in chapters]
+    if args.no_cache:
+        features = extract_many(contents, workers=args.workers)
+    else:
+        features = StyleFeatureCache(args.project_root).features_many(contents, workers=args.workers)
+
+    stats = StyleAggregate.from_features(zip((info.number for info in chapters), features))
+    print(format_style_analysis(stats, load_style_profiles(Path(args.project_root) / "styles")))
+    return 0
+
+
+def cmd_style_drift(args: argparse.Namespace) -> int:
+    """Score a chapter against the voice of the chapters before it; exit 1 if it drifts."""
+    manager = ChapterManager(args.project_root)
+    chapter_number = args.chapter
+    if chapter_number is None:
+        drafts = [info.number for info in manager.list_chapters() if info.draft_exists]
+        if not drafts:
+            print(f"❌ No chapters found in {manager.chapters_dir}")
+            return 1
+        chapter_number = drafts[-1]
+    if not manager.chapter_exists(chapter_number):
+        print(f"❌ Chapter {chapter_number} not found in {manager.chapters_dir}")
+        return 1
+
+    result = chapter_drift(args.project_root, chapter_number, threshold=args.threshold)
+    if result is None:
+        print(f"ℹ️  No chapters before Chapter {chapter_number} to compare with")
+        return 0
+
+    first, last = result.reference_chapters[0], result.reference_chapters[-1]
+    span = f"chapters {first}-{last}" if first != last else f"chapter {first}"
+    print(f"📐 Chapter {chapter_number} drift from {span}: {result.drift:.2f} (threshold {result.threshold:.2f})")
+    for name, deviation in result.deviations:
+        print(f"   {name}: {deviation:+.1f} spreads")
+    if result.flagged:
+        print("⚠️  Chapter drifts from the established voice")
+        return 1
+    print("✅ Chapter matches the established voice")
+    return 0
+
+
+def cmd_validate(args: argparse.Namespace) -> int:
+    """
+    Validate chapters and stream one JSON line per chapter to a report.
+
+    Exits 0 when no chapter has errors, 1 when some chapter has errors (or,
+    with --strict, warnings) or there is nothing to validate.
+    """
+    manager = ChapterManager(args.project_root)
+    if args.all:
+        chapters = [info for info in manager.list_chapters() if info.draft_exists]
+    else:
+        chapters = [manager.get_chapter_info(args.chapter)]
+        if not chapters[0].draft_exists:
+            print(f"❌ Chapter {args.chapter} not found in {manager.chapters_dir}")
+            return 1
+    if not chapters:
+        print(f"❌ No chapters found in {manager.chapters_dir}")
+        return 1
+
+    contents = [manager.load_chapter_content(info.number) for info in chapters]
+    if args.no_cache:
+        results = (([ValidationIssue(**issue) for issue in issues], False)
+                   for issues in validate_many(contents, workers=args.workers))
+    else:
+        results = ValidationResultCache(args.project_root).validate_many(contents, workers=args.workers)
+
+    validator = ContentValidator()
+    report_path = Path(args.report) if args.report else \
+        Path(args.project_root) / CACHE_DIR_NAME / VALIDATION_CACHE_DIRNAME / "report.jsonl"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+
+    all_issues = []
+    failed = []
+    cached_count = 0
+    with open(report_path, 'w', encoding='utf-8') as report:
+        for info, (issues, cached) in zip(chapters, results):
+            summary = validator.get_validation_summary(issues)
+            report.write(json.dumps({
+                'chapter': info.number,
+                'path': str(info.draft_path),
+                'cached': cached,
+                'summary': summary,
+                'issues': [asdict(issue) for issue in issues],
+            }, ensure_ascii=False) + "\n")
+            report.flush()
+
+            all_issues.extend(issues)
+            cached_count += cached
+            if summary['errors'] or (args.strict and summary['warnings']):
+                failed.append(info.number)
+                print(f"❌ Chapter {info.number}: {summary['errors']} errors, {summary['warnings']} warnings")
+
+    totals = validator.get_validation_summary(all_issues)
+    print(f"📊 Validated {len(chapters)} chapters ({cached_count} unchanged, from cache): "
+          f"{totals['errors']} errors, {totals['warnings']} warnings, {totals['info']} info")
+    for category, count in sorted(totals['by_category'].items()):
+        print(f"   {category}: {count}")
+    print(f"📄 Report: {report_path}")
+
+    if failed:
+        print(f"⚠️  {len(failed)} chapters failed validation")
+        return 1
+    print("✅ All chapters passed validation")
+    return 0
+
+
+def cmd_duplicates(args: argparse.Namespace) -> int:
+    """Report paragraphs of a chapter that nearly duplicate other chapters; exit 1 if any."""
+    manager = ChapterManager(args.project_root)
+    chapter_number = args.chapter
+    if chapter_number is None:
+        drafts = [info.number for info in manager.list_chapters() if info.draft_exists]
+        if not drafts:
+            print(f"❌ No chapters found in {manager.chapters_dir}")
+            return 1
+        chapter_number = drafts[-1]
+    if not manager.chapter_exists(chapter_number):
+        print(f"❌ Chapter {chapter_number} not found in {manager.chapters_dir}")
+        return 1
+
+    index = DuplicateIndex(args.project_root)
+    indexed = index.refresh()
+    if indexed:
+        print(f"🗂️  Indexed paragraphs of {indexed} chapters")
+
+    matches = index.find_duplicates(manager.load_chapter_content(chapter_number), chapter_number,
+                                    threshold=args.threshold)
+    if not matches:
+        print(f"✅ No near-duplicate paragraphs in Chapter {chapter_number}")
+        return 0
+
+    print(f"⚠️  {len(matches)} near-duplicate paragraphs in Chapter {chapter_number}:")
+    for match in matches:
+        print(f"   ¶{match.paragraph} ~ Chapter {match.other_chapter} ¶{match.other_paragraph} "
+              f"(similarity {match.similarity:.2f})")
+        print(f"      {match.text[:SNIPPET_CHARS]}...")
+        print(f"      {match.other_text[:SNIPPET_CHARS]}...")
+    return 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser."""
+    parser = argparse.ArgumentParser(prog="mysticscribe", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project-root", type=Path, default=Path.cwd(),
+                        help="Project root containing knowledge/ and chapters/ (default: current directory)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    knowledge = subparsers.add_parser("knowledge", help="Knowledge base tasks")
+    knowledge_sub = knowledge.add_subparsers(dest="knowledge_command", required=True)
+
+    compile_parser = knowledge_sub.add_parser("compile", help="Compile knowledge/*.txt into a pack")
+    compile_parser.add_argument("--output", type=Path, default=None, help="Pack path (default: .mysticscribe/knowledge.pack)")
+    compile_parser.set_defaults(func=cmd_knowledge_compile)
+
+    info_parser = knowledge_sub.add_parser("info", help="Show the compiled knowledge pack")
+    info_parser.add_argument("--output", type=Path, default=None, help="Pack path (default: .mysticscribe/knowledge.pack)")
+    info_parser.set_defaults(func=cmd_knowledge_info)
+
+    digest = subparsers.add_parser("digest", help="Story-so-far digest tasks")
+    digest_sub = digest.add_subparsers(dest="digest_command", required=True)
+
+    rebuild_parser = digest_sub.add_parser("rebuild", help="Re-digest every chapter (after editing chapters by hand)")
+    rebuild_parser.set_defaults(func=cmd_digest_rebuild)
+
+    style = subparsers.add_parser("style", help="Style analysis tasks")
+    style_sub = style.add_subparsers(dest="style_command", required=True)
+
+    report_parser = style_sub.add_parser("report", help="Analyze the style of the chapters written so far")
+    report_parser.add_argument("--workers", type=int, default=1,
+                               help="Processes used to analyze chapters that are not cached (default: 1)")
+    report_parser.add_argument("--last", type=int, default=None, help="Only analyze the last N chapters")
+    report_parser.add_argument("--no-cache", action="store_true", help="Re-analyze every chapter without the feature cache")
+    report_parser.set_defaults(func=cmd_style_report)
+
+    drift_parser = style_sub.add_parser("drift", help="Check a chapter against the voice of the chapters before it")
+    drift_parser.add_argument("--chapter", type=int, default=None, help="Chapter to check (default: the latest)")
+    drift_parser.add_argument("--threshold", type=float, default=DRIFT_THRESHOLD,
+                              help=f"Drift above which the chapter is flagged (default: {DRIFT_THRESHOLD})")
+    drift_parser.set_defaults(func=cmd_style_drift)
+
+    validate_parser = subparsers.add_parser("validate", help="Validate chapters (exit code 1 if any fail)")
+    target = validate_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--all", action="store_true", help="Validate every chapter")
+    target.add_argument("--chapter", type=int, help="Validate a single chapter")
+    validate_parser.add_argument("--workers", type=int, default=1,
+                                 help="Processes used to validate chapters that are not cached (default: 1)")
+    validate_parser.add_argument("--report", type=Path, default=None,
+                                 help="JSONL report path (default: .mysticscribe/validation/report.jsonl)")
+    validate_parser.add_argument("--strict", action="store_true", help="Fail on warnings as well as errors")
+    validate_parser.add_argument("--no-cache", action="store_true", help="Re-validate every chapter without the result cache")
+    validate_parser.set_defaults(func=cmd_validate)
+
+    duplicates_parser = subparsers.add_parser("duplicates", help="Find paragraphs recycled from other chapters")
+    duplicates_parser.add_argument("--chapter", type=int, default=None, help="Chapter to check (default: the latest)")
+    duplicates_parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD,
+                                   help=f"Similarity above which paragraphs are reported (default: {DUPLICATE_THRESHOLD})")
+    duplicates_parser.set_defaults(func=cmd_duplicates)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point for the mysticscribe command."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
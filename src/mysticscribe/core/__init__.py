@@ -7,10 +7,17 @@ management for the AI-powered chapter writing system.
 
 from .chapter_manager import ChapterManager
 from .knowledge_manager import KnowledgeManager
-from .validation import ContentValidator
+from .validation import (
+    ContentValidator, ValidationIssue, ValidationDocument, IncrementalValidator, StreamingValidator, GenerationAborted
+)
 
 __all__ = [
     'ChapterManager',
     'KnowledgeManager', 
-    'ContentValidator'
+    'ContentValidator',
+    'ValidationIssue',
+    'ValidationDocument',
+    'IncrementalValidator',
+    'StreamingValidator',
+    'GenerationAborted'
 ]
@@ -0,0 +1,133 @@
+"""
+Batch Validation
+
+Validate many chapters at once, in parallel and with a result cache.
+
+Chapters are validated in a process pool and their issues are yielded in
+chapter order as soon as each one is ready, so a report can be streamed while
+the rest of the archive is still being checked. Results are cached by content
+hash in ``.mysticscribe/validation/results/``, so re-validating an archive
+only re-checks the chapters that changed.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+import logging
+
+from .validation import RULES_VERSION, VALIDATION_CACHE_DIRNAME, ContentValidator, ValidationIssue
+from ..utils.file_utils import CACHE_DIR_NAME
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIRNAME = "results"
+
+# Chapters handed to a worker process at a time
+WORKER_CHUNK_SIZE = 4
+
+_VALIDATOR = ContentValidator()
+
+
+def validate_to_dicts(content: str) -> List[dict]:
+    """Validate one chapter; issues as JSON-ready dictionaries (picklable for worker processes)."""
+    return [asdict(issue) for issue in _VALIDATOR.validate_chapter_content(content)]
+
+
+def validate_many(contents: Sequence[str], workers: int = 1) -> Iterator[List[dict]]:
+    """
+    Validate several chapters, optionally in parallel.
+
+    Args:
+        contents: Chapter texts
+        workers: Number of worker processes (1 validates in this process)
+
+    Yields:
+        Issue dictionaries of each chapter, in the order of ``contents``
+    """
+    workers = min(workers, len(contents))
+    if workers <= 1:
+        for content in contents:
+            yield validate_to_dicts(content)
+        return
+
+    chunk_size = max(1, min(WORKER_CHUNK_SIZE, -(-len(contents) // workers)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(validate_to_dicts, contents, chunksize=chunk_size)
+
+
+class ValidationResultCache:
+    """
+    Content-addressed store of chapter validation results.
+    """
+
+    def __init__(self, project_root: Union[str, Path]):
+        """
+        Initialize the Validation Result Cache.
+
+        Args:
+            project_root: Path to the project root directory
+        """
+        self.cache_dir = Path(project_root) / CACHE_DIR_NAME / VALIDATION_CACHE_DIRNAME / RESULTS_DIRNAME
+
+    def validate_many(self, contents: Sequence[str], workers: int = 1) -> Iterator[Tuple[List[ValidationIssue], bool]]:
+        """
+        Validate several chapters, skipping those validated before.
+
+        Args:
+            contents: Chapter texts
+            workers: Number of worker processes for chapters not cached
+
+        Yields:
+            (issues, cached) for each chapter, in the order of ``contents``
+        """
+        keys = [hashlib.sha1(content.encode('utf-8')).hexdigest() for content in contents]
+        cached = {}
+        missing = {}
+        for key, content in zip(keys, contents):
+            if key not in cached and key not in missing:
+                issues = self._load(key)
+                if issues is None:
+                    missing[key] = content
+                else:
+                    cached[key] = issues
+
+        if missing:
+            logger.debug(f"Validating {len(missing)} chapters with {workers} workers")
+        results = zip(missing, validate_many(list(missing.values()), workers))
+        for key in keys:
+            was_cached = key in cached
+            while key not in cached:
+                done_key, issues = next(results)
+                self._store(done_key, issues)
+                cached[done_key] = issues
+            yield [ValidationIssue(**issue) for issue in cached[key]], was_cached
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[List[dict]]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable validation result {path}: {e}")
+            return None
+        return record.get('issues') if record.get('version') == RULES_VERSION else None
+
+    def _store(self, key: str, issues: List[dict]) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': RULES_VERSION, 'issues': issues}, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache validation result in {path}: {e}")
@@ -5,16 +5,21 @@ Handles chapter numbering, file operations, and chapter lifecycle management.
 """
 
 import os
-import re
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 import logging
 
+from .chapter_manifest import ChapterManifest
+from .story_digest import StoryDigest
+from ..utils.file_utils import CACHE_DIR_NAME
+
 logger = logging.getLogger(__name__)
 
+MANIFEST_FILENAME = "chapter_manifest.json"
+
 
-@dataclass
+@dataclass(slots=True)
 class ChapterInfo:
     """Information about a chapter."""
     number: int
@@ -24,6 +29,20 @@ class ChapterInfo:
     draft_path: Optional[Path] = None
     word_count: Optional[int] = None
 
+    @classmethod
+    def from_manifest(cls, chapter_number: int, entry: Dict[str, Any], manifest: ChapterManifest) -> "ChapterInfo":
+        """Build chapter information from a manifest entry, with paths from the manifest's directories."""
+        draft = entry['draft']
+        outline = entry['outline']
+        return cls(
+            number=chapter_number,
+            outline_exists=outline is not None,
+            draft_exists=draft is not None,
+            outline_path=manifest.outline_path(chapter_number) if outline else None,
+            draft_path=manifest.draft_path(chapter_number) if draft else None,
+            word_count=draft['word_count'] if draft else None
+        )
+
 
 class ChapterManager:
     """
@@ -48,6 +67,16 @@ class ChapterManager:
         # Ensure directories exist
         self.chapters_dir.mkdir(exist_ok=True)
         self.outlines_dir.mkdir(exist_ok=True)
+        
+        # Stat-validated record of chapter files, persisted between runs
+        self.manifest = ChapterManifest(
+            self.chapters_dir,
+            self.outlines_dir,
+            self.project_root / CACHE_DIR_NAME / MANIFEST_FILENAME
+        )
+        
+        # Rolling "story so far" digest, updated whenever a chapter is saved
+        self.digest = StoryDigest(self.project_root, self.chapters_dir)
     
     def get_next_chapter_number(self) -> int:
         """
@@ -56,50 +85,24 @@ class ChapterManager:
         Returns:
             The next chapter number (highest existing + 1, or 1 if none exist)
         """
-        outline_files = list(self.outlines_dir.glob("chapter_*.txt"))
-        
-        if not outline_files:
-            return 1
-        
-        # Extract chapter numbers
-        chapter_numbers = []
-        for file_path in outline_files:
-            match = re.search(r'chapter_(\d+)\.txt', file_path.name)
-            if match:
-                chapter_numbers.append(int(match.group(1)))
-        
-        return max(chapter_numbers, default=0) + 1
+        entries = self.manifest.refresh()
+        outlined = [number for number, entry in entries.items() if entry['outline'] is not None]
+        return max(outlined, default=0) + 1
     
     def get_chapter_info(self, chapter_number: int) -> ChapterInfo:
         """
         Get comprehensive information about a chapter.
         
+        The word count comes from the manifest and is only recomputed when
+        the draft changed since it was last counted.
+        
         Args:
             chapter_number: The chapter number to analyze
             
         Returns:
             ChapterInfo object containing all available information
         """
-        outline_path = self.outlines_dir / f"chapter_{chapter_number}.txt"
-        draft_path = self.chapters_dir / f"chapter_{chapter_number}.md"
-        
-        word_count = None
-        if draft_path.exists():
-            try:
-                with open(draft_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    word_count = len(content.split())
-            except Exception as e:
-                logger.warning(f"Could not read chapter {chapter_number} for word count: {e}")
-        
-        return ChapterInfo(
-            number=chapter_number,
-            outline_exists=outline_path.exists(),
-            draft_exists=draft_path.exists(),
-            outline_path=outline_path if outline_path.exists() else None,
-            draft_path=draft_path if draft_path.exists() else None,
-            word_count=word_count
-        )
+        return ChapterInfo.from_manifest(chapter_number, self.manifest.get(chapter_number), self.manifest)
     
     def list_chapters(self) -> List[ChapterInfo]:
         """
@@ -108,24 +111,8 @@ class ChapterManager:
         Returns:
             List of ChapterInfo objects for all discovered chapters
         """
-        # Get all chapter numbers from both outlines and drafts
-        all_numbers = set()
-        
-        # From outlines
-        for file_path in self.outlines_dir.glob("chapter_*.txt"):
-            match = re.search(r'chapter_(\d+)\.txt', file_path.name)
-            if match:
-                all_numbers.add(int(match.group(1)))
-        
-        # From drafts
-        for file_path in self.chapters_dir.glob("chapter_*.md"):
-            match = re.search(r'chapter_(\d+)\.md', file_path.name)
-            if match:
-                all_numbers.add(int(match.group(1)))
-        
-        # Get info for all chapters and sort
-        chapters = [self.get_chapter_info(num) for num in sorted(all_numbers)]
-        return chapters
+        entries = self.manifest.refresh()
+        return [ChapterInfo.from_manifest(number, entries[number], self.manifest) for number in sorted(entries)]
     
     def save_chapter_content(self, chapter_number: int, content: str, validate: bool = True) -> Path:
         """
@@ -145,8 +132,16 @@ class ChapterManager:
         output_path = self.chapters_dir / f"chapter_{chapter_number}.md"
         
         if validate:
-            from .validation import ContentValidator
-            validator = ContentValidator()
+            from .validation import ContentValidator, IncrementalValidator, VALIDATION_CACHE_DIRNAME
+            if output_path.exists():
+                # A re-save: only paragraphs changed since the last one are re-checked
+                validator = IncrementalValidator(
+                    self.project_root / CACHE_DIR_NAME / VALIDATION_CACHE_DIRNAME / f"chapter_{chapter_number}.json"
+                )
+            else:
+                # A new chapter has nothing cached, and computing and storing its
+                # partials costs more than a full validation
+                validator = ContentValidator()
             issues = validator.validate_chapter_content(content)
             if issues:
                 logger.warning(f"Content validation issues for Chapter {chapter_number}: {issues}")
@@ -155,10 +150,16 @@ class ChapterManager:
             with open(output_path, 'w', encoding='utf-8') as f:
                 f.write(content)
             logger.info(f"Chapter {chapter_number} saved to: {output_path}")
-            return output_path
         except Exception as e:
             logger.error(f"Failed to save chapter {chapter_number}: {e}")
             raise
+        
+        try:
+            self.digest.update_chapter(chapter_number, content)
+        except Exception as e:
+            logger.warning(f"Could not update story digest for chapter {chapter_number}: {e}")
+        
+        return output_path
     
     def load_chapter_content(self, chapter_number: int) -> str:
         """
@@ -0,0 +1,210 @@
+"""
+Chapter Manifest
+
+On-disk manifest of chapter drafts and outlines.
+
+The manifest records, for every chapter number, the draft's and outline's
+mtime, size, content hash and word count. Paths are not stored: they are
+derived from the chapter number and the directories the manifest is opened
+with, so a moved or copied project does not point back at the old files. Refreshing it costs one
+directory scan plus a ``stat`` per file; drafts are only re-read when their
+stat changed, so listing a project with thousands of chapters does not open
+a single unchanged file.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 2
+
+DRAFT_PATTERN = re.compile(r'^chapter_(\d+)\.md$')
+OUTLINE_PATTERN = re.compile(r'^chapter_(\d+)\.txt$')
+
+
+class ChapterManifest:
+    """
+    Stat-validated manifest of chapter files persisted as JSON.
+
+    Entries are keyed by chapter number (as a string in the JSON file) and
+    hold optional ``draft`` and ``outline`` records.
+    """
+
+    def __init__(self, chapters_dir: Path, outlines_dir: Path, manifest_path: Optional[Path] = None):
+        """
+        Initialize the Chapter Manifest.
+
+        Args:
+            chapters_dir: Directory containing chapter drafts
+            outlines_dir: Directory containing chapter outlines
+            manifest_path: Where to persist the manifest (None keeps it in memory only)
+        """
+        self.chapters_dir = Path(chapters_dir)
+        self.outlines_dir = Path(outlines_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.entries: Dict[int, Dict[str, Optional[dict]]] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def refresh(self) -> Dict[int, Dict[str, Optional[dict]]]:
+        """
+        Bring the manifest up to date with the chapter and outline directories.
+
+        Returns:
+            Dictionary mapping chapter numbers to their entries
+        """
+        self._ensure_loaded()
+
+        drafts = self._scan(self.chapters_dir, DRAFT_PATTERN)
+        outlines = self._scan(self.outlines_dir, OUTLINE_PATTERN)
+
+        for number in list(self.entries):
+            if number not in drafts and number not in outlines:
+                del self.entries[number]
+                self._dirty = True
+
+        for number in drafts.keys() | outlines.keys():
+            self._update(number, drafts.get(number), outlines.get(number))
+
+        self._save_if_dirty()
+        return self.entries
+
+    def get(self, chapter_number: int) -> Dict[str, Optional[dict]]:
+        """
+        Get an up-to-date entry for a single chapter.
+
+        Only the chapter's own files are checked.
+
+        Args:
+            chapter_number: The chapter number
+
+        Returns:
+            Entry with ``draft`` and ``outline`` records (either may be None)
+        """
+        self._ensure_loaded()
+
+        draft = self._stat(self.draft_path(chapter_number))
+        outline = self._stat(self.outline_path(chapter_number))
+
+        if draft is None and outline is None:
+            if self.entries.pop(chapter_number, None) is not None:
+                self._dirty = True
+            entry = {'draft': None, 'outline': None}
+        else:
+            entry = self._update(chapter_number, draft, outline)
+
+        self._save_if_dirty()
+        return entry
+
+    def draft_path(self, chapter_number: int) -> Path:
+        """Path of a chapter's draft."""
+        return self.chapters_dir / f"chapter_{chapter_number}.md"
+
+    def outline_path(self, chapter_number: int) -> Path:
+        """Path of a chapter's outline."""
+        return self.outlines_dir / f"chapter_{chapter_number}.txt"
+
+    def _update(self, number: int, draft_stat: Optional[os.stat_result],
+                outline_stat: Optional[os.stat_result]) -> Dict[str, Optional[dict]]:
+        """Update one entry from fresh stats, re-reading the draft only if it changed."""
+        entry = self.entries.get(number)
+        if entry is None:
+            entry = self.entries[number] = {'draft': None, 'outline': None}
+            self._dirty = True
+
+        # Drafts
+        old = entry['draft']
+        if draft_stat is None:
+            if old is not None:
+                entry['draft'] = None
+                self._dirty = True
+        elif old is None or old['mtime_ns'] != draft_stat.st_mtime_ns or old['size'] != draft_stat.st_size:
+            draft_path = self.draft_path(number)
+            record = {
+                'mtime_ns': draft_stat.st_mtime_ns,
+                'size': draft_stat.st_size,
+                'sha1': None,
+                'word_count': None,
+            }
+            try:
+                raw = draft_path.read_bytes()
+                record['sha1'] = hashlib.sha1(raw).hexdigest()
+                record['word_count'] = len(raw.decode('utf-8').split())
+            except Exception as e:
+                logger.warning(f"Could not read chapter {number} for word count: {e}")
+            entry['draft'] = record
+            self._dirty = True
+
+        # Outlines
+        old = entry['outline']
+        if outline_stat is None:
+            if old is not None:
+                entry['outline'] = None
+                self._dirty = True
+        elif old is None or old['mtime_ns'] != outline_stat.st_mtime_ns or old['size'] != outline_stat.st_size:
+            entry['outline'] = {
+                'mtime_ns': outline_stat.st_mtime_ns,
+                'size': outline_stat.st_size,
+            }
+            self._dirty = True
+
+        return entry
+
+    @staticmethod
+    def _scan(directory: Path, pattern: re.Pattern) -> Dict[int, os.stat_result]:
+        """Stat every chapter file in a directory."""
+        found = {}
+        if not directory.exists():
+            return found
+        for dir_entry in os.scandir(directory):
+            match = pattern.match(dir_entry.name)
+            if match and dir_entry.is_file():
+                found[int(match.group(1))] = dir_entry.stat()
+        return found
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def _ensure_loaded(self) -> None:
+        """Load the persisted manifest once, ignoring unreadable or outdated files."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.manifest_path or not self.manifest_path.exists():
+            return
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = {int(number): entry for number, entry in data['chapters'].items()}
+        except Exception as e:
+            logger.warning(f"Could not load chapter manifest {self.manifest_path}: {e}")
+            self.entries = {}
+
+    def _save_if_dirty(self) -> None:
+        """Persist the manifest atomically if anything changed."""
+        if not self._dirty or not self.manifest_path:
+            return
+        data = {
+            'version': MANIFEST_VERSION,
+            'chapters': {str(number): self.entries[number] for number in sorted(self.entries)},
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, self.manifest_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Could not save chapter manifest {self.manifest_path}: {e}")
@@ -0,0 +1,168 @@
+"""
+Chapter Plan Index
+
+Parsed index over the chapter plan (``knowledge/chapters.txt``).
+
+The plan is scanned once per modification to map each chapter number to the
+(start, end) character range of its entry, so looking up a chapter becomes a
+dictionary hit plus a slice of the cached file text. Chapter headings are
+matched on whole numbers, so "Chapter 1" never matches "Chapter 10".
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+
+from ..utils.file_cache import cached_read_text
+
+logger = logging.getLogger(__name__)
+
+# "### Chapter 2 Outline: ...", "#### Chapter 12: ...", "Chapter 3: ..." (a colon is required)
+CHAPTER_HEADING_PATTERN = re.compile(r'^(#{0,6})\s*\**\s*Chapter\s+(\d+)\b(?=[^\n]*:)', re.IGNORECASE)
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s')
+RANGE_PATTERN = re.compile(r'^\s*(\d+)\s*(?:-\s*(\d+))?\s*$')
+
+# Most chapters one specification may name; specs come from agent tool input
+MAX_SPEC_CHAPTERS = 100
+
+
+def parse_chapter_spec(spec: str) -> List[int]:
+    """
+    Parse a chapter specification such as "5", "3-7" or "1, 4, 6-8".
+
+    Args:
+        spec: Chapter specification
+
+    Returns:
+        Chapter numbers in the order given
+
+    Raises:
+        ValueError: If the specification is malformed or names more than
+            MAX_SPEC_CHAPTERS chapters
+    """
+    numbers: List[int] = []
+    for part in spec.split(','):
+        match = RANGE_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Invalid chapter specification: '{spec}'")
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        if end < start:
+            raise ValueError(f"Invalid chapter range: '{part.strip()}'")
+        # Checked before the range is built, so a huge range fails at once
+        if len(numbers) + end - start + 1 > MAX_SPEC_CHAPTERS:
+            raise ValueError(f"Too many chapters in '{spec}' (at most {MAX_SPEC_CHAPTERS})")
+        numbers.extend(range(start, end + 1))
+    return numbers
+
+
+class ChapterPlanIndex:
+    """
+    Maps chapter numbers to their entry in the chapter plan.
+    """
+
+    def __init__(self, text: str):
+        """
+        Parse the chapter plan.
+
+        Args:
+            text: Content of the chapter plan file
+        """
+        self.text = text
+        self.ranges: Dict[int, Tuple[int, int]] = {}
+
+        current: Optional[int] = None
+        current_level = 0
+        start = 0
+        offset = 0
+
+        for line in text.splitlines(keepends=True):
+            chapter_match = CHAPTER_HEADING_PATTERN.match(line)
+            heading_match = HEADING_PATTERN.match(line)
+            level = len(heading_match.group(1)) if heading_match else 0
+
+            ends_current = current is not None and (
+                chapter_match is not None
+                or (heading_match is not None and current_level and level <= current_level)
+            )
+            if ends_current:
+                self._close(current, start, offset)
+                current = None
+
+            if chapter_match is not None:
+                current = int(chapter_match.group(2))
+                current_level = len(chapter_match.group(1))
+                start = offset
+
+            offset += len(line)
+
+        if current is not None:
+            self._close(current, start, offset)
+
+    def _close(self, chapter_number: int, start: int, end: int) -> None:
+        # Keep the first entry if a chapter is listed more than once
+        if chapter_number not in self.ranges:
+            self.ranges[chapter_number] = (start, end)
+
+    @property
+    def chapter_numbers(self) -> List[int]:
+        """Chapter numbers present in the plan, sorted."""
+        return sorted(self.ranges)
+
+    def get(self, chapter_number: int) -> Optional[str]:
+        """
+        Get the plan entry for a chapter.
+
+        Args:
+            chapter_number: Chapter number
+
+        Returns:
+            The chapter's plan text, or None if it is not in the plan
+        """
+        span = self.ranges.get(chapter_number)
+        if span is None:
+            return None
+        return self.text[span[0]:span[1]].rstrip()
+
+    def get_many(self, chapter_numbers: List[int]) -> Dict[int, Optional[str]]:
+        """
+        Get plan entries for several chapters.
+
+        Args:
+            chapter_numbers: Chapter numbers
+
+        Returns:
+            Dictionary mapping each chapter number to its plan text (or None)
+        """
+        return {number: self.get(number) for number in chapter_numbers}
+
+
+_indexes: Dict[str, Tuple[int, int, ChapterPlanIndex]] = {}
+
+
+def get_chapter_plan_index(file_path: Union[str, Path]) -> ChapterPlanIndex:
+    """
+    Get the index for a chapter plan file, re-parsing only when it changes.
+
+    Args:
+        file_path: Path to the chapter plan
+
+    Returns:
+        ChapterPlanIndex for the file's current content
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    key = os.path.abspath(file_path)
+    stat = os.stat(key)
+
+    cached = _indexes.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    index = ChapterPlanIndex(cached_read_text(key))
+    _indexes[key] = (stat.st_mtime_ns, stat.st_size, index)
+    logger.debug(f"Indexed {len(index.ranges)} chapters in {key}")
+    return index
@@ -0,0 +1,215 @@
+"""
+Context Assembly
+
+Token-budgeted packing of crew inputs.
+
+Every kickoff fills ``{knowledge_context}``, ``{previous_chapter_context}``,
+``{existing_outline}`` and ``{approved_outline}`` into the task prompts. The
+assembler measures each candidate fragment with a constant-time token
+estimate and keeps the highest-value fragments (chapter plan, previous
+chapter ending, then the most relevant world sections) until the budget for
+the agents involved is spent, recording everything it had to drop.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+
+from ..utils.text_utils import estimate_tokens, truncate_text, CHARS_PER_TOKEN
+
+logger = logging.getLogger(__name__)
+
+# Token budget for the assembled inputs of each agent. Sized to leave room for
+# the task prompt, tool transcripts and the response within the model context.
+AGENT_TOKEN_BUDGETS = {
+    'architect': 24000,  # gpt-4.1
+    'writer': 16000,     # gpt-4o
+    'editor': 16000,     # gpt-4.1
+}
+
+# Fragment priorities - higher values are packed first
+PRIORITY_OUTLINE = 100
+PRIORITY_PREVIOUS_CHAPTER = 90
+PRIORITY_CHAPTER_PLAN = 80
+PRIORITY_KNOWLEDGE = 50
+
+# Fragments are only truncated if at least this many tokens remain
+MIN_TRUNCATED_TOKENS = 200
+
+# Maximum number of dropped fragments named in a report
+REPORT_MAX_LABELS = 8
+
+
+def budget_for_agents(agent_names: Iterable[str]) -> int:
+    """
+    Get the input token budget for a crew.
+
+    Inputs are shared by every task in a kickoff, so the smallest budget of
+    the participating agents applies.
+
+    Args:
+        agent_names: Names of the agents in the crew
+
+    Returns:
+        Token budget
+    """
+    return min(AGENT_TOKEN_BUDGETS[name] for name in agent_names)
+
+
+@dataclass
+class ContextFragment:
+    """A candidate piece of context for one crew input."""
+    key: str
+    text: str
+    priority: int
+    label: str
+    truncatable: bool = False
+    keep_tail: bool = False
+    payload: Any = None
+    sequence: int = 0
+    tokens: int = 0
+
+
+@dataclass
+class AssembledContext:
+    """Result of packing fragments into a token budget."""
+    inputs: Dict[str, str]
+    budget: int
+    used_tokens: int
+    kept: List[ContextFragment] = field(default_factory=list)
+    truncated: List[ContextFragment] = field(default_factory=list)
+    dropped: List[ContextFragment] = field(default_factory=list)
+
+    def report(self) -> str:
+        """
+        Format a short report of what was packed and dropped.
+
+        Returns:
+            Report string
+        """
+        report = f"Context budget: {self.used_tokens:,}/{self.budget:,} tokens, {len(self.kept)} fragments kept"
+        if self.truncated:
+            report += f"\n  Truncated: {', '.join(f.label for f in self.truncated)}"
+        if self.dropped:
+            dropped_tokens = sum(f.tokens for f in self.dropped)
+            report += f"\n  Dropped {len(self.dropped)} fragments (~{dropped_tokens:,} tokens): "
+            report += ', '.join(f.label for f in self.dropped[:REPORT_MAX_LABELS])
+            if len(self.dropped) > REPORT_MAX_LABELS:
+                report += f" and {len(self.dropped) - REPORT_MAX_LABELS} more"
+        return report
+
+
+class ContextAssembler:
+    """
+    Packs prioritized context fragments into a token budget.
+
+    Fragments are considered in descending priority (ties keep insertion
+    order). A fragment that does not fit is truncated if it allows it and
+    enough budget remains, otherwise it is dropped. Kept fragments are then
+    joined per input key, optionally through a custom formatter.
+    """
+
+    def __init__(self, budget: int):
+        """
+        Initialize the Context Assembler.
+
+        Args:
+            budget: Maximum number of tokens for all fragments together
+        """
+        self.budget = budget
+        self._fragments: List[ContextFragment] = []
+        self._keys: List[str] = []
+        self._formatters: Dict[str, Callable[[List[ContextFragment]], str]] = {}
+
+    def add(self, key: str, text: str, priority: int, label: Optional[str] = None,
+            truncatable: bool = False, keep_tail: bool = False, payload: Any = None) -> None:
+        """
+        Add a candidate fragment.
+
+        Args:
+            key: Crew input the fragment belongs to
+            text: Fragment text
+            priority: Packing priority (higher first)
+            label: Name used in the report (defaults to the key)
+            truncatable: Whether the fragment may be shortened to fit
+            keep_tail: Keep the end rather than the start when truncating
+            payload: Arbitrary object passed through to formatters
+        """
+        if key not in self._keys:
+            self._keys.append(key)
+        if not text:
+            return
+        self._fragments.append(ContextFragment(
+            key=key,
+            text=text,
+            priority=priority,
+            label=label or key,
+            truncatable=truncatable,
+            keep_tail=keep_tail,
+            payload=payload,
+            sequence=len(self._fragments),
+            tokens=estimate_tokens(text),
+        ))
+
+    def set_formatter(self, key: str, formatter: Callable[[List[ContextFragment]], str]) -> None:
+        """
+        Set how kept fragments for a key are combined into the input value.
+
+        Args:
+            key: Crew input name
+            formatter: Callable receiving kept fragments in insertion order
+        """
+        if key not in self._keys:
+            self._keys.append(key)
+        self._formatters[key] = formatter
+
+    def assemble(self) -> AssembledContext:
+        """
+        Pack fragments into the budget.
+
+        Returns:
+            AssembledContext with the crew input values and a record of
+            kept, truncated and dropped fragments
+        """
+        remaining = self.budget
+        kept: List[ContextFragment] = []
+        truncated: List[ContextFragment] = []
+        dropped: List[ContextFragment] = []
+
+        for fragment in sorted(self._fragments, key=lambda f: (-f.priority, f.sequence)):
+            if fragment.tokens <= remaining:
+                kept.append(fragment)
+                remaining -= fragment.tokens
+            elif fragment.truncatable and remaining >= MIN_TRUNCATED_TOKENS:
+                max_chars = remaining * CHARS_PER_TOKEN
+                if fragment.keep_tail:
+                    text = "..." + fragment.text[-(max_chars - 3):]
+                else:
+                    text = truncate_text(fragment.text, max_chars)
+                shortened = replace(fragment, text=text, tokens=estimate_tokens(text))
+                kept.append(shortened)
+                truncated.append(shortened)
+                remaining -= shortened.tokens
+            else:
+                dropped.append(fragment)
+
+        inputs = {}
+        for key in self._keys:
+            key_fragments = sorted((f for f in kept if f.key == key), key=lambda f: f.sequence)
+            formatter = self._formatters.get(key)
+            if formatter is not None:
+                inputs[key] = formatter(key_fragments)
+            else:
+                inputs[key] = "\n\n".join(f.text for f in key_fragments)
+
+        result = AssembledContext(
+            inputs=inputs,
+            budget=self.budget,
+            used_tokens=self.budget - remaining,
+            kept=kept,
+            truncated=truncated,
+            dropped=dropped,
+        )
+        if dropped or truncated:
+            logger.info(result.report())
+        return result
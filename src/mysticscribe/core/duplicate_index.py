@@ -0,0 +1,330 @@
+"""
+Duplicate Paragraph Index
+
+Cross-chapter index of paragraph MinHash signatures for near-duplicate detection.
+
+Every paragraph of every chapter draft gets a MinHash signature (see
+``utils/minhash.py``). The index stores the signatures and, for each LSH
+band, the band keys in sorted order as plain ``.npy`` arrays under
+``.mysticscribe/duplicates/``, which are opened memory-mapped. Checking a
+chapter costs one binary search per paragraph and band plus a signature
+comparison for the few candidates found, so it does not grow linearly with
+the size of the archive. The index is refreshed from the chapter manifest:
+only chapters whose content hash changed are signed again, and they are
+written as a new segment rather than rewriting the whole index.
+"""
+
+import json
+import os
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+import logging
+
+import numpy as np
+
+from .chapter_manager import ChapterManager
+from ..utils.file_utils import CACHE_DIR_NAME
+from ..utils.minhash import BANDS, NUM_PERMUTATIONS, band_keys, signatures, similarity
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+DUPLICATES_DIRNAME = "duplicates"
+
+# Segments kept before they are merged into one
+MAX_SEGMENTS = 8
+
+# Paragraphs shorter than this (dialogue lines, scene breaks) are not indexed
+MIN_PARAGRAPH_WORDS = 20
+
+# Estimated Jaccard similarity of word 3-grams above which paragraphs are reported
+DUPLICATE_THRESHOLD = 0.5
+
+_ARRAYS = ('signatures', 'rows', 'sorted_keys', 'order')
+
+
+def index_paragraphs(content: str) -> List[Tuple[int, str]]:
+    """
+    Get the paragraphs of a chapter that are long enough to index.
+
+    Args:
+        content: Chapter text
+
+    Returns:
+        List of (paragraph number, text); numbers are 1-based and count every
+        non-empty paragraph, headings included
+    """
+    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+    return [
+        (number, paragraph) for number, paragraph in enumerate(paragraphs, 1)
+        if not paragraph.startswith('#') and len(paragraph.split()) >= MIN_PARAGRAPH_WORDS
+    ]
+
+
+def _segment_arrays(signature_matrix: np.ndarray, rows: np.ndarray) -> Dict[str, np.ndarray]:
+    """Index signatures by sorting the keys of every band."""
+    keys = band_keys(signature_matrix)
+    order = np.argsort(keys, axis=0, kind='stable').T.astype(np.int32)
+    return {
+        'signatures': signature_matrix,
+        'rows': rows,
+        'sorted_keys': np.take_along_axis(keys.T, order, axis=1),
+        'order': order,
+    }
+
+
+def _merge_segments(segments: Dict[int, Dict[str, np.ndarray]], chapters: Dict[int, dict]) -> Dict[str, np.ndarray]:
+    """Combine the current rows of every segment into one, dropping stale rows."""
+    signature_parts = [np.zeros((0, NUM_PERMUTATIONS), dtype=np.uint32)]
+    row_parts = [np.zeros((0, 2), dtype=np.int32)]
+    for segment_id, arrays in sorted(segments.items()):
+        live = [number for number, info in chapters.items() if info['segment'] == segment_id]
+        mask = np.isin(arrays['rows'][:, 0], live)
+        signature_parts.append(arrays['signatures'][mask])
+        row_parts.append(arrays['rows'][mask])
+    return _segment_arrays(np.concatenate(signature_parts), np.concatenate(row_parts))
+
+
+@dataclass
+class DuplicateMatch:
+    """A paragraph that nearly duplicates a paragraph of another chapter."""
+    paragraph: int
+    other_chapter: int
+    other_paragraph: int
+    similarity: float
+    text: str
+    other_text: str = ''
+
+
+class DuplicateIndex:
+    """
+    Memory-mapped LSH index of the paragraphs of every chapter draft.
+
+    The index is a list of segments, each holding the paragraphs of the
+    chapters signed in one refresh. The metadata names the segment that holds
+    each chapter's current paragraphs; rows of an edited or deleted chapter
+    left in older segments are ignored, and the segments are merged once
+    there are too many or most of their rows are stale.
+    """
+
+    def __init__(self, project_root: Union[str, Path]):
+        """
+        Initialize the Duplicate Index.
+
+        Args:
+            project_root: Path to the project root directory
+        """
+        self.project_root = Path(project_root)
+        self.index_dir = self.project_root / CACHE_DIR_NAME / DUPLICATES_DIRNAME
+        self._segments: Optional[Dict[int, Dict[str, np.ndarray]]] = None
+        # Chapter number -> {'sha1', 'segment', 'paragraphs'} of its indexed draft
+        self._chapters: Dict[int, dict] = {}
+        self._next_segment = 0
+        self._chapter_paths: Dict[int, Path] = {}
+
+    def refresh(self) -> int:
+        """
+        Bring the index up to date with the chapter drafts.
+
+        Returns:
+            Number of chapters (re-)indexed
+        """
+        manifest = ChapterManager(self.project_root).manifest
+        entries = manifest.refresh()
+        drafts = {number: entry['draft'] for number, entry in entries.items()
+                  if entry['draft'] is not None and entry['draft']['sha1']}
+        self._chapter_paths = {number: manifest.draft_path(number) for number in drafts}
+        current = {number: draft['sha1'] for number, draft in drafts.items()}
+
+        if self._segments is None:
+            self._load()
+        chapters = {number: info for number, info in self._chapters.items() if number in current}
+        changed = sorted(number for number, sha1 in current.items()
+                         if number not in chapters or chapters[number]['sha1'] != sha1)
+        if not changed and len(chapters) == len(self._chapters):
+            return 0
+
+        # Only the changed chapters are signed, into a segment of their own
+        segments = dict(self._segments)
+        segment_id = self._next_segment
+        signature_parts = [np.zeros((0, NUM_PERMUTATIONS), dtype=np.uint32)]
+        row_parts = [np.zeros((0, 2), dtype=np.int32)]
+        for number in changed:
+            chapters.pop(number, None)
+            try:
+                content = self._chapter_paths[number].read_text(encoding='utf-8')
+            except OSError as e:
+                logger.warning(f"Could not index chapter {number} for duplicates: {e}")
+                continue
+            paragraphs = index_paragraphs(content)
+            signature_parts.append(signatures([text for _, text in paragraphs]))
+            row_parts.append(np.array([[number, p] for p, _ in paragraphs], dtype=np.int32).reshape(-1, 2))
+            chapters[number] = {'sha1': current[number], 'segment': segment_id, 'paragraphs': len(paragraphs)}
+        written = {}
+        if len(row_parts) > 1:
+            written[segment_id] = segments[segment_id] = _segment_arrays(
+                np.concatenate(signature_parts), np.concatenate(row_parts))
+            segment_id += 1
+
+        rows = sum(len(arrays['rows']) for arrays in segments.values())
+        live_rows = sum(info['paragraphs'] for info in chapters.values())
+        if len(segments) > MAX_SEGMENTS or rows > 2 * live_rows:
+            written = {segment_id: _merge_segments(segments, chapters)}
+            segments = dict(written)
+            for info in chapters.values():
+                info['segment'] = segment_id
+            segment_id += 1
+
+        self._segments, self._chapters, self._next_segment = segments, chapters, segment_id
+        self._store(written)
+        logger.info(f"Indexed paragraphs of {len(changed)} chapters ({live_rows} paragraphs in total, "
+                    f"{len(segments)} segments)")
+        return len(changed)
+
+    def find_duplicates(self, content: str, chapter_number: Optional[int] = None,
+                        threshold: float = DUPLICATE_THRESHOLD) -> List[DuplicateMatch]:
+        """
+        Find paragraphs of a chapter that nearly duplicate paragraphs of other chapters.
+
+        Args:
+            content: Chapter text
+            chapter_number: The chapter's own number, whose indexed paragraphs are ignored
+            threshold: Minimum estimated similarity to report
+
+        Returns:
+            Matches ordered by paragraph, most similar first
+        """
+        paragraphs = index_paragraphs(content)
+        if not paragraphs:
+            return []
+        if self._segments is None and not self._load():
+            self.refresh()
+        if not self._chapters:
+            return []
+
+        query = signatures([text for _, text in paragraphs])
+        query_keys = band_keys(query)
+
+        matches = []
+        for segment_id, arrays in self._segments.items():
+            # Candidates share at least one band key with the query paragraph
+            candidates: Dict[int, Set[int]] = defaultdict(set)
+            for band in range(BANDS):
+                sorted_keys = arrays['sorted_keys'][band]
+                low = np.searchsorted(sorted_keys, query_keys[:, band], side='left')
+                high = np.searchsorted(sorted_keys, query_keys[:, band], side='right')
+                for i in np.flatnonzero(high > low):
+                    candidates[i].update(arrays['order'][band][low[i]:high[i]].tolist())
+
+            for i, rows in sorted(candidates.items()):
+                rows = np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+                refs = arrays['rows'][rows]
+                scores = similarity(query[i], arrays['signatures'][rows])
+                for (other_chapter, other_paragraph), score in zip(refs.tolist(), scores.tolist()):
+                    if other_chapter == chapter_number or score < threshold:
+                        continue
+                    # Rows of a chapter re-indexed into a later segment are stale
+                    info = self._chapters.get(other_chapter)
+                    if info is None or info['segment'] != segment_id:
+                        continue
+                    matches.append(DuplicateMatch(
+                        paragraph=paragraphs[i][0],
+                        other_chapter=other_chapter,
+                        other_paragraph=other_paragraph,
+                        similarity=score,
+                        text=paragraphs[i][1],
+                    ))
+        matches.sort(key=lambda m: (m.paragraph, -m.similarity, m.other_chapter, m.other_paragraph))
+        self._fill_other_text(matches)
+        return matches
+
+    def _fill_other_text(self, matches: List[DuplicateMatch]) -> None:
+        """Load the text of every matched paragraph from its chapter."""
+        texts: Dict[int, Dict[int, str]] = {}
+        for match in matches:
+            if match.other_chapter not in texts:
+                path = self._chapter_paths.get(match.other_chapter) or \
+                    self.project_root / "chapters" / f"chapter_{match.other_chapter}.md"
+                try:
+                    texts[match.other_chapter] = dict(index_paragraphs(Path(path).read_text(encoding='utf-8')))
+                except OSError:
+                    texts[match.other_chapter] = {}
+            match.other_text = texts[match.other_chapter].get(match.other_paragraph, '')
+
+    def _segment_path(self, segment_id: int, name: str) -> Path:
+        return self.index_dir / f"segment_{segment_id}_{name}.npy"
+
+    def _load(self) -> bool:
+        """
+        Open the stored segments memory-mapped.
+
+        Returns:
+            Whether a complete index was found; if not, the index starts empty
+        """
+        self._segments, self._chapters, self._next_segment = {}, {}, 0
+        meta = self._load_meta()
+        if not meta:
+            return False
+        try:
+            segments = {
+                segment_id: {name: np.load(self._segment_path(segment_id, name), mmap_mode='r') for name in _ARRAYS}
+                for segment_id in meta['segments']
+            }
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring incomplete duplicate index in {self.index_dir}: {e}")
+            return False
+        self._segments = segments
+        self._chapters = {int(number): info for number, info in meta['chapters'].items()}
+        self._next_segment = meta['next_segment']
+        return True
+
+    def _load_meta(self) -> dict:
+        path = self.index_dir / "meta.json"
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable duplicate index metadata {path}: {e}")
+            return {}
+        return meta if meta.get('version') == INDEX_VERSION else {}
+
+    def _store(self, written: Dict[int, Dict[str, np.ndarray]]) -> None:
+        """
+        Save new segments, then the metadata that refers to them.
+
+        The metadata is replaced last, so an interrupted save leaves the
+        previous index intact; segments it no longer names are deleted
+        afterwards. On failure the in-memory index stays current.
+        """
+        meta = {
+            'version': INDEX_VERSION,
+            'next_segment': self._next_segment,
+            'segments': sorted(self._segments),
+            'chapters': {str(number): info for number, info in self._chapters.items()},
+        }
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            for segment_id, arrays in written.items():
+                for name, array in arrays.items():
+                    tmp_path = self.index_dir / f"{name}.tmp.npy"
+                    np.save(tmp_path, array)
+                    os.replace(tmp_path, self._segment_path(segment_id, name))
+            tmp_path = self.index_dir / "meta.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self.index_dir / "meta.json")
+        except OSError as e:
+            logger.warning(f"Could not save duplicate index in {self.index_dir}: {e}")
+            return
+
+        live = {self._segment_path(segment_id, name).name for segment_id in self._segments for name in _ARRAYS}
+        for path in self.index_dir.glob("*.npy"):
+            if path.name not in live:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
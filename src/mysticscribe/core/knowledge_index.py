@@ -0,0 +1,226 @@
+"""
+Knowledge Index
+
+Persistent inverted index over the knowledge base with incremental rebuilds.
+
+The index is built on first use and saved as JSON next to the project. On each
+refresh, files are re-indexed only when their size or mtime changed and their
+content hash no longer matches, so a large story bible costs one ``stat`` per
+file to keep current.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from ..utils.file_cache import cached_read_text
+from ..utils.text_index import DocumentIndex, InvertedIndex, Posting
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+
+
+class KnowledgeIndex:
+    """
+    Inverted index over every ``*.txt`` file in the knowledge directory.
+
+    File metadata (mtime, size, content hash) is stored alongside the postings
+    so only changed files are re-tokenized when the index is refreshed.
+    """
+
+    def __init__(self, knowledge_dir: Path, index_path: Optional[Path] = None):
+        """
+        Initialize the Knowledge Index.
+
+        Args:
+            knowledge_dir: Directory containing knowledge files
+            index_path: Where to persist the index (None keeps it in memory only)
+        """
+        self.knowledge_dir = Path(knowledge_dir)
+        self.index_path = Path(index_path) if index_path else None
+        self.index = InvertedIndex()
+        self._file_meta: Dict[str, Dict[str, object]] = {}
+        self._loaded = False
+
+    def refresh(self) -> List[str]:
+        """
+        Bring the index up to date with the knowledge directory.
+
+        Returns:
+            List of filenames that were (re-)indexed or removed
+        """
+        if not self._loaded:
+            self._load()
+
+        changed = []
+        dirty = False
+        seen = set()
+
+        if self.knowledge_dir.exists():
+            entries = sorted(os.scandir(self.knowledge_dir), key=lambda e: e.name)
+        else:
+            entries = []
+
+        for entry in entries:
+            if not entry.name.endswith('.txt') or not entry.is_file():
+                continue
+            seen.add(entry.name)
+            stat = entry.stat()
+            meta = self._file_meta.get(entry.name)
+            if meta and meta['mtime_ns'] == stat.st_mtime_ns and meta['size'] == stat.st_size:
+                continue
+
+            raw = Path(entry.path).read_bytes()
+            digest = hashlib.sha1(raw).hexdigest()
+            if meta and meta['sha1'] == digest:
+                # Touched but unchanged - just record the new stat
+                meta['mtime_ns'] = stat.st_mtime_ns
+                meta['size'] = stat.st_size
+                dirty = True
+                continue
+
+            try:
+                # Newlines translated as when reading in text mode, so line offsets match cached_read_text
+                text = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n').strip()
+            except UnicodeDecodeError as e:
+                logger.warning(f"Skipping knowledge file with invalid UTF-8 {entry.name}: {e}")
+                continue
+            self.index.add_document(entry.name, text)
+            self._file_meta[entry.name] = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha1': digest,
+            }
+            changed.append(entry.name)
+            dirty = True
+            logger.debug(f"Indexed knowledge file: {entry.name}")
+
+        for name in list(self._file_meta):
+            if name not in seen:
+                self.index.remove_document(name)
+                del self._file_meta[name]
+                changed.append(name)
+                dirty = True
+
+        if dirty:
+            self._save()
+
+        return changed
+
+    def search(self, query: str) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Run a boolean/phrase query and return matching lines.
+
+        See ``InvertedIndex.search`` for the query syntax.
+
+        Args:
+            query: Query string
+
+        Returns:
+            Dictionary mapping filenames to sorted (line_number, line) tuples
+        """
+        self.refresh()
+        hits = self.index.search(query)
+        return {
+            filename: self._lines(filename, sorted({p.line for p in postings}))
+            for filename, postings in hits.items()
+        }
+
+    def find_substring(self, search_term: str, case_sensitive: bool = False) -> Dict[str, List[Tuple[int, str]]]:
+        """
+        Find lines containing ``search_term`` as a substring.
+
+        Candidate lines come from the index; each is then confirmed with a
+        direct substring test so results match a full line scan exactly.
+
+        Args:
+            search_term: Term to search for
+            case_sensitive: Whether search should be case sensitive
+
+        Returns:
+            Dictionary mapping filenames to sorted (line_number, line) tuples
+        """
+        self.refresh()
+        target = search_term if case_sensitive else search_term.lower()
+
+        candidates = self.index.candidate_lines(search_term)
+        if candidates is None:
+            # No word tokens in the term - fall back to scanning every line
+            candidates = {
+                name: set(range(1, len(doc.line_starts) + 1))
+                for name, doc in self.index.documents.items()
+            }
+
+        results = {}
+        for filename, line_numbers in candidates.items():
+            matches = []
+            for line_num, line in self._lines(filename, sorted(line_numbers)):
+                haystack = line if case_sensitive else line.lower()
+                if target in haystack:
+                    matches.append((line_num, line))
+            if matches:
+                results[filename] = matches
+        return results
+
+    def postings(self, token: str) -> Dict[str, List[Posting]]:
+        """Get raw (line, offset, position) postings for a token."""
+        self.refresh()
+        return self.index.postings(token)
+
+    def _lines(self, filename: str, line_numbers: List[int]) -> List[Tuple[int, str]]:
+        """Slice the requested lines out of a knowledge file using the stored line table."""
+        document = self.index.documents[filename]
+        file_path = self.knowledge_dir / filename
+        text = cached_read_text(file_path).strip()
+        lines = []
+        for line_num in line_numbers:
+            start, end = document.line_span(line_num)
+            lines.append((line_num, text[start:end]))
+        return lines
+
+    def _load(self) -> None:
+        """Load a previously persisted index, ignoring stale or unreadable files."""
+        self._loaded = True
+        if not self.index_path or not self.index_path.exists():
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                logger.info("Knowledge index format changed - rebuilding")
+                return
+            for filename, entry in data['files'].items():
+                self._file_meta[filename] = entry['meta']
+                self.index.set_document(filename, DocumentIndex.from_dict(entry['document']))
+            logger.debug(f"Loaded knowledge index with {len(self._file_meta)} files")
+        except Exception as e:
+            logger.warning(f"Could not load knowledge index {self.index_path}: {e}")
+            self.index = InvertedIndex()
+            self._file_meta = {}
+
+    def _save(self) -> None:
+        """Persist the index atomically."""
+        if not self.index_path:
+            return
+        data = {
+            'version': INDEX_VERSION,
+            'files': {
+                filename: {
+                    'meta': meta,
+                    'document': self.index.documents[filename].to_dict(),
+                }
+                for filename, meta in self._file_meta.items()
+            },
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            logger.warning(f"Could not save knowledge index {self.index_path}: {e}")
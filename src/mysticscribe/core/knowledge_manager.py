@@ -9,6 +9,12 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import logging
 
+from .knowledge_index import KnowledgeIndex
+from .knowledge_pack import compile_knowledge_pack, default_pack_path, load_knowledge_pack
+from .knowledge_retrieval import DEFAULT_TOP_K, KnowledgeSection, format_sections, get_retriever
+from ..utils.file_cache import cached_read_text
+from ..utils.file_utils import CACHE_DIR_NAME
+
 logger = logging.getLogger(__name__)
 
 
@@ -43,6 +49,7 @@ class KnowledgeManager:
         """
         self.project_root = Path(project_root)
         self.knowledge_dir = self.project_root / "knowledge"
+        self._index: Optional[KnowledgeIndex] = None
         
         if not self.knowledge_dir.exists():
             logger.warning(f"Knowledge directory not found at: {self.knowledge_dir}")
@@ -66,6 +73,39 @@ class KnowledgeManager:
         
         return context
     
+    def load_relevant_knowledge(self, query: str, top_k: int = DEFAULT_TOP_K,
+                                chapter_number: Optional[int] = None) -> str:
+        """
+        Load only the knowledge sections most relevant to a query.
+        
+        Knowledge files are chunked by heading and ranked with BM25; see
+        ``build_retrieval_query`` for building a query from chapter inputs.
+        
+        Args:
+            query: Free-text query (outline, previous chapter ending, etc.)
+            top_k: Maximum number of sections to include
+            chapter_number: Chapter being written, whose plan is always included
+            
+        Returns:
+            Formatted string containing the selected sections
+        """
+        retriever = get_retriever(self.knowledge_dir, self.KNOWLEDGE_FILES)
+        sections = retriever.retrieve(query, top_k=top_k, chapter_number=chapter_number)
+        return format_sections(sections)
+    
+    def rank_knowledge(self, query: str, chapter_number: Optional[int] = None) -> List[KnowledgeSection]:
+        """
+        Rank every knowledge section by relevance to a query.
+        
+        Args:
+            query: Free-text query
+            chapter_number: Chapter being written, whose plan is ranked first
+            
+        Returns:
+            Sections in descending relevance
+        """
+        return get_retriever(self.knowledge_dir, self.KNOWLEDGE_FILES).rank(query, chapter_number)
+    
     def load_knowledge_file(self, filename: str) -> Optional[str]:
         """
         Load a specific knowledge file.
@@ -83,18 +123,39 @@ class KnowledgeManager:
             return None
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:
-                    logger.debug(f"Loaded knowledge file: {filename}")
-                    return content
-                else:
-                    logger.warning(f"Knowledge file is empty: {filename}")
-                    return None
+            pack = load_knowledge_pack(self.project_root)
+            if pack is not None and pack.is_file_fresh(self.knowledge_dir, filename):
+                content = pack.file_text(filename).strip()
+            else:
+                content = cached_read_text(file_path).strip()
+            if content:
+                logger.debug(f"Loaded knowledge file: {filename}")
+                return content
+            else:
+                logger.warning(f"Knowledge file is empty: {filename}")
+                return None
         except Exception as e:
             logger.error(f"Error reading knowledge file {filename}: {e}")
             return None
     
+    def compile_pack(self, output_path: Optional[Path] = None) -> Path:
+        """
+        Compile the knowledge base into a memory-mappable pack.
+        
+        Once compiled, ``load_knowledge_file`` and relevance retrieval read
+        from the pack for as long as the underlying files are unchanged.
+        
+        Args:
+            output_path: Where to write the pack (defaults to the project cache)
+            
+        Returns:
+            Path to the compiled pack
+        """
+        output_path = Path(output_path) if output_path else default_pack_path(self.project_root)
+        pack = compile_knowledge_pack(self.knowledge_dir, output_path, self.KNOWLEDGE_FILES)
+        pack.close()
+        return output_path
+    
     def get_available_files(self) -> List[str]:
         """
         Get list of available knowledge files.
@@ -162,10 +223,21 @@ class KnowledgeManager:
             'completeness_percentage': (len(available_files) / total_files) * 100
         }
     
+    @property
+    def index(self) -> KnowledgeIndex:
+        """Persistent inverted index over the knowledge directory, built on first use."""
+        if self._index is None:
+            index_path = self.project_root / CACHE_DIR_NAME / "knowledge_index.json"
+            self._index = KnowledgeIndex(self.knowledge_dir, index_path)
+        return self._index
+    
     def search_knowledge(self, search_term: str, case_sensitive: bool = False) -> Dict[str, List[str]]:
         """
         Search for a term across all knowledge files.
         
+        Candidate lines are looked up in the knowledge index, so only files
+        changed since the last search are re-read.
+        
         Args:
             search_term: Term to search for
             case_sensitive: Whether search should be case sensitive
@@ -173,24 +245,31 @@ class KnowledgeManager:
         Returns:
             Dictionary mapping filenames to lists of matching lines
         """
-        results = {}
+        matches = self.index.find_substring(search_term, case_sensitive=case_sensitive)
+        return self._format_matches(matches)
+    
+    def query_knowledge(self, query: str) -> Dict[str, List[str]]:
+        """
+        Run a boolean query across all knowledge files.
         
-        for filename in self.get_available_files():
-            content = self.load_knowledge_file(filename)
-            if not content:
-                continue
-            
-            matches = []
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                search_line = line if case_sensitive else line.lower()
-                search_target = search_term if case_sensitive else search_term.lower()
-                
-                if search_target in search_line:
-                    matches.append(f"Line {line_num}: {line.strip()}")
+        Whitespace-separated terms must all appear in a file, ``OR`` separates
+        alternatives and double-quoted text is matched as an exact phrase,
+        e.g. ``Cassian "Wind Kingdom" OR Windmoore``.
+        
+        Args:
+            query: Query string
             
-            if matches:
-                results[filename] = matches
+        Returns:
+            Dictionary mapping filenames to lists of matching lines
+        """
+        return self._format_matches(self.index.search(query))
+    
+    def _format_matches(self, matches: Dict[str, List[tuple]]) -> Dict[str, List[str]]:
+        """Order matches by loading priority and format them as 'Line N: text'."""
+        priority = {filename: i for i, filename in enumerate(self.KNOWLEDGE_FILES)}
+        ordered = sorted(matches, key=lambda name: (priority.get(name, len(priority)), name))
         
+        results = {}
+        for filename in ordered:
+            results[filename] = [f"Line {line_num}: {line.strip()}" for line_num, line in matches[filename]]
         return results
@@ -0,0 +1,311 @@
+"""
+Knowledge Pack
+
+Compiled, memory-mapped form of the knowledge base.
+
+``mysticscribe knowledge compile`` turns ``knowledge/*.txt`` into a single
+binary pack holding the normalized text of every file, the heading tree with
+per-section token estimates, content hashes and an offset table. Loaders open
+the pack with ``mmap`` and slice text straight out of the mapping instead of
+re-reading and re-parsing the raw files on every call, and every worker
+process sees byte-identical knowledge for a given pack hash.
+
+File layout::
+
+    MAGIC (8 bytes) | header length (uint64, little endian) | header JSON | text blob
+
+All offsets in the header are byte offsets into the text blob.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from .knowledge_retrieval import KnowledgeSection, chunk_by_heading
+from ..utils.file_utils import CACHE_DIR_NAME
+from ..utils.text_utils import clean_text, estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+PACK_MAGIC = b"MSKPACK\x01"
+PACK_VERSION = 1
+PACK_FILENAME = "knowledge.pack"
+_LENGTH = struct.Struct('<Q')
+
+
+def default_pack_path(project_root: Path) -> Path:
+    """
+    Get the default location of the compiled knowledge pack.
+
+    Args:
+        project_root: Path to the project root directory
+
+    Returns:
+        Path to the pack file
+    """
+    return Path(project_root) / CACHE_DIR_NAME / PACK_FILENAME
+
+
+def knowledge_signature(knowledge_dir: Path) -> Tuple[Tuple[str, int, int], ...]:
+    """
+    Get the (name, mtime_ns, size) signature of every knowledge file.
+
+    Args:
+        knowledge_dir: Directory containing knowledge files
+
+    Returns:
+        Sorted tuple of file signatures
+    """
+    files = []
+    if Path(knowledge_dir).exists():
+        for entry in os.scandir(knowledge_dir):
+            if entry.name.endswith('.txt') and entry.is_file():
+                stat = entry.stat()
+                files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(files))
+
+
+def compile_knowledge_pack(knowledge_dir: Path, output_path: Path,
+                           file_order: Optional[List[str]] = None) -> "KnowledgePack":
+    """
+    Compile the knowledge directory into a pack file.
+
+    Args:
+        knowledge_dir: Directory containing knowledge files
+        output_path: Where to write the pack
+        file_order: Preferred ordering of files within the pack
+
+    Returns:
+        The freshly written pack, opened for reading
+    """
+    knowledge_dir = Path(knowledge_dir)
+    output_path = Path(output_path)
+    priority = {name: i for i, name in enumerate(file_order or [])}
+    signature = sorted(knowledge_signature(knowledge_dir),
+                       key=lambda f: (priority.get(f[0], len(priority)), f[0]))
+
+    blob = bytearray()
+    files = []
+    sections = []
+
+    for name, mtime_ns, size in signature:
+        raw = (knowledge_dir / name).read_bytes()
+        text = clean_text(raw.decode('utf-8'), remove_extra_whitespace=False)
+        encoded = text.encode('utf-8')
+        file_offset = len(blob)
+        blob.extend(encoded)
+
+        files.append({
+            'name': name,
+            'offset': file_offset,
+            'length': len(encoded),
+            'mtime_ns': mtime_ns,
+            'size': size,
+            'sha256': hashlib.sha256(raw).hexdigest(),
+            'tokens': estimate_tokens(text),
+        })
+
+        section_base = len(sections)
+        for section in chunk_by_heading(text, name):
+            body_start = text.index(section.text, section.start)
+            byte_start = file_offset + len(text[:body_start].encode('utf-8'))
+            sections.append({
+                'source': name,
+                'heading': section.heading,
+                'level': section.level,
+                'parent': None if section.parent is None else section_base + section.parent,
+                'start': section.start,
+                'offset': byte_start,
+                'length': len(section.text.encode('utf-8')),
+                'tokens': section.token_estimate,
+            })
+
+    header = {
+        'version': PACK_VERSION,
+        'content_hash': hashlib.sha256(blob).hexdigest(),
+        'files': files,
+        'sections': sections,
+    }
+    header_bytes = json.dumps(header, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(PACK_MAGIC)
+        f.write(_LENGTH.pack(len(header_bytes)))
+        f.write(header_bytes)
+        f.write(blob)
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"Compiled {len(files)} knowledge files ({len(sections)} sections) into {output_path}")
+    return KnowledgePack.open(output_path)
+
+
+class KnowledgePack:
+    """
+    Read-only, memory-mapped view of a compiled knowledge pack.
+    """
+
+    def __init__(self, path: Path, mapping: mmap.mmap, header: dict, blob_start: int):
+        self.path = Path(path)
+        self._mmap = mapping
+        self._blob_start = blob_start
+        self.version = header['version']
+        self.content_hash = header['content_hash']
+        self.files: Dict[str, dict] = {f['name']: f for f in header['files']}
+        self._sections = header['sections']
+
+    @classmethod
+    def open(cls, path: Path) -> "KnowledgePack":
+        """
+        Open and memory-map a pack file.
+
+        Args:
+            path: Path to the pack
+
+        Returns:
+            KnowledgePack instance
+
+        Raises:
+            ValueError: If the file is not a compatible knowledge pack
+        """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if mapping[:len(PACK_MAGIC)] != PACK_MAGIC:
+            mapping.close()
+            raise ValueError(f"Not a knowledge pack: {path}")
+
+        header_start = len(PACK_MAGIC) + _LENGTH.size
+        (header_length,) = _LENGTH.unpack_from(mapping, len(PACK_MAGIC))
+        header = json.loads(mapping[header_start:header_start + header_length].decode('utf-8'))
+        if header.get('version') != PACK_VERSION:
+            mapping.close()
+            raise ValueError(f"Unsupported knowledge pack version {header.get('version')}: {path}")
+
+        return cls(path, mapping, header, header_start + header_length)
+
+    @property
+    def file_names(self) -> List[str]:
+        """Names of the packed files, in pack order."""
+        return list(self.files)
+
+    @property
+    def signature(self) -> Tuple[Tuple[str, int, int], ...]:
+        """The (name, mtime_ns, size) signature of the files the pack was built from."""
+        return tuple(sorted((f['name'], f['mtime_ns'], f['size']) for f in self.files.values()))
+
+    def is_fresh(self, knowledge_dir: Path) -> bool:
+        """
+        Check whether the pack still matches the knowledge directory.
+
+        Args:
+            knowledge_dir: Directory containing knowledge files
+
+        Returns:
+            True if no file was added, removed or modified since compiling
+        """
+        return self.signature == knowledge_signature(knowledge_dir)
+
+    def is_file_fresh(self, knowledge_dir: Path, filename: str) -> bool:
+        """Check whether a single packed file is unchanged on disk."""
+        entry = self.files.get(filename)
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(Path(knowledge_dir) / filename)
+        except OSError:
+            return False
+        return entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size
+
+    def file_text(self, filename: str) -> Optional[str]:
+        """
+        Get the normalized text of a packed file.
+
+        Args:
+            filename: Knowledge file name
+
+        Returns:
+            File text, or None if the file is not in the pack
+        """
+        entry = self.files.get(filename)
+        if entry is None:
+            return None
+        return self._slice(entry['offset'], entry['length'])
+
+    def sections(self) -> List[KnowledgeSection]:
+        """
+        Get every packed section with its precomputed heading tree and token estimate.
+
+        Returns:
+            List of sections in pack order; ``parent`` indexes into this list
+        """
+        return [
+            KnowledgeSection(
+                source=s['source'],
+                heading=s['heading'],
+                level=s['level'],
+                text=self._slice(s['offset'], s['length']),
+                start=s['start'],
+                parent=s['parent'],
+                token_estimate=s['tokens'],
+            )
+            for s in self._sections
+        ]
+
+    def close(self) -> None:
+        """Release the memory mapping."""
+        self._mmap.close()
+
+    def __enter__(self) -> "KnowledgePack":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _slice(self, offset: int, length: int) -> str:
+        start = self._blob_start + offset
+        return self._mmap[start:start + length].decode('utf-8')
+
+
+_packs: Dict[Path, Tuple[int, KnowledgePack]] = {}
+
+
+def load_knowledge_pack(project_root: Path) -> Optional[KnowledgePack]:
+    """
+    Get the compiled pack for a project, if one exists.
+
+    Packs are opened once per process and reopened only when the pack file
+    itself is recompiled.
+
+    Args:
+        project_root: Path to the project root directory
+
+    Returns:
+        Open KnowledgePack, or None if no usable pack exists
+    """
+    path = default_pack_path(project_root).resolve()
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _packs.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    try:
+        pack = KnowledgePack.open(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable knowledge pack {path}: {e}")
+        return None
+
+    if cached is not None:
+        cached[1].close()
+    _packs[path] = (mtime_ns, pack)
+    return pack
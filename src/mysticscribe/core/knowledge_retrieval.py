@@ -0,0 +1,356 @@
+"""
+Knowledge Retrieval
+
+Section-level BM25 retrieval over the knowledge base.
+
+Knowledge files are chunked by markdown heading and scored against a query
+built from the chapter being written (chapter number, outline and the ending
+of the previous chapter). Only the most relevant sections are placed in the
+prompt instead of every knowledge file verbatim.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from ..utils.file_cache import cached_read_text
+from ..utils.text_index import tokenize
+from ..utils.text_utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Number of sections returned when no explicit top_k is given
+DEFAULT_TOP_K = 8
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*$')
+
+# Very common words that carry no retrieval signal
+STOPWORDS = frozenset("""
+a an and are as at be but by for from had has have he her his i in is it its of on or
+she that the their them they this to was were which will with you
+""".split())
+
+
+@dataclass
+class KnowledgeSection:
+    """A heading-delimited section of a knowledge file."""
+    source: str
+    heading: str
+    level: int
+    text: str
+    start: int = 0
+    parent: Optional[int] = None  # index of the enclosing section in the same file
+    token_estimate: int = 0
+    tokens: List[str] = field(default_factory=list, repr=False)
+
+
+def chunk_by_heading(text: str, source: str) -> List[KnowledgeSection]:
+    """
+    Split a knowledge file into sections at markdown headings.
+
+    Text before the first heading becomes a section titled after the file.
+    Each section records the index of its parent heading (the nearest
+    preceding section with a shallower level) to form a heading tree.
+
+    Args:
+        text: Content of the knowledge file
+        source: Name of the knowledge file
+
+    Returns:
+        List of sections in document order
+    """
+    sections: List[KnowledgeSection] = []
+    heading = source
+    level = 0
+    start = 0
+    offset = 0
+
+    def close_section(end: int) -> None:
+        body = text[start:end].strip()
+        if not body:
+            return
+        parent = None
+        for i in range(len(sections) - 1, -1, -1):
+            if sections[i].level < level:
+                parent = i
+                break
+        sections.append(KnowledgeSection(
+            source, heading, level, body, start,
+            parent=parent,
+            token_estimate=estimate_tokens(body),
+        ))
+
+    for line in text.splitlines(keepends=True):
+        match = HEADING_PATTERN.match(line)
+        if match:
+            close_section(offset)
+            level = len(match.group(1))
+            heading = match.group(2).strip('=* ').strip() or source
+            start = offset
+        offset += len(line)
+
+    close_section(len(text))
+    return sections
+
+
+def is_chapter_plan(section: KnowledgeSection, chapter_number: int) -> bool:
+    """
+    Check whether a section is the plan for a specific chapter.
+
+    Args:
+        section: Knowledge section
+        chapter_number: Chapter number
+
+    Returns:
+        True if the section heading names the chapter (e.g. "Chapter 5: ...")
+    """
+    return re.search(rf'\bchapter\s+{chapter_number}\b', section.heading, re.IGNORECASE) is not None
+
+
+def sort_by_source(sections: List[KnowledgeSection], file_order: Optional[List[str]] = None) -> List[KnowledgeSection]:
+    """
+    Sort sections into knowledge-base order.
+
+    Args:
+        sections: Sections to sort
+        file_order: Preferred ordering of files
+
+    Returns:
+        Sections ordered by file priority, file name and position
+    """
+    priority = {name: i for i, name in enumerate(file_order or [])}
+    return sorted(sections, key=lambda s: (priority.get(s.source, len(priority)), s.source, s.start))
+
+
+class BM25Index:
+    """
+    Okapi BM25 scoring over a fixed list of sections.
+    """
+
+    def __init__(self, sections: List[KnowledgeSection], k1: float = 1.5, b: float = 0.75):
+        """
+        Build the index.
+
+        Args:
+            sections: Sections to index (tokens are computed if missing)
+            k1: Term-frequency saturation parameter
+            b: Length normalization parameter
+        """
+        self.sections = sections
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        self._lengths: List[int] = []
+
+        for i, section in enumerate(sections):
+            if not section.tokens:
+                section.tokens = tokenize(section.text)
+            self._lengths.append(len(section.tokens))
+            for term, tf in Counter(section.tokens).items():
+                self._postings.setdefault(term, []).append((i, tf))
+
+        count = len(sections)
+        self._avg_length = (sum(self._lengths) / count) if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def score(self, query: str) -> List[Tuple[int, float]]:
+        """
+        Score every section containing at least one query term.
+
+        Args:
+            query: Free-text query
+
+        Returns:
+            List of (section_index, score) sorted by descending score
+        """
+        terms = Counter(t for t in tokenize(query) if t not in STOPWORDS)
+        scores: Dict[int, float] = {}
+        avg_length = self._avg_length or 1.0
+
+        for term, query_tf in terms.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for i, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / avg_length)
+                scores[i] = scores.get(i, 0.0) + query_tf * idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class KnowledgeRetriever:
+    """
+    Retrieves the knowledge sections most relevant to a chapter.
+
+    The section index is rebuilt automatically when any knowledge file is
+    added, removed or modified.
+    """
+
+    def __init__(self, knowledge_dir: Path, file_order: Optional[List[str]] = None):
+        """
+        Initialize the Knowledge Retriever.
+
+        Args:
+            knowledge_dir: Directory containing knowledge files
+            file_order: Preferred ordering of files in formatted output
+        """
+        self.knowledge_dir = Path(knowledge_dir)
+        self.file_order = file_order or []
+        self._signature: Optional[tuple] = None
+        self._bm25: Optional[BM25Index] = None
+
+    @property
+    def sections(self) -> List[KnowledgeSection]:
+        """All knowledge sections, rebuilding the index if files changed."""
+        return self._ensure_index().sections
+
+    def rank(self, query: str, chapter_number: Optional[int] = None) -> List[KnowledgeSection]:
+        """
+        Rank sections by relevance to a query.
+
+        Sections whose heading names the given chapter (e.g. "Chapter 5" in
+        chapters.txt) come first, since the chapter plan is the most
+        important piece of knowledge for that chapter, followed by every
+        section matching the query in descending BM25 score.
+
+        Args:
+            query: Free-text query
+            chapter_number: Chapter being written, used to pin its plan
+
+        Returns:
+            Sections in relevance order
+        """
+        bm25 = self._ensure_index()
+        ranked: List[int] = []
+
+        if chapter_number is not None:
+            ranked.extend(
+                i for i, section in enumerate(bm25.sections)
+                if is_chapter_plan(section, chapter_number)
+            )
+
+        pinned = set(ranked)
+        ranked.extend(i for i, _ in bm25.score(query) if i not in pinned)
+        return [bm25.sections[i] for i in ranked]
+
+    def retrieve(self, query: str, top_k: int = DEFAULT_TOP_K,
+                 chapter_number: Optional[int] = None) -> List[KnowledgeSection]:
+        """
+        Get the top-k sections for a query.
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of sections to return
+            chapter_number: Chapter being written, used to pin its plan
+
+        Returns:
+            Selected sections in knowledge-base order
+        """
+        chosen = self.rank(query, chapter_number)[:max(top_k, 0)]
+        return self.in_source_order(chosen)
+
+    def in_source_order(self, sections: List[KnowledgeSection]) -> List[KnowledgeSection]:
+        """Sort sections back into knowledge-base order for display."""
+        return sort_by_source(sections, self.file_order)
+
+    def _ensure_index(self) -> BM25Index:
+        """Rebuild the BM25 index if the knowledge directory changed."""
+        files = []
+        if self.knowledge_dir.exists():
+            for entry in os.scandir(self.knowledge_dir):
+                if entry.name.endswith('.txt') and entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.name, stat.st_mtime_ns, stat.st_size))
+        signature = tuple(sorted(files))
+
+        if self._bm25 is None or signature != self._signature:
+            # Imported here because the pack module builds on this one
+            from .knowledge_pack import load_knowledge_pack
+            pack = load_knowledge_pack(self.knowledge_dir.parent)
+            if pack is not None and pack.signature == signature:
+                self._bm25 = BM25Index(pack.sections())
+                self._signature = signature
+                logger.debug(f"Loaded {len(self._bm25.sections)} knowledge sections from {pack.path}")
+                return self._bm25
+
+            sections = []
+            for name, _, _ in signature:
+                try:
+                    text = cached_read_text(self.knowledge_dir / name)
+                except Exception as e:
+                    logger.warning(f"Could not read knowledge file {name}: {e}")
+                    continue
+                sections.extend(chunk_by_heading(text, name))
+            self._bm25 = BM25Index(sections)
+            self._signature = signature
+            logger.debug(f"Built knowledge section index with {len(sections)} sections")
+
+        return self._bm25
+
+
+_retrievers: Dict[Path, KnowledgeRetriever] = {}
+
+
+def get_retriever(knowledge_dir: Path, file_order: Optional[List[str]] = None) -> KnowledgeRetriever:
+    """
+    Get the shared retriever for a knowledge directory.
+
+    Retrievers are kept for the life of the process so the section index is
+    only rebuilt when the knowledge files change.
+
+    Args:
+        knowledge_dir: Directory containing knowledge files
+        file_order: Preferred ordering of files in formatted output
+
+    Returns:
+        KnowledgeRetriever for the directory
+    """
+    key = Path(knowledge_dir).resolve()
+    retriever = _retrievers.get(key)
+    if retriever is None:
+        retriever = _retrievers[key] = KnowledgeRetriever(key, file_order)
+    return retriever
+
+
+def build_retrieval_query(chapter_number: int, outline: str = "", previous_context: str = "") -> str:
+    """
+    Build a retrieval query for a chapter.
+
+    Args:
+        chapter_number: The chapter being written
+        outline: Chapter outline, if one exists
+        previous_context: Ending of the previous chapter
+
+    Returns:
+        Free-text query string
+    """
+    return "\n".join(part for part in (f"Chapter {chapter_number}", outline, previous_context) if part)
+
+
+def format_sections(sections: List[KnowledgeSection]) -> str:
+    """
+    Format retrieved sections as a knowledge context string.
+
+    Args:
+        sections: Sections to format
+
+    Returns:
+        Formatted context string
+    """
+    context = "=== STORY KNOWLEDGE BASE (RELEVANT SECTIONS) ===\n\n"
+    current_source = None
+    for section in sections:
+        if section.source != current_source:
+            current_source = section.source
+            context += f"=== {section.source.upper().replace('.TXT', '')} ===\n"
+        context += section.text + "\n\n"
+    return context
@@ -0,0 +1,220 @@
+"""
+LLM Response Cache
+
+Content-addressed, size-bounded disk cache of LLM completions.
+
+Every completion is keyed on a hash of the model, its sampling parameters,
+the rendered messages (task prompt plus the tool calls and results so far)
+and the tool schemas offered, so a rerun with byte-identical knowledge,
+previous chapter and outline replays the earlier completions instead of
+paying for them again, while any change to the inputs misses. Entries are
+zlib-compressed JSON files in ``.mysticscribe/llm_cache/``; a hit refreshes
+the entry's modification time, and the least recently used entries are
+deleted once the cache grows past its byte budget.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+import logging
+
+from ..utils.file_utils import CACHE_DIR_NAME
+
+logger = logging.getLogger(__name__)
+
+# Bump when the key or record format changes, so old entries are ignored
+CACHE_VERSION = 1
+LLM_CACHE_DIRNAME = "llm_cache"
+ENTRY_SUFFIX = ".json.z"
+
+# Default budget for the compressed entries on disk
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Workflow stages whose completions may be cached
+CACHE_STAGES = ('outline', 'writer', 'editor')
+
+# Stages whose output is validated while it streams; they only use the cache inside a guard
+GUARDED_STAGES = ('writer', 'editor')
+
+
+def completion_key(model: str, params: Mapping[str, Any], messages: Union[str, Sequence[Any]],
+                   tools: Optional[Sequence[Any]] = None) -> str:
+    """
+    Hash everything that determines a completion.
+
+    Args:
+        model: Model name
+        params: Sampling parameters (temperature, max tokens, stop words, ...)
+        messages: Prompt string or chat messages, tool transcript included
+        tools: Tool schemas offered to the model
+
+    Returns:
+        Hex digest identifying the request
+    """
+    request = {
+        'version': CACHE_VERSION,
+        'model': model,
+        'params': dict(params),
+        'messages': messages,
+        'tools': tools or [],
+    }
+    encoded = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Disk cache of LLM completions keyed on ``completion_key``.
+    """
+
+    def __init__(self, project_root: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the LLM Response Cache.
+
+        Args:
+            project_root: Path to the project root directory
+            max_bytes: Maximum total size of the compressed entries
+        """
+        self.cache_dir = Path(project_root) / CACHE_DIR_NAME / LLM_CACHE_DIRNAME
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a completion.
+
+        Args:
+            key: Request key from ``completion_key``
+
+        Returns:
+            The cached completion, or None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                record = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {path}: {e}")
+            self.misses += 1
+            return None
+        if record.get('version') != CACHE_VERSION or record.get('key') != key:
+            self.misses += 1
+            return None
+
+        try:
+            # Mark as recently used for eviction
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return record.get('response')
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a completion and evict old entries over budget.
+
+        Args:
+            key: Request key from ``completion_key``
+            response: Completion text
+        """
+        path = self._path(key)
+        record = {'version': CACHE_VERSION, 'key': key, 'response': response}
+        data = zlib.compress(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+        if len(data) > self.max_bytes:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache LLM response in {path}: {e}")
+            return
+        self._evict(keep=path)
+
+    def discard(self, key: str) -> None:
+        """
+        Delete one cached completion, if present.
+
+        Args:
+            key: Request key from ``completion_key``
+        """
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete LLM cache entry {self._path(key)}: {e}")
+
+    def clear(self) -> None:
+        """Delete every cached completion."""
+        for path, _, _ in self._entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and current usage
+        """
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def _entries(self) -> list:
+        """(path, size, mtime_ns) of every entry."""
+        entries = []
+        try:
+            scanner = os.scandir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        with scanner:
+            for entry in scanner:
+                if not entry.name.endswith(ENTRY_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((Path(entry.path), stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used entries, other than ``keep``, until the cache fits its budget."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+            if total <= self.max_bytes:
+                break
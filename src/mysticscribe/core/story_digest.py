@@ -0,0 +1,408 @@
+"""
+Story Digest
+
+Persisted, incrementally updated "story so far" digest.
+
+Every saved chapter gets a small extractive digest (opening, key moments,
+ending and its highest-scoring sentences) stored in
+``.mysticscribe/story_digest/chapter_N.json``. A running arc summary of at
+most ``ARC_MAX_ENTRIES`` entries is kept in ``arc.json``: each new chapter is
+appended and the smallest adjacent entries are merged, so the arc stays small
+however long the story gets. Continuity tools read the
+arc plus the last few chapter digests, so their cost no longer grows with
+the number of chapters written.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import logging
+
+from .knowledge_retrieval import STOPWORDS
+from ..utils.file_utils import CACHE_DIR_NAME
+from ..utils.sentence_segmenter import segment_sentences
+from ..utils.text_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+DIGEST_VERSION = 2
+DIGEST_DIRNAME = "story_digest"
+
+# Extractive summary sizes
+SUMMARY_SENTENCES = 3
+ARC_MAX_ENTRIES = 12
+ARC_SENTENCES_PER_ENTRY = 2
+MAX_SENTENCE_CHARS = 240
+MIN_SENTENCE_TERMS = 5
+
+# Number of most recent chapters returned in full digest form
+RECENT_CHAPTERS = 3
+
+# Chapters with at most this many words are kept verbatim
+SHORT_CHAPTER_WORDS = 100
+
+KEY_MOMENT_WORDS = ['said', 'shouted', 'whispered', 'fought', 'attacked', 'discovered']
+
+
+def score_sentences(content: str) -> List[List]:
+    """
+    Score the sentences of a chapter for extractive summarization.
+
+    A sentence scores the summed log chapter frequency of its content words,
+    damped by the square root of their number, so sentences about the
+    chapter's recurring names and events rank highest without favouring
+    merely long ones.
+
+    Args:
+        content: Chapter text
+
+    Returns:
+        List of [score, sentence] pairs in text order
+    """
+    # Blank lines end sentences, so the paragraphs kept can be segmented together
+    text = '\n\n'.join(p.strip() for p in content.split('\n\n') if p.strip() and not p.lstrip().startswith('#'))
+    sentences = [' '.join(text[start:end].split()) for start, end in segment_sentences(text)]
+
+    frequencies = Counter(t for t in tokenize(content) if t not in STOPWORDS)
+    scored = []
+    for sentence in sentences:
+        terms = {t for t in tokenize(sentence) if t not in STOPWORDS}
+        if len(terms) < MIN_SENTENCE_TERMS:
+            continue
+        score = sum(math.log1p(frequencies[t]) for t in terms) / math.sqrt(len(terms))
+        scored.append([round(score, 4), sentence[:MAX_SENTENCE_CHARS]])
+    return scored
+
+
+def top_sentences(scored: Iterable[List], count: int) -> List[List]:
+    """Keep the ``count`` highest-scoring entries, preserving their order."""
+    scored = list(scored)
+    keep = sorted(range(len(scored)), key=lambda i: -scored[i][0])[:count]
+    return [scored[i] for i in sorted(keep)]
+
+
+def summarize_chapter(chapter_number: int, content: str) -> dict:
+    """
+    Build the digest of a single chapter.
+
+    Args:
+        chapter_number: The chapter number
+        content: Chapter text
+
+    Returns:
+        Digest dictionary
+    """
+    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+    lines = [line.strip() for line in content.split('\n') if line.strip() and not line.startswith('#')]
+    word_count = len(content.split())
+
+    key_moments = []
+    for p in paragraphs[1:-1]:
+        if '"' in p or any(action in p.lower() for action in KEY_MOMENT_WORDS):
+            key_moments.append(p[:150] + "...")
+            if len(key_moments) == 3:
+                break
+
+    return {
+        'number': chapter_number,
+        'sha1': hashlib.sha1(content.encode('utf-8')).hexdigest(),
+        'word_count': word_count,
+        'paragraph_count': len(paragraphs),
+        'text': content if word_count <= SHORT_CHAPTER_WORDS else None,
+        'opening': paragraphs[0][:200] if paragraphs else '',
+        'key_moments': key_moments,
+        'ending': paragraphs[-1][:200] if paragraphs else '',
+        'first_lines': '. '.join(lines[:2])[:200],
+        'last_lines': '. '.join(lines[-2:])[:200],
+        'summary': top_sentences(score_sentences(content), SUMMARY_SENTENCES),
+    }
+
+
+def arc_entry(digest: dict) -> dict:
+    """Create a single-chapter arc entry from a chapter digest."""
+    return {
+        'start': digest['number'],
+        'end': digest['number'],
+        'chapters': 1,
+        'words': digest['word_count'],
+        'sentences': top_sentences(digest['summary'], ARC_SENTENCES_PER_ENTRY),
+    }
+
+
+def compact_arc(entries: List[dict], max_entries: int = ARC_MAX_ENTRIES) -> List[dict]:
+    """
+    Merge adjacent arc entries until at most ``max_entries`` remain.
+
+    The adjacent pair covering the fewest chapters is merged first (the
+    oldest pair on ties), but never into an entry larger than the one
+    before it, so entries stay evenly sized and recent chapters are never
+    condensed more than older ones.
+
+    Args:
+        entries: Arc entries in chapter order
+        max_entries: Maximum number of entries
+
+    Returns:
+        Compacted list of entries
+    """
+    entries = list(entries)
+    while len(entries) > max_entries:
+        sizes = [entry['chapters'] for entry in entries]
+        candidates = [j for j in range(len(entries) - 1) if j == 0 or sizes[j] + sizes[j + 1] <= sizes[j - 1]]
+        i = min(candidates, key=lambda j: sizes[j] + sizes[j + 1])
+        first, second = entries[i], entries[i + 1]
+        entries[i:i + 2] = [{
+            'start': first['start'],
+            'end': second['end'],
+            'chapters': first['chapters'] + second['chapters'],
+            'words': first['words'] + second['words'],
+            'sentences': top_sentences(first['sentences'] + second['sentences'], ARC_SENTENCES_PER_ENTRY),
+        }]
+    return entries
+
+
+@dataclass
+class StorySoFar:
+    """Digest of every chapter before a target chapter."""
+    arc: List[dict] = field(default_factory=list)
+    recent: List[dict] = field(default_factory=list)
+
+    @property
+    def chapter_count(self) -> int:
+        return sum(entry['chapters'] for entry in self.arc)
+
+    @property
+    def total_words(self) -> int:
+        return sum(entry['words'] for entry in self.arc)
+
+    @property
+    def latest(self) -> Optional[dict]:
+        """Digest of the most recent chapter, if any."""
+        return self.recent[-1] if self.recent else None
+
+    def format_arc(self) -> str:
+        """Format the arc summary as one line per entry."""
+        lines = []
+        for entry in self.arc:
+            span = f"Chapter {entry['start']}" if entry['start'] == entry['end'] else f"Chapters {entry['start']}-{entry['end']}"
+            sentences = ' '.join(s[1] for s in entry['sentences'])
+            lines.append(f"• {span}: {sentences}" if sentences else f"• {span}")
+        return '\n'.join(lines)
+
+
+class StoryDigest:
+    """
+    Rolling digest of the chapters written so far.
+    """
+
+    def __init__(self, project_root: Union[str, Path], chapters_dir: Optional[Path] = None):
+        """
+        Initialize the Story Digest.
+
+        Args:
+            project_root: Path to the project root directory
+            chapters_dir: Directory containing chapter drafts (defaults to ``project_root/chapters``)
+        """
+        self.project_root = Path(project_root)
+        self.chapters_dir = Path(chapters_dir) if chapters_dir else self.project_root / "chapters"
+        self.digest_dir = self.project_root / CACHE_DIR_NAME / DIGEST_DIRNAME
+        self.arc_path = self.digest_dir / "arc.json"
+
+    def update_chapter(self, chapter_number: int, content: Optional[str] = None) -> Optional[dict]:
+        """
+        Re-digest a chapter after it was saved.
+
+        Appending a new latest chapter only touches its own digest and the
+        arc; revising an earlier chapter rebuilds the arc from the stored
+        chapter digests without re-reading any chapter text.
+
+        Args:
+            chapter_number: The chapter number
+            content: The saved content (read from disk if None)
+
+        Returns:
+            The chapter digest, or None if the chapter does not exist
+        """
+        chapter_path = self._chapter_path(chapter_number)
+        if content is None:
+            if not chapter_path.exists():
+                self.remove_chapter(chapter_number)
+                return None
+            content = chapter_path.read_text(encoding='utf-8')
+
+        digest = summarize_chapter(chapter_number, content)
+        try:
+            stat = os.stat(chapter_path)
+            digest['mtime_ns'] = stat.st_mtime_ns
+            digest['size'] = stat.st_size
+        except OSError:
+            digest['mtime_ns'] = digest['size'] = None
+        self._write_json(self._digest_path(chapter_number), digest)
+
+        state = self._load_arc()
+        if state is None:
+            self.rebuild()
+        elif chapter_number > state['latest']:
+            state['arc'] = compact_arc(state['arc'] + [arc_entry(digest)])
+            state['latest'] = chapter_number
+            self._write_json(self.arc_path, state)
+        else:
+            self._rebuild_arc()
+
+        logger.debug(f"Updated story digest for Chapter {chapter_number}")
+        return digest
+
+    def remove_chapter(self, chapter_number: int) -> None:
+        """
+        Drop a deleted chapter from the digest.
+
+        Args:
+            chapter_number: The chapter number
+        """
+        digest_path = self._digest_path(chapter_number)
+        if digest_path.exists():
+            digest_path.unlink()
+            self._rebuild_arc()
+
+    def rebuild(self) -> int:
+        """
+        Re-digest every chapter on disk.
+
+        Returns:
+            Number of chapters digested
+        """
+        self.digest_dir.mkdir(parents=True, exist_ok=True)
+        for digest_path in self.digest_dir.glob("chapter_*.json"):
+            digest_path.unlink()
+
+        count = 0
+        for chapter_number in self._chapter_numbers():
+            content = self._chapter_path(chapter_number).read_text(encoding='utf-8')
+            digest = summarize_chapter(chapter_number, content)
+            stat = os.stat(self._chapter_path(chapter_number))
+            digest['mtime_ns'] = stat.st_mtime_ns
+            digest['size'] = stat.st_size
+            self._write_json(self._digest_path(chapter_number), digest)
+            count += 1
+
+        self._rebuild_arc()
+        logger.info(f"Rebuilt story digest for {count} chapters")
+        return count
+
+    def chapter_digest(self, chapter_number: int) -> Optional[dict]:
+        """
+        Get the digest of a chapter, re-digesting it if the file changed.
+
+        Args:
+            chapter_number: The chapter number
+
+        Returns:
+            Chapter digest, or None if the chapter does not exist
+        """
+        digest = self._read_json(self._digest_path(chapter_number))
+        try:
+            stat = os.stat(self._chapter_path(chapter_number))
+        except OSError:
+            if digest is not None:
+                self.remove_chapter(chapter_number)
+            return None
+
+        if digest is None or digest.get('mtime_ns') != stat.st_mtime_ns or digest.get('size') != stat.st_size:
+            digest = self.update_chapter(chapter_number)
+        return digest
+
+    def story_so_far(self, before_chapter: int, recent: int = RECENT_CHAPTERS) -> StorySoFar:
+        """
+        Get the digest of every chapter before a target chapter.
+
+        Only the ``recent`` chapters immediately before the target are
+        checked against disk; the arc comes from ``arc.json``.
+
+        Args:
+            before_chapter: The chapter being written
+            recent: Number of preceding chapters to return in full digest form
+
+        Returns:
+            StorySoFar with the arc summary and recent chapter digests
+        """
+        if self._load_arc() is None and self._chapter_numbers():
+            self.rebuild()
+
+        window = range(max(1, before_chapter - recent), before_chapter)
+        recent_digests = [d for d in (self.chapter_digest(n) for n in window) if d is not None]
+
+        state = self._load_arc() or {'latest': 0, 'arc': []}
+        if state['latest'] < before_chapter:
+            arc = state['arc']
+        else:
+            # Writing an earlier chapter again: rebuild the arc up to it
+            arc = [e for e in state['arc'] if e['end'] < before_chapter]
+            covered = arc[-1]['end'] if arc else 0
+            digests = (self._read_json(self._digest_path(n)) for n in range(covered + 1, before_chapter))
+            arc = compact_arc(arc + [arc_entry(d) for d in digests if d is not None])
+
+        if not recent_digests and arc:
+            latest = self.chapter_digest(arc[-1]['end'])
+            if latest is not None:
+                recent_digests = [latest]
+
+        return StorySoFar(arc=arc, recent=recent_digests)
+
+    def _rebuild_arc(self) -> None:
+        """Rebuild the arc from the stored chapter digests."""
+        digests = sorted(
+            (d for d in (self._read_json(p) for p in self.digest_dir.glob("chapter_*.json")) if d is not None),
+            key=lambda d: d['number']
+        )
+        state = {
+            'version': DIGEST_VERSION,
+            'latest': digests[-1]['number'] if digests else 0,
+            'arc': compact_arc([arc_entry(d) for d in digests]),
+        }
+        self._write_json(self.arc_path, state)
+
+    def _load_arc(self) -> Optional[dict]:
+        state = self._read_json(self.arc_path)
+        if state is None or state.get('version') != DIGEST_VERSION:
+            return None
+        return state
+
+    def _chapter_numbers(self) -> List[int]:
+        numbers = []
+        if self.chapters_dir.exists():
+            for entry in os.scandir(self.chapters_dir):
+                match = re.match(r'^chapter_(\d+)\.md$', entry.name)
+                if match:
+                    numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _chapter_path(self, chapter_number: int) -> Path:
+        return self.chapters_dir / f"chapter_{chapter_number}.md"
+
+    def _digest_path(self, chapter_number: int) -> Path:
+        return self.digest_dir / f"chapter_{chapter_number}.json"
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable story digest file {path}: {e}")
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, data: Dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
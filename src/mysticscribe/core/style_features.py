@@ -0,0 +1,663 @@
+"""
+Style Features
+
+Per-chapter style features with mergeable aggregate statistics.
+
+Every chapter is analysed on its own into a small JSON record of counts,
+length histograms and the first few examples of each pattern. Records are
+cached in ``.mysticscribe/style_features/<sha1>.json`` keyed by the content
+hash of the chapter, and ``StyleAggregate`` merges them by summing counts
+and histograms and keeping the earliest examples, so analysing one more
+chapter only costs extracting that chapter.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import logging
+
+from .chapter_manifest import DRAFT_PATTERN
+from .style_fingerprint import DRIFT_THRESHOLD, VoiceProfile, fingerprint
+from ..utils.file_utils import CACHE_DIR_NAME
+from ..utils.length_stats import (
+    LENGTH_BUCKETS, RHYTHM_WINDOW, length_distribution, lengths_from_histogram, rhythm_metrics,
+)
+from ..utils.sentence_engine import CLAUSE_BREAKS, OccurrenceIndex, SentenceEngine
+from ..utils.term_matcher import TermMatcher
+from ..utils.text_document import TextDocument
+from ..utils.text_spans import TextSpans
+
+logger = logging.getLogger(__name__)
+
+FEATURES_VERSION = 4
+FEATURES_DIRNAME = "style_features"
+
+# Indicator word lists, counted case-insensitively as substrings
+SENSORY_PATTERNS = {
+    'Visual': ['gleam', 'glow', 'flicker', 'shimmer', 'shadow', 'light', 'glitter', 'sparkle', 'dark', 'bright', 'pale'],
+    'Auditory': ['whisper', 'echo', 'silence', 'thump', 'shriek', 'vibrated', 'hum', 'buzz', 'crack', 'rustle'],
+    'Tactile': ['cold', 'warm', 'rough', 'smooth', 'sharp', 'soft', 'hard', 'wet', 'dry', 'sticky'],
+    'Olfactory': ['scent', 'smell', 'aroma', 'stench', 'fragrance', 'musty', 'sweet', 'acrid'],
+    'Physical': ['ache', 'pulse', 'tremble', 'shiver', 'burn', 'tingle', 'numb', 'sore', 'tight']
+}
+ATMOSPHERIC_ELEMENTS = ['wind', 'mist', 'dawn', 'dusk', 'shadow', 'air']
+ACTION_INDICATORS = ['struck', 'leaped', 'rushed', 'charged', 'dodged', 'slammed', 'burst', 'sprinted']
+CONTEMPLATIVE_INDICATORS = ['wondered', 'thought', 'considered', 'realized', 'remembered', 'felt']
+EMOTION_WORDS = {
+    'tension': ['tense', 'tight', 'strained', 'coiled', 'rigid'],
+    'mystery': ['shadow', 'hidden', 'secret', 'mystery', 'unknown'],
+    'power': ['energy', 'force', 'power', 'strength', 'might'],
+    'elegance': ['graceful', 'elegant', 'smooth', 'fluid', 'refined']
+}
+
+# All indicator lists are counted together in a single pass
+INDICATOR_MATCHER = TermMatcher({
+    **{f'sensory:{sense}': terms for sense, terms in SENSORY_PATTERNS.items()},
+    'atmosphere': ATMOSPHERIC_ELEMENTS,
+    'action': ACTION_INDICATORS,
+    'contemplative': CONTEMPLATIVE_INDICATORS,
+    **{f'emotion:{emotion}': terms for emotion, terms in EMOTION_WORDS.items()},
+}, max_samples=1)
+
+DIALOGUE_TAG_PATTERN = re.compile(r'\s*([^.!?]*)')
+DIALOGUE_TAG_VERB_PATTERN = re.compile(r'said|asked|whispered|called|grunted|muttered|crowed|admonished|replied|demanded|urged', re.IGNORECASE)
+
+# Metaphorical constructions, matched within a clause: (start, required later text,
+# whether the match ends at the last required text rather than the end of the clause)
+METAPHOR_PATTERNS = [
+    ('like a ', None, False),
+    ('as ', ' as', True),
+    ('was a ', 'of|made|carved|forged', False),
+    ('seemed to ', None, False),
+    ('coiled like ', None, False),
+    ('carved from ', None, False),
+    ('flowed like ', None, False),
+    ('moved like ', None, False),
+    ('reminded ', ' of ', False),
+]
+_METAPHOR_PATTERNS = [
+    (re.compile(re.escape(start), re.IGNORECASE), re.compile(then, re.IGNORECASE) if then else None, to_last)
+    for start, then, to_last in METAPHOR_PATTERNS
+]
+
+# Recurring stylistic constructions, reported with their sentence
+SIGNATURE_PATTERNS = [
+    re.compile(r'pulsed|thrummed|hummed|vibrated', re.IGNORECASE),
+    re.compile(r'coiled|twisted|spiraled|wound', re.IGNORECASE),
+    re.compile(r'carved|etched|marked|traced', re.IGNORECASE),
+    re.compile(r'ancient|old|weathered|worn', re.IGNORECASE),
+]
+
+SIGNATURE_PHRASES_PER_PATTERN = 2
+
+NAME_PATTERN = re.compile(r'[A-Z][a-z]+')
+LETTER_PATTERN = re.compile(r'[A-Za-z]')
+SPEAKER_VERB_PATTERN = re.compile(r'said|asked|whispered|called|grunted|muttered|crowed|admonished')
+QUOTE_VERB_PATTERN = re.compile(r'said|asked|whispered|called|grunted|muttered|replied')
+TRANSITION_START_PATTERN = re.compile(r'(?:^|\. )(?=[A-Z])', re.MULTILINE)
+TRANSITION_WORD_PATTERN = re.compile(r'then|now|suddenly|meanwhile|however|still|yet')
+
+
+def find_metaphors(clauses: SentenceEngine) -> List[List[str]]:
+    """
+    Find metaphorical constructions, at most one per clause and pattern.
+
+    Args:
+        clauses: Engine over the text with clause breaks
+
+    Returns:
+        Matches for each entry of METAPHOR_PATTERNS
+    """
+    text = clauses.text
+    results = []
+    for start_pattern, then_pattern, to_last in _METAPHOR_PATTERNS:
+        matches = []
+        for (_, clause_end), start in clauses.find_segments(start_pattern):
+            if then_pattern is None:
+                matches.append(text[start.start():clause_end])
+            elif to_last:
+                last = clauses.last_match(then_pattern, start.end(), clause_end)
+                if last:
+                    matches.append(text[start.start():last.end()])
+            elif then_pattern.search(text, start.end(), clause_end):
+                matches.append(text[start.start():clause_end])
+        results.append(matches)
+    return results
+
+
+def find_signature_phrases(sentences: SentenceEngine, per_pattern: int = SIGNATURE_PHRASES_PER_PATTERN) -> List[List[str]]:
+    """
+    Find sentences using each signature construction, from their first letter.
+
+    A construction only counts when some letter precedes it in its sentence.
+
+    Args:
+        sentences: Engine over the text with sentence breaks
+        per_pattern: Number of sentences to collect per construction
+
+    Returns:
+        Phrases for each entry of SIGNATURE_PATTERNS
+    """
+    text = sentences.text
+    results = []
+    for pattern in SIGNATURE_PATTERNS:
+        phrases = []
+        position = 0
+        while len(phrases) < per_pattern:
+            match = pattern.search(text, position)
+            if match is None:
+                break
+            start, end = sentences.segment_at(match.start())
+            letter = LETTER_PATTERN.search(text, start, end)
+            if letter.start() < match.start() or pattern.search(text, letter.end(), end):
+                phrases.append(text[letter.start():end])
+            position = end + 1
+        results.append(phrases)
+    return results
+
+
+def find_speakers(sentences: SentenceEngine) -> List[str]:
+    """
+    Find the first capitalized name before a speech verb in each sentence.
+
+    Args:
+        sentences: Engine over the text with sentence breaks
+
+    Returns:
+        Speaker names in text order
+    """
+    names = OccurrenceIndex(sentences.text, NAME_PATTERN)
+    verbs = OccurrenceIndex(sentences.text, SPEAKER_VERB_PATTERN)
+    speakers = []
+    for start, end in sentences.segments():
+        name = names.first_between(start, end)
+        if name is None:
+            continue
+        verb = verbs.last_between(name.end(), end)
+        if verb is not None:
+            speakers.append(name.group())
+    return speakers
+
+
+def find_dialogue_speakers(spans: TextSpans, sentences: SentenceEngine) -> List[Tuple[str, str]]:
+    """
+    Pair quoted dialogue with the name that introduces it.
+
+    A quote is attributed when a speech verb follows it in the same sentence;
+    the speaker is the first capitalized name in the narration before it.
+
+    Args:
+        spans: Tokenized text with dialogue spans
+        sentences: Engine over the same text with sentence breaks
+
+    Returns:
+        List of (speaker, quote) pairs in text order
+    """
+    text = spans.text
+    names = OccurrenceIndex(text, NAME_PATTERN)
+    verbs = OccurrenceIndex(text, QUOTE_VERB_PATTERN)
+    pairs = []
+    narration_start = 0
+    for start, end in spans.dialogue:
+        name = names.first_between(narration_start, start - 1)
+        narration_start = end + 1
+        if name is None:
+            continue
+        verb = verbs.last_between(end + 1, sentences.segment_end(end + 1))
+        if verb is not None:
+            pairs.append((name.group(), text[start:end]))
+            narration_start = max(narration_start, verb.end())
+    return pairs
+
+
+def find_transitions(sentences: SentenceEngine, limit: int = 3) -> List[str]:
+    """
+    Find sentences that open a line or follow ". " and use a transition word.
+
+    Args:
+        sentences: Engine over the text with sentence breaks
+        limit: Maximum number of sentences to return
+
+    Returns:
+        Sentences from their capitalized first word to their end
+    """
+    text = sentences.text
+    transitions = OccurrenceIndex(text, TRANSITION_WORD_PATTERN)
+    found = []
+    resume = 0
+    for candidate in TRANSITION_START_PATTERN.finditer(text):
+        start = candidate.end()
+        if start < resume:
+            continue
+        end = sentences.segment_end(start)
+        if transitions.first_between(start + 1, end) is not None:
+            found.append(text[start:end])
+            resume = end
+            if len(found) == limit:
+                break
+    return found
+
+
+# Number of examples of each kind kept per chapter and in the aggregate
+MAX_EXAMPLES = 5
+
+# Sentences of at most this many characters are left out of sentence statistics
+MIN_SENTENCE_CHARS = 10
+
+# Quotes shorter than this are left out of per-speaker dialogue
+MIN_SPEAKER_QUOTE_WORDS = 3
+
+# Characters of the first and last lines kept as the chapter opening and closing
+OPENING_CHARS = 200
+
+# Most chapters handed to a worker process at a time
+WORKER_CHUNK_SIZE = 8
+
+# Number of preceding chapters that define the established voice for drift scoring
+DRIFT_REFERENCE_CHAPTERS = 10
+
+
+def _histogram(lengths: Iterable[int]) -> Dict[str, int]:
+    """Count word lengths, keyed by length as a string so the result is JSON-ready."""
+    return {str(length): count for length, count in sorted(Counter(lengths).items())}
+
+
+def extract_chapter_features(content: Union[str, TextDocument]) -> dict:
+    """
+    Extract the style features of one chapter.
+
+    Args:
+        content: Chapter text, or its TextDocument
+
+    Returns:
+        JSON-serializable feature record
+    """
+    spans = TextSpans.from_text(content)
+    content = spans.text
+    indicators = INDICATOR_MATCHER.scan(content)
+    sentences = SentenceEngine(content)
+
+    sentence_texts = spans.sentence_texts(min_chars=MIN_SENTENCE_CHARS)
+    sentence_lengths = [words for _, words in sentence_texts]
+    short_max, medium_max = LENGTH_BUCKETS['sentences']
+
+    # The tag is the rest of the sentence after each closing quote
+    tags = []
+    for _, end in spans.dialogue:
+        tag_match = DIALOGUE_TAG_PATTERN.match(content, end + 1)
+        if tag_match and DIALOGUE_TAG_VERB_PATTERN.search(tag_match.group(1)):
+            tags.append(tag_match.group(1).strip())
+
+    # Sensory examples are whole sentences; atmospheric ones run from the element
+    indicator_examples = {}
+    for sense in SENSORY_PATTERNS:
+        category = f'sensory:{sense}'
+        examples = {}
+        for term, positions in indicators.positions[category].items():
+            start, end = sentences.segment_at(positions[0])
+            examples[term] = content[start:end]
+        indicator_examples[category] = examples
+    indicator_examples['atmosphere'] = {
+        term: content[positions[0]:sentences.segment_end(positions[0])]
+        for term, positions in indicators.positions['atmosphere'].items()
+    }
+
+    speaker_dialogue = {}
+    for speaker, quote in find_dialogue_speakers(spans, sentences):
+        words = len(quote.split())
+        if words < MIN_SPEAKER_QUOTE_WORDS:
+            continue
+        entry = speaker_dialogue.setdefault(speaker, {'count': 0, 'words': 0, 'quotes': [], 'formal': False, 'informal': False})
+        lowered = quote.lower()
+        entry['count'] += 1
+        entry['words'] += words
+        if len(entry['quotes']) < MAX_EXAMPLES:
+            entry['quotes'].append(quote)
+        entry['formal'] = entry['formal'] or 'formal' in lowered or 'shall' in lowered
+        entry['informal'] = entry['informal'] or 'gonna' in lowered or "ain't" in lowered
+
+    metaphors = find_metaphors(SentenceEngine(content, CLAUSE_BREAKS))
+    lines = [line.strip() for line in content.split('\n') if line.strip() and not line.startswith('#')]
+
+    return {
+        'version': FEATURES_VERSION,
+        'word_count': spans.word_count,
+        'histograms': {
+            'sentences': _histogram(sentence_lengths),
+            'dialogue': _histogram(spans.dialogue_words),
+            'paragraphs': _histogram(spans.paragraph_words),
+        },
+        'sentence_lengths': sentence_lengths,
+        'short_sentences': [s for s, words in sentence_texts if words <= short_max][:MAX_EXAMPLES],
+        'long_sentences': [s for s, words in sentence_texts if words > medium_max][:MAX_EXAMPLES],
+        'dialogue_examples': [list(line) for line in spans.dialogue_texts()[:MAX_EXAMPLES]],
+        'dialogue_tags': list(dict.fromkeys(tags))[:MAX_EXAMPLES],
+        'metaphors': [[len(matches), matches[0] if matches else None] for matches in metaphors],
+        'indicators': indicators.counts,
+        'indicator_examples': indicator_examples,
+        'speakers': dict(Counter(find_speakers(sentences))),
+        'speaker_dialogue': speaker_dialogue,
+        'signature_phrases': find_signature_phrases(sentences),
+        'transitions': find_transitions(sentences, limit=MAX_EXAMPLES),
+        'fingerprint': fingerprint(content).tolist(),
+        'opening': '. '.join(lines[:2])[:OPENING_CHARS] if lines else None,
+        'closing': '. '.join(lines[-2:])[:OPENING_CHARS] if lines else None,
+    }
+
+
+def extract_many(contents: Sequence[str], workers: int = 1) -> List[dict]:
+    """
+    Extract the style features of several chapters, optionally in parallel.
+
+    With more than one worker the chapters are split into chunks handed to
+    a process pool; results come back in input order, so the records (and
+    anything merged from them) do not depend on the number of workers.
+
+    Args:
+        contents: Chapter texts
+        workers: Number of worker processes (1 extracts in this process)
+
+    Returns:
+        Feature records in the order of ``contents``
+    """
+    workers = min(workers, len(contents))
+    if workers <= 1:
+        return [extract_chapter_features(content) for content in contents]
+
+    chunk_size = max(1, min(WORKER_CHUNK_SIZE, -(-len(contents) // workers)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract_chapter_features, contents, chunksize=chunk_size))
+
+
+def _extend(target: list, items: Iterable, limit: int = MAX_EXAMPLES) -> None:
+    """Append items to a list until it holds ``limit`` entries."""
+    for item in items:
+        if len(target) >= limit:
+            break
+        target.append(item)
+
+
+@dataclass
+class StyleAggregate:
+    """
+    Style statistics merged from per-chapter feature records.
+
+    Counts and histograms are summed; example lists keep the earliest
+    entries, so merging chapters in story order gives the examples a single
+    pass over the concatenated chapters would find.
+    """
+    chapters: List[int] = field(default_factory=list)
+    word_count: int = 0
+    histograms: Dict[str, Counter] = field(default_factory=lambda: {kind: Counter() for kind in LENGTH_BUCKETS})
+    sentence_lengths: List[int] = field(default_factory=list)
+    short_sentences: List[str] = field(default_factory=list)
+    long_sentences: List[str] = field(default_factory=list)
+    dialogue_examples: List[list] = field(default_factory=list)
+    dialogue_tags: List[str] = field(default_factory=list)
+    metaphor_counts: List[int] = field(default_factory=lambda: [0] * len(METAPHOR_PATTERNS))
+    metaphor_examples: List[Optional[str]] = field(default_factory=lambda: [None] * len(METAPHOR_PATTERNS))
+    indicators: Dict[str, Counter] = field(default_factory=dict)
+    indicator_examples: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    speakers: Counter = field(default_factory=Counter)
+    speaker_dialogue: Dict[str, dict] = field(default_factory=dict)
+    signature_phrases: List[List[str]] = field(default_factory=lambda: [[] for _ in SIGNATURE_PATTERNS])
+    transitions: List[str] = field(default_factory=list)
+    fingerprints: List[Tuple[int, List[float]]] = field(default_factory=list)
+    openings: List[Tuple[int, str]] = field(default_factory=list)
+    closings: List[Tuple[int, str]] = field(default_factory=list)
+
+    @classmethod
+    def from_features(cls, chapters: Iterable[Tuple[int, dict]]) -> "StyleAggregate":
+        """
+        Merge the feature records of several chapters.
+
+        Args:
+            chapters: (chapter number, features) pairs in story order
+
+        Returns:
+            StyleAggregate over all the chapters
+        """
+        aggregate = cls()
+        for chapter_number, features in chapters:
+            aggregate.add(chapter_number, features)
+        return aggregate
+
+    def add(self, chapter_number: int, features: dict) -> None:
+        """
+        Merge one more chapter into the aggregate.
+
+        Args:
+            chapter_number: The chapter number
+            features: Its record from ``extract_chapter_features``
+        """
+        self.chapters.append(chapter_number)
+        self.word_count += features['word_count']
+
+        for kind, histogram in features['histograms'].items():
+            self.histograms[kind].update({int(length): count for length, count in histogram.items()})
+        self.sentence_lengths.extend(features['sentence_lengths'])
+
+        _extend(self.short_sentences, features['short_sentences'])
+        _extend(self.long_sentences, features['long_sentences'])
+        _extend(self.dialogue_examples, features['dialogue_examples'])
+        _extend(self.dialogue_tags, (t for t in features['dialogue_tags'] if t not in self.dialogue_tags))
+        _extend(self.transitions, features['transitions'])
+
+        for i, (count, example) in enumerate(features['metaphors']):
+            self.metaphor_counts[i] += count
+            if self.metaphor_examples[i] is None:
+                self.metaphor_examples[i] = example
+
+        for category, counts in features['indicators'].items():
+            self.indicators.setdefault(category, Counter()).update(counts)
+        for category, examples in features['indicator_examples'].items():
+            merged = self.indicator_examples.setdefault(category, {})
+            for term, example in examples.items():
+                merged.setdefault(term, example)
+
+        self.speakers.update(features['speakers'])
+        for speaker, entry in features['speaker_dialogue'].items():
+            merged = self.speaker_dialogue.setdefault(speaker, {'count': 0, 'words': 0, 'quotes': [], 'formal': False, 'informal': False})
+            merged['count'] += entry['count']
+            merged['words'] += entry['words']
+            _extend(merged['quotes'], entry['quotes'])
+            merged['formal'] = merged['formal'] or entry['formal']
+            merged['informal'] = merged['informal'] or entry['informal']
+
+        for phrases, new_phrases in zip(self.signature_phrases, features['signature_phrases']):
+            _extend(phrases, new_phrases, limit=SIGNATURE_PHRASES_PER_PATTERN)
+
+        self.fingerprints.append((chapter_number, features['fingerprint']))
+
+        if features['opening'] is not None:
+            self.openings.append((chapter_number, features['opening']))
+            self.closings.append((chapter_number, features['closing']))
+
+    def distribution(self, kind: str) -> dict:
+        """
+        Summarize the length histogram of one kind of span.
+
+        Args:
+            kind: 'sentences', 'dialogue' or 'paragraphs'
+
+        Returns:
+            ``length_distribution`` of the lengths, with short/medium/long
+            counts using the bounds in LENGTH_BUCKETS
+        """
+        return length_distribution(lengths_from_histogram(self.histograms[kind]), LENGTH_BUCKETS[kind])
+
+    def rhythm(self, window: int = RHYTHM_WINDOW) -> dict:
+        """Sentence-length variability over rolling windows, chapter after chapter."""
+        return rhythm_metrics(self.sentence_lengths, window)
+
+    @property
+    def dialogue_ratio(self) -> float:
+        """Share of all words that are inside dialogue."""
+        return self.distribution('dialogue')['total'] / self.word_count if self.word_count else 0.0
+
+    def indicator_total(self, category: str) -> int:
+        """Total matches of every indicator term in a category."""
+        return sum(self.indicators.get(category, {}).values())
+
+    def indicator_examples_for(self, category: str, terms: List[str]) -> List[str]:
+        """Examples of a category in term order, one per matched term."""
+        examples = self.indicator_examples.get(category, {})
+        return [examples[term] for term in terms if term in examples]
+
+
+class StyleFeatureCache:
+    """
+    Content-addressed store of per-chapter style features.
+    """
+
+    def __init__(self, project_root: Union[str, Path]):
+        """
+        Initialize the Style Feature Cache.
+
+        Args:
+            project_root: Path to the project root directory
+        """
+        self.cache_dir = Path(project_root) / CACHE_DIR_NAME / FEATURES_DIRNAME
+
+    def features(self, content: str) -> dict:
+        """
+        Get the style features of a chapter, extracting them on a cache miss.
+
+        Args:
+            content: Chapter text
+
+        Returns:
+            Feature record from ``extract_chapter_features``
+        """
+        return self.features_many([content])[0]
+
+    def features_many(self, contents: Sequence[str], workers: int = 1) -> List[dict]:
+        """
+        Get the style features of several chapters.
+
+        Only chapters whose content is not cached are extracted, in
+        ``workers`` processes.
+
+        Args:
+            contents: Chapter texts
+            workers: Number of worker processes for cache misses
+
+        Returns:
+            Feature records in the order of ``contents``
+        """
+        keys = [hashlib.sha1(content.encode('utf-8')).hexdigest() for content in contents]
+        found = {}
+        missing = {}
+        for key, content in zip(keys, contents):
+            if key not in found and key not in missing:
+                features = self._load(key)
+                if features is None:
+                    missing[key] = content
+                else:
+                    found[key] = features
+
+        if missing:
+            logger.debug(f"Extracting style features of {len(missing)} chapters with {workers} workers")
+            for key, features in zip(missing, extract_many(list(missing.values()), workers)):
+                self._store(key, features)
+                found[key] = features
+
+        return [found[key] for key in keys]
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                features = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable style features file {path}: {e}")
+            return None
+        return features if features.get('version') == FEATURES_VERSION else None
+
+    def _store(self, key: str, features: dict) -> None:
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(features, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache style features in {path}: {e}")
+
+
+@dataclass
+class ChapterDrift:
+    """Drift of one chapter from the voice of the chapters before it."""
+    chapter: int
+    drift: float
+    threshold: float
+    reference_chapters: List[int]
+    deviations: List[Tuple[str, float]]
+
+    @property
+    def flagged(self) -> bool:
+        """Whether the chapter drifts further than the threshold."""
+        return self.drift > self.threshold
+
+
+def chapter_drift(
+    project_root: Union[str, Path],
+    chapter_number: int,
+    content: Optional[str] = None,
+    reference_chapters: int = DRIFT_REFERENCE_CHAPTERS,
+    threshold: float = DRIFT_THRESHOLD
+) -> Optional[ChapterDrift]:
+    """
+    Score how far a chapter drifts from the established voice.
+
+    The established voice is built from the cached fingerprints of the
+    ``reference_chapters`` chapters before it, so scoring a new chapter only
+    fingerprints that chapter.
+
+    Args:
+        project_root: Path to the project root directory
+        chapter_number: The chapter to score
+        content: Its text (read from chapters/ if None)
+        reference_chapters: Number of preceding chapters defining the voice
+        threshold: Drift above which the chapter is flagged
+
+    Returns:
+        ChapterDrift, or None if there is no earlier chapter to compare with
+    """
+    chapters_dir = Path(project_root) / "chapters"
+    numbers = []
+    if chapters_dir.is_dir():
+        for entry in os.scandir(chapters_dir):
+            match = DRAFT_PATTERN.match(entry.name)
+            if match and int(match.group(1)) < chapter_number:
+                numbers.append(int(match.group(1)))
+    numbers = sorted(numbers)[-reference_chapters:]
+    if not numbers:
+        return None
+
+    if content is None:
+        content = (chapters_dir / f"chapter_{chapter_number}.md").read_text(encoding='utf-8')
+    references = [(chapters_dir / f"chapter_{n}.md").read_text(encoding='utf-8') for n in numbers]
+
+    cache = StyleFeatureCache(project_root)
+    voice = VoiceProfile.from_fingerprints('established', [f['fingerprint'] for f in cache.features_many(references)])
+    vector = fingerprint(content)
+    return ChapterDrift(
+        chapter=chapter_number,
+        drift=voice.drift(vector),
+        threshold=threshold,
+        reference_chapters=numbers,
+        deviations=voice.top_deviations(vector),
+    )
@@ -2,15 +2,50 @@
 Content Validation System
 
 Validates generated chapter content for quality, word count, and common issues.
+
+The content is split once into a ``ValidationDocument`` (words, paragraphs,
+sentences and a newline offset table) that every rule reads, and all
+AI meta-commentary patterns are found in a single pass over the lower-cased
+text, so validating a chapter costs about as much as reading it once.
+
+``IncrementalValidator`` builds the same document from per-paragraph partial
+results cached by paragraph hash, so re-validating a lightly edited chapter
+only re-checks the paragraphs that changed. ChapterManager uses it when a
+chapter is saved again, with the partials kept in
+``.mysticscribe/validation/``; a new chapter has nothing cached and is
+validated in full.
+
+``StreamingValidator`` applies the checks that can fail a draft outright (a
+meta-commentary opener such as "Here is Chapter 5" and runaway length) to
+text as it is streamed from the LLM, so a bad generation can be cancelled
+and retried without waiting for it to finish. The other AI patterns also
+occur in legitimate prose and stay post-hoc warnings.
 """
 
+import hashlib
+import json
+import os
 import re
-from typing import List, Dict, Tuple, Optional
+from bisect import bisect_right
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional, Union
 from dataclasses import dataclass
 import logging
 
+from ..utils.sentence_segmenter import segment_paragraphs, segment_sentences
+from ..utils.term_matcher import PhraseFinder
+from ..utils.text_document import TextDocument
+
 logger = logging.getLogger(__name__)
 
+NEWLINE_PATTERN = re.compile(r'\n')
+
+# Bump whenever the issues reported for a text could change (a rule, the sentence
+# segmenter) or the per-paragraph partials change shape; every cached validation
+# result, per paragraph or per chapter, is recomputed under a new version
+RULES_VERSION = 3
+VALIDATION_CACHE_DIRNAME = "validation"
+
 
 @dataclass
 class ValidationIssue:
@@ -21,6 +56,190 @@ class ValidationIssue:
     line_number: Optional[int] = None
 
 
+class SentenceTally:
+    """
+    Running sentence statistics used by the quality rules.
+    """
+
+    def __init__(self):
+        self.very_short_count = 0
+        self.very_long_count = 0
+        # First 20 characters of every long-enough sentence, in order of first appearance
+        self.start_counts: Dict[str, int] = {}
+
+    def add(self, sentence: str) -> None:
+        """Count one sentence."""
+        words = len(sentence.split())
+        if not words:
+            return
+        if words < 4:
+            self.very_short_count += 1
+        elif words > 40:
+            self.very_long_count += 1
+        stripped = sentence.strip()
+        if len(stripped) > 20:
+            start = stripped[:20].lower()
+            self.start_counts[start] = self.start_counts.get(start, 0) + 1
+
+    def merge(self, very_short: int, very_long: int, starts: List[List]) -> None:
+        """Add the statistics of sentences counted elsewhere, in text order."""
+        self.very_short_count += very_short
+        self.very_long_count += very_long
+        for start, count in starts:
+            self.start_counts[start] = self.start_counts.get(start, 0) + count
+
+
+class ValidationDocument:
+    """
+    Chapter content split once into the spans the validation rules share.
+    """
+
+    def __init__(self, content: Union[str, TextDocument]):
+        """
+        Split the content.
+
+        Args:
+            content: The chapter content to validate, or its TextDocument
+                (whose word and paragraph views are reused)
+        """
+        if isinstance(content, TextDocument):
+            document, content = content, content.text
+            self.word_count = document.word_count
+            self.paragraph_count = len(document.paragraphs)
+            sentences = document.sentences
+        else:
+            self.word_count = len(content.split())
+            self.paragraph_count = sum(1 for p in content.split('\n\n') if p.strip())
+            sentences = segment_sentences(content)
+        self.content = content
+        self.lowered = content.lower()
+        self.is_empty = not content.strip()
+        self.has_dialogue = '"' in content or "'" in content
+
+        self.sentence_count = len(sentences)
+        self.sentences = SentenceTally()
+        for start, end in sentences:
+            self.sentences.add(content[start:end])
+
+        # Offset of the first character of every line, for line-number lookups
+        self.line_starts = [0] + [m.end() for m in NEWLINE_PATTERN.finditer(self.lowered)]
+
+    def line_number(self, offset: int) -> int:
+        """1-based line number of an offset into the lower-cased content."""
+        return bisect_right(self.line_starts, offset)
+
+    def pattern_lines(self, finder: PhraseFinder) -> Dict[str, int]:
+        """
+        Find the first line of every phrase that occurs in the content.
+
+        Args:
+            finder: Phrases to look for
+
+        Returns:
+            Dictionary mapping each phrase found (lower-cased) to its first line
+        """
+        return {phrase: self.line_number(offset) for phrase, offset in finder.first_positions(self.lowered).items()}
+
+
+def paragraph_partial(paragraph: str, finder: PhraseFinder, sentences: Optional[List[str]] = None) -> dict:
+    """
+    Validate one paragraph in isolation.
+
+    A blank line always ends a sentence, so the sentences of a paragraph are
+    the same whether it is segmented alone or as part of the chapter.
+
+    Args:
+        paragraph: Paragraph text (the content between two blank-line separators)
+        finder: AI patterns to look for
+        sentences: The paragraph's sentences, if already segmented with the chapter
+
+    Returns:
+        JSON-ready dictionary of partial results
+    """
+    lowered = paragraph.lower()
+    if sentences is None:
+        sentences = [paragraph[start:end] for start, end in segment_sentences(paragraph)]
+    tally = SentenceTally()
+    for sentence in sentences:
+        tally.add(sentence)
+    return {
+        'version': RULES_VERSION,
+        'words': len(paragraph.split()),
+        'blank': not paragraph.strip(),
+        'dialogue': '"' in paragraph or "'" in paragraph,
+        'newlines': lowered.count('\n'),
+        'patterns': {phrase: lowered.count('\n', 0, offset) for phrase, offset in finder.first_positions(lowered).items()},
+        'sentences': len(sentences),
+        'very_short': tally.very_short_count,
+        'very_long': tally.very_long_count,
+        'starts': [[start, count] for start, count in tally.start_counts.items()],
+    }
+
+
+class ParagraphDocument(ValidationDocument):
+    """
+    ValidationDocument assembled from per-paragraph partial results.
+
+    Gives exactly the results of validating the whole content at once.
+    """
+
+    def __init__(self, content: str, finder: PhraseFinder, partials: Optional[Dict[str, dict]] = None):
+        """
+        Assemble the document, computing only the partials not already known.
+
+        Args:
+            content: The chapter content to validate
+            finder: AI patterns to look for
+            partials: Known partial results by paragraph hash
+        """
+        partials = partials if partials is not None else {}
+        self.content = content
+
+        paragraphs = content.split('\n\n')
+        keys = [hashlib.sha1(paragraph.encode('utf-8')).hexdigest() for paragraph in paragraphs]
+        known = {}
+        # First index of every paragraph whose partial must be computed
+        missing: Dict[str, int] = {}
+        for index, key in enumerate(keys):
+            record = partials.get(key)
+            if record is None or record.get('version') != RULES_VERSION:
+                missing.setdefault(key, index)
+            else:
+                known[key] = record
+
+        # Segmenting the whole content once costs less than a call per paragraph
+        by_paragraph = segment_paragraphs(content) if len(missing) > 1 else None
+        for key, index in missing.items():
+            sentences = None
+            if by_paragraph is not None:
+                sentences = [content[start:end] for start, end in by_paragraph[index]]
+            known[key] = paragraph_partial(paragraphs[index], finder, sentences)
+        self.checked_paragraphs = len(missing)
+        self.partials: Dict[str, dict] = {key: known[key] for key in keys}
+        records = [known[key] for key in keys]
+
+        self.is_empty = all(r['blank'] for r in records)
+        self.has_dialogue = any(r['dialogue'] for r in records)
+        self.word_count = sum(r['words'] for r in records)
+        self.paragraph_count = sum(1 for r in records if not r['blank'])
+        self.sentence_count = sum(r['sentences'] for r in records)
+        self.sentences = SentenceTally()
+        for record in records:
+            self.sentences.merge(record['very_short'], record['very_long'], record['starts'])
+
+        # First line of every pattern; each separator adds two newlines
+        self._pattern_lines: Dict[str, int] = {}
+        line = 1
+        for record in records:
+            for phrase, offset in record['patterns'].items():
+                self._pattern_lines.setdefault(phrase, line + offset)
+            line += record['newlines'] + 2
+
+    def pattern_lines(self, finder: PhraseFinder) -> Dict[str, int]:
+        """First line of every AI pattern found, from the partial results."""
+        return self._pattern_lines
+
+
 class ContentValidator:
     """
     Validates chapter content for quality, structure, and common issues.
@@ -46,6 +265,8 @@ class ContentValidator:
         "Our main character"
     ]
     
+    _PATTERN_FINDER = PhraseFinder(AI_PATTERNS)
+    
     # Word count ranges
     MIN_WORD_COUNT = 1800
     TARGET_MIN_WORD_COUNT = 2000
@@ -56,17 +277,18 @@ class ContentValidator:
         """Initialize the Content Validator."""
         pass
     
-    def validate_chapter_content(self, content: str) -> List[ValidationIssue]:
+    def validate_chapter_content(self, content: Union[str, TextDocument, ValidationDocument]) -> List[ValidationIssue]:
         """
         Validate chapter content comprehensively.
         
         Args:
-            content: The chapter content to validate
+            content: The chapter content to validate (or its TextDocument or ValidationDocument)
             
         Returns:
             List of validation issues found
         """
         issues = []
+        content = self._document(content)
         
         # Word count validation
         issues.extend(self._validate_word_count(content))
@@ -82,10 +304,15 @@ class ContentValidator:
         
         return issues
     
-    def _validate_word_count(self, content: str) -> List[ValidationIssue]:
+    @staticmethod
+    def _document(content: Union[str, TextDocument, ValidationDocument]) -> ValidationDocument:
+        """Split content into a ValidationDocument unless it already is one."""
+        return content if isinstance(content, ValidationDocument) else ValidationDocument(content)
+    
+    def _validate_word_count(self, content: Union[str, ValidationDocument]) -> List[ValidationIssue]:
         """Validate word count is within acceptable range."""
         issues = []
-        word_count = len(content.split())
+        word_count = self._document(content).word_count
         
         if word_count < self.MIN_WORD_COUNT:
             issues.append(ValidationIssue(
@@ -120,35 +347,30 @@ class ContentValidator:
         
         return issues
     
-    def _validate_ai_patterns(self, content: str) -> List[ValidationIssue]:
+    def _validate_ai_patterns(self, content: Union[str, ValidationDocument]) -> List[ValidationIssue]:
         """Check for AI generation patterns that shouldn't be in final content."""
         issues = []
+        first_lines = self._document(content).pattern_lines(self._PATTERN_FINDER)
         
         for pattern in self.AI_PATTERNS:
-            if pattern.lower() in content.lower():
-                # Find line number if possible
-                lines = content.split('\n')
-                line_num = None
-                for i, line in enumerate(lines, 1):
-                    if pattern.lower() in line.lower():
-                        line_num = i
-                        break
-                
+            line_number = first_lines.get(pattern.lower())
+            if line_number is not None:
                 issues.append(ValidationIssue(
                     severity='warning',
                     category='ai_patterns',
                     message=f"Found potential AI meta-commentary pattern: '{pattern}'",
-                    line_number=line_num
+                    line_number=line_number
                 ))
         
         return issues
     
-    def _validate_structure(self, content: str) -> List[ValidationIssue]:
+    def _validate_structure(self, content: Union[str, ValidationDocument]) -> List[ValidationIssue]:
         """Validate basic content structure."""
         issues = []
+        document = self._document(content)
         
         # Check if content is empty or too short
-        if not content.strip():
+        if document.is_empty:
             issues.append(ValidationIssue(
                 severity='error',
                 category='structure',
@@ -157,16 +379,15 @@ class ContentValidator:
             return issues
         
         # Check for basic paragraph structure
-        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-        if len(paragraphs) < 3:
+        if document.paragraph_count < 3:
             issues.append(ValidationIssue(
                 severity='warning',
                 category='structure',
-                message=f"Very few paragraphs detected: {len(paragraphs)} (may need better formatting)"
+                message=f"Very few paragraphs detected: {document.paragraph_count} (may need better formatting)"
             ))
         
         # Check for dialogue (should have some in most chapters)
-        if '"' not in content and "'" not in content:
+        if not document.has_dialogue:
             issues.append(ValidationIssue(
                 severity='info',
                 category='structure',
@@ -175,20 +396,14 @@ class ContentValidator:
         
         return issues
     
-    def _validate_content_quality(self, content: str) -> List[ValidationIssue]:
+    def _validate_content_quality(self, content: Union[str, ValidationDocument]) -> List[ValidationIssue]:
         """Validate content quality indicators."""
         issues = []
+        document = self._document(content)
+        sentences = document.sentences
         
         # Check for repetitive phrases
-        sentences = re.split(r'[.!?]+', content)
-        sentence_starts = [s.strip()[:20].lower() for s in sentences if len(s.strip()) > 20]
-        
-        # Find repeated sentence starts
-        start_counts = {}
-        for start in sentence_starts:
-            start_counts[start] = start_counts.get(start, 0) + 1
-        
-        repeated_starts = {start: count for start, count in start_counts.items() if count > 2}
+        repeated_starts = {start: count for start, count in sentences.start_counts.items() if count > 2}
         if repeated_starts:
             issues.append(ValidationIssue(
                 severity='warning',
@@ -197,21 +412,21 @@ class ContentValidator:
             ))
         
         # Check for very short sentences (might indicate choppy writing)
-        very_short_sentences = [s for s in sentences if len(s.strip().split()) < 4 and len(s.strip()) > 0]
-        if len(very_short_sentences) > len(sentences) * 0.3:  # More than 30% very short
+        very_short_count = sentences.very_short_count
+        if very_short_count > document.sentence_count * 0.3:  # More than 30% very short
             issues.append(ValidationIssue(
                 severity='warning',
                 category='quality',
-                message=f"Many very short sentences detected: {len(very_short_sentences)} out of {len(sentences)}"
+                message=f"Many very short sentences detected: {very_short_count} out of {document.sentence_count}"
             ))
         
         # Check for very long sentences (might indicate run-on sentences)
-        very_long_sentences = [s for s in sentences if len(s.strip().split()) > 40]
-        if very_long_sentences:
+        very_long_count = sentences.very_long_count
+        if very_long_count:
             issues.append(ValidationIssue(
                 severity='info',
                 category='quality',
-                message=f"Very long sentences detected: {len(very_long_sentences)} (check for run-on sentences)"
+                message=f"Very long sentences detected: {very_long_count} (check for run-on sentences)"
             ))
         
         return issues
@@ -283,3 +498,218 @@ class ContentValidator:
                 report += f"  - {issue.message}{line_info}\n"
         
         return report
+
+
+class IncrementalValidator(ContentValidator):
+    """
+    ContentValidator that re-checks only the paragraphs that changed.
+    
+    Partial results are cached by paragraph hash, optionally in a JSON file
+    so they survive between runs. Document-level results (word count,
+    repeated sentence starts, dialogue presence, ...) are rebuilt from the
+    partials and are identical to a full validation.
+    """
+    
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the Incremental Validator.
+        
+        Args:
+            cache_path: JSON file holding the partial results (None to only
+                cache in memory)
+        """
+        super().__init__()
+        self.cache_path = Path(cache_path) if cache_path is not None else None
+        self.partials: Dict[str, dict] = self._load()
+        self.checked_paragraphs = 0
+    
+    def validate_chapter_content(self, content: Union[str, TextDocument, ValidationDocument]) -> List[ValidationIssue]:
+        """
+        Validate chapter content, reusing cached paragraph results.
+        
+        Args:
+            content: The chapter content to validate (or its TextDocument or ValidationDocument)
+            
+        Returns:
+            List of validation issues found
+        """
+        document = self._document(content)
+        issues = super().validate_chapter_content(document)
+        
+        if isinstance(document, ParagraphDocument):
+            self.checked_paragraphs = document.checked_paragraphs
+            changed = document.checked_paragraphs or document.partials.keys() != self.partials.keys()
+            # Only the current paragraphs are kept, so the cache never outgrows the chapter
+            self.partials = document.partials
+            if changed:
+                self._store()
+        return issues
+    
+    def _document(self, content: Union[str, TextDocument, ValidationDocument]) -> ValidationDocument:
+        """Assemble a ParagraphDocument from cached partials unless given a ValidationDocument."""
+        if isinstance(content, ValidationDocument):
+            return content
+        if isinstance(content, TextDocument):
+            content = content.text
+        return ParagraphDocument(content, self._PATTERN_FINDER, self.partials)
+    
+    def _load(self) -> Dict[str, dict]:
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable validation cache {self.cache_path}: {e}")
+            return {}
+        return data.get('paragraphs', {}) if data.get('version') == RULES_VERSION else {}
+    
+    def _store(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix('.tmp')
+            # json.dumps uses the C encoder; json.dump to a file encodes in Python
+            data = json.dumps({'version': RULES_VERSION, 'paragraphs': self.partials}, ensure_ascii=False)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache validation results in {self.cache_path}: {e}")
+
+
+class GenerationAborted(BaseException):
+    """
+    Raised from a streaming callback to cancel a generation stage.
+    
+    Derives from BaseException (like KeyboardInterrupt) so it is not swallowed
+    by the ``except Exception`` retry handlers of the agent framework and
+    reaches the code that started the stage.
+    """
+    
+    def __init__(self, issue: ValidationIssue):
+        super().__init__(issue.message)
+        self.issue = issue
+
+
+class StreamingValidator:
+    """
+    Incremental validator for chapter text arriving in streamed chunks.
+    
+    Each chunk is checked once: opener patterns are searched in the chunk
+    plus the last few characters before it (so a pattern split across chunks
+    is still found) until the text is past its opening characters, and words
+    are counted across chunk boundaries. The first problem found is returned
+    as an error-severity ValidationIssue.
+    
+    Only openers abort: "This story" or "**Chapter" can be dialogue or a
+    requested title, so ContentValidator reports them as warnings once the
+    chapter is complete.
+    """
+    
+    # Meta-commentary that announces the output instead of starting the chapter
+    OPENER_PATTERNS = [
+        "Here is Chapter",
+        "Here's Chapter",
+        "The completed Chapter",
+        "Chapter Summary:",
+    ]
+    
+    # Characters at the start of the output in which an opener aborts the stream
+    OPENER_WINDOW = 200
+    
+    def __init__(self, max_word_count: int = ContentValidator.MAX_WORD_COUNT,
+                 patterns: Optional[List[str]] = None, start_marker: Optional[str] = None,
+                 opener_window: int = OPENER_WINDOW):
+        """
+        Initialize the streaming validator.
+        
+        Args:
+            max_word_count: Word count above which the stream is flagged
+            patterns: Opener patterns to flag (default: OPENER_PATTERNS)
+            start_marker: If given, only text after this marker is validated
+                (e.g. the "Final Answer:" that precedes an agent's output)
+            opener_window: Characters from the start of the validated text
+                in which a pattern must begin to be flagged
+        """
+        self.max_word_count = max_word_count
+        self.patterns = list(patterns if patterns is not None else self.OPENER_PATTERNS)
+        self.start_marker = start_marker
+        self.opener_window = opener_window
+        self._finder = PhraseFinder(self.patterns)
+        self._originals = {pattern.lower(): pattern for pattern in self.patterns}
+        self._overlap = max((len(p) for p in self._originals), default=1) - 1
+        self.reset()
+    
+    def reset(self) -> None:
+        """Forget all text seen so far (e.g. at the start of a new LLM call)."""
+        self.word_count = 0
+        self.issue: Optional[ValidationIssue] = None
+        self._started = self.start_marker is None
+        self._pending = ''
+        self._tail = ''
+        self._tail_line = 1  # Line on which the tail starts
+        self._offset = 0  # Characters validated before the current chunk
+        self._in_word = False
+    
+    def feed(self, chunk: str) -> Optional[ValidationIssue]:
+        """
+        Validate the next chunk of streamed text.
+        
+        Args:
+            chunk: Text streamed since the previous call
+            
+        Returns:
+            The first issue found in the stream so far, or None
+        """
+        if self.issue is not None or not chunk:
+            return self.issue
+        
+        if not self._started:
+            self._pending += chunk
+            marker_at = self._pending.find(self.start_marker)
+            if marker_at < 0:
+                self._pending = self._pending[-len(self.start_marker):]
+                return None
+            self._started = True
+            chunk = self._pending[marker_at + len(self.start_marker):]
+            self._pending = ''
+            if not chunk:
+                return None
+        
+        # Openers, including patterns that straddle the previous chunk
+        window_start = self._offset - len(self._tail)
+        if window_start < self.opener_window:
+            window = self._tail + chunk.lower()
+            first_positions = self._finder.first_positions(window)
+            if first_positions:
+                phrase, offset = min(first_positions.items(), key=lambda item: item[1])
+                if window_start + offset < self.opener_window:
+                    self.issue = ValidationIssue(
+                        severity='error',
+                        category='ai_patterns',
+                        message=f"Found AI meta-commentary pattern while generating: '{self._originals[phrase]}'",
+                        line_number=self._tail_line + window.count('\n', 0, offset)
+                    )
+                    return self.issue
+            tail = window[-self._overlap:] if self._overlap else ''
+            self._tail_line += window.count('\n', 0, len(window) - len(tail))
+            self._tail = tail
+        self._offset += len(chunk)
+        
+        # Runaway length; a word split across chunks is counted once
+        words = len(chunk.split())
+        if words and self._in_word and not chunk[0].isspace():
+            words -= 1
+        self._in_word = not chunk[-1].isspace()
+        self.word_count += words
+        if self.word_count > self.max_word_count:
+            self.issue = ValidationIssue(
+                severity='error',
+                category='word_count',
+                message=f"Generation exceeded {self.max_word_count} words"
+            )
+        return self.issue
@@ -2,10 +2,124 @@ from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from crewai.llm import LLM
-from typing import List
+from crewai.events import crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+from pathlib import Path
 import os
+import logging
+from .core import KnowledgeManager, StreamingValidator, GenerationAborted
+from .core.knowledge_retrieval import DEFAULT_TOP_K
+from .core.llm_cache import CACHE_STAGES, GUARDED_STAGES, LLMResponseCache, completion_key
+from .utils.file_cache import cached_read_text
 from .tools import KnowledgeLookupTool, ChapterAnalysisTool, OutlineManagementTool, PreviousChapterReaderTool, PreviousChapterEndingTool, StyleGuideTool, StyleAnalysisTool
 
+logger = logging.getLogger(__name__)
+
+# Agents write their output after this marker; the reasoning before it is not validated
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+# Validator fed by the stream handlers, set while a guard_llm_stream block runs
+_active_validator: Optional[StreamingValidator] = None
+_stream_handlers_registered = False
+
+
+def _on_llm_call_started(source, event) -> None:
+    if _active_validator is not None:
+        _active_validator.reset()
+
+
+def _on_llm_stream_chunk(source, event) -> None:
+    if _active_validator is None:
+        return
+    issue = _active_validator.feed(event.chunk)
+    if issue is not None:
+        raise GenerationAborted(issue)
+
+
+def _register_stream_handlers() -> None:
+    """Register the stream handlers with the event bus once per process."""
+    global _stream_handlers_registered
+    if not _stream_handlers_registered:
+        crewai_event_bus.register_handler(LLMCallStartedEvent, _on_llm_call_started)
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, _on_llm_stream_chunk)
+        _stream_handlers_registered = True
+
+
+@contextmanager
+def guard_llm_stream(validator: StreamingValidator) -> Iterator[StreamingValidator]:
+    """Validate every streamed LLM chunk while the block runs.
+
+    The validator is reset at the start of each LLM call and fed each chunk
+    as it arrives. On the first issue the call is cancelled by raising
+    GenerationAborted out of the stream, so the caller can retry at once
+    instead of paying for the rest of the generation. The handlers stay
+    registered and do nothing outside a block.
+    """
+    global _active_validator
+    _register_stream_handlers()
+    previous = _active_validator
+    _active_validator = validator
+    try:
+        yield validator
+    finally:
+        _active_validator = previous
+
+
+# LLM attributes that change a completion, hashed into its cache key
+CACHE_KEY_PARAMS = (
+    'temperature', 'top_p', 'n', 'stop', 'max_tokens', 'max_completion_tokens', 'presence_penalty',
+    'frequency_penalty', 'logit_bias', 'response_format', 'seed', 'reasoning_effort', 'additional_params',
+)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+class CachedLLM(LLM):
+    """LLM that replays completions of identical requests from an LLMResponseCache.
+
+    The key covers the model, the parameters in CACHE_KEY_PARAMS, the
+    messages (rendered task prompt and tool transcript) and the tools offered.
+    Only completed text responses are stored; a call cancelled by
+    guard_llm_stream raises before anything is cached, and a hit is returned
+    without streaming.
+
+    A guarded LLM (a stage whose output is validated as it streams) only uses
+    the cache inside a guard_llm_stream block: a hit is fed to the block's
+    validator before it is returned, and a call made without a guard (the
+    last, unguarded generation attempt) neither replays nor stores anything.
+    """
+
+    def __init__(self, *args, response_cache: LLMResponseCache, stage: str, guarded: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.response_cache = response_cache
+        self.stage = stage
+        self.guarded = guarded
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        validator = _active_validator
+        if self.guarded and validator is None:
+            return super().call(messages, tools, *args, **kwargs)
+
+        params = {name: getattr(self, name, None) for name in CACHE_KEY_PARAMS}
+        key = completion_key(self.model, params, messages, tools)
+        response = self.response_cache.get(key)
+        if response is not None:
+            if validator is not None:
+                validator.reset()
+                issue = validator.feed(response)
+                if issue is not None:
+                    self.response_cache.discard(key)
+                    raise GenerationAborted(issue)
+            logger.info(f"{self.stage.capitalize()} response replayed from the LLM cache")
+            return response
+        response = super().call(messages, tools, *args, **kwargs)
+        if isinstance(response, str):
+            self.response_cache.put(key, response)
+        return response
+
+
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -17,6 +131,27 @@ class Mysticscribe():
     agents: List[BaseAgent]
     tasks: List[Task]
 
+    def __init__(self, cache_stages: Iterable[str] = CACHE_STAGES, project_root: Optional[Path] = None):
+        """Create the crew.
+
+        Args:
+            cache_stages: Stages ('outline', 'writer', 'editor') whose LLM
+                completions are cached on disk and replayed on identical reruns
+            project_root: Project whose .mysticscribe directory holds the cache
+        """
+        unknown = set(cache_stages) - set(CACHE_STAGES)
+        if unknown:
+            raise ValueError(f"Unknown cache stages: {', '.join(sorted(unknown))}")
+        self.cache_stages = frozenset(cache_stages)
+        self.response_cache = LLMResponseCache(project_root or PROJECT_ROOT)
+
+    def stage_llm(self, stage: str, **kwargs) -> LLM:
+        """LLM for a workflow stage, cached if the stage is in cache_stages."""
+        if stage in self.cache_stages:
+            return CachedLLM(response_cache=self.response_cache, stage=stage,
+                             guarded=stage in GUARDED_STAGES, **kwargs)
+        return LLM(**kwargs)
+
     # Learn more about YAML configuration files here:
     # Agents: https://docs.crewai.com/concepts/agents#yaml-configuration-recommended
     # Tasks: https://docs.crewai.com/concepts/tasks#yaml-configuration-recommended
@@ -32,7 +167,7 @@ class Mysticscribe():
                 # drop_params=True,           # tell LiteLLM to strip anything not explicitly allowed
                 # additional_drop_params=["stop", "temperature", "top_p"]
             # ),
-            llm=LLM(model="gpt-4.1"),
+            llm=self.stage_llm('outline', model="gpt-4.1"),
             tools=[
                 KnowledgeLookupTool(), 
                 ChapterAnalysisTool(), 
@@ -47,7 +182,7 @@ class Mysticscribe():
     def writer(self) -> Agent:
         return Agent(
             config=self.agents_config['writer'], # type: ignore[index]
-            llm=LLM(model="gpt-4o", temperature=0.8),  # High creativity for vivid scene writing
+            llm=self.stage_llm('writer', model="gpt-4o", temperature=0.8, stream=True),  # High creativity for vivid scene writing; streamed for guard_llm_stream
             tools=[
                 KnowledgeLookupTool(), 
                 PreviousChapterReaderTool(),
@@ -60,7 +195,7 @@ class Mysticscribe():
     def editor(self) -> Agent:
         return Agent(
             config=self.agents_config['editor'], # type: ignore[index]
-            llm=LLM(model="gpt-4.1"),  # Higher creativity for natural style variation
+            llm=self.stage_llm('editor', model="gpt-4.1", stream=True),  # Higher creativity for natural style variation
             tools=[
                 PreviousChapterReaderTool(),  # For comprehensive previous chapter content and continuity checking
                 PreviousChapterEndingTool(),  # For checking how previous chapter ended
@@ -135,8 +270,18 @@ class Mysticscribe():
             task.context = [editing_context]
         return task
 
-    def load_knowledge_context(self) -> str:
-        """Load all knowledge files to provide context to agents"""
+    def load_knowledge_context(self, query: Optional[str] = None, chapter_number: Optional[int] = None,
+                               top_k: int = DEFAULT_TOP_K) -> str:
+        """Load knowledge files to provide context to agents.
+
+        With a query, only the top-k most relevant heading sections are loaded
+        (see ``KnowledgeManager.load_relevant_knowledge``); otherwise every
+        knowledge file is included.
+        """
+        if query is not None:
+            manager = KnowledgeManager(PROJECT_ROOT)
+            return manager.load_relevant_knowledge(query, top_k=top_k, chapter_number=chapter_number)
+
         knowledge_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'knowledge')
         context = "=== STORY KNOWLEDGE BASE ===\n\n"
         
@@ -156,9 +301,8 @@ class Mysticscribe():
         for filename in knowledge_files:
             file_path = os.path.join(knowledge_dir, filename)
             if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    context += f"=== {filename.upper().replace('.TXT', '')} ===\n"
-                    context += f.read()
-                    context += "\n\n"
+                context += f"=== {filename.upper().replace('.TXT', '')} ===\n"
+                context += cached_read_text(file_path)
+                context += "\n\n"
         
         return context
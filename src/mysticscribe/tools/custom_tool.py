@@ -3,6 +3,10 @@ from typing import Type
 from pydantic import BaseModel, Field
 import os
 
+from ..core.chapter_plan_index import get_chapter_plan_index, parse_chapter_spec
+from ..utils.file_cache import cached_read_text
+from ..utils.file_utils import read_tail_paragraphs
+
 
 class KnowledgeLookupInput(BaseModel):
     """Input schema for KnowledgeLookupTool."""
@@ -28,9 +32,8 @@ class KnowledgeLookupTool(BaseTool):
             if not os.path.exists(file_path):
                 return f"Knowledge file '{knowledge_file}' not found. Available files: chapters.txt, core_story_elements.txt, cultivation_system.txt, economic.txt, government.txt, knowledge_system_overview.txt, military.txt, plot.txt, regions.txt, society.txt"
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                return f"=== {knowledge_file.upper()} ===\n\n{content}"
+            content = cached_read_text(file_path)
+            return f"=== {knowledge_file.upper()} ===\n\n{content}"
                 
         except Exception as e:
             return f"Error reading knowledge file: {str(e)}"
@@ -38,12 +41,12 @@ class KnowledgeLookupTool(BaseTool):
 
 class ChapterAnalysisInput(BaseModel):
     """Input schema for ChapterAnalysisTool."""
-    chapter_number: str = Field(..., description="The chapter number to analyze (e.g., '1', '2', etc.)")
+    chapter_number: str = Field(..., description="The chapter number to analyze (e.g., '1', '2', etc.), or a range/list to pull a whole arc (e.g., '3-7' or '1, 4, 6-8')")
 
 class ChapterAnalysisTool(BaseTool):
     name: str = "Chapter Analysis"
     description: str = (
-        "Analyze the chapter structure and get specific details about a particular chapter from the chapters.txt file."
+        "Analyze the chapter structure and get specific details about a particular chapter (or a range of chapters) from the chapters.txt file."
     )
     args_schema: Type[BaseModel] = ChapterAnalysisInput
 
@@ -57,27 +60,29 @@ class ChapterAnalysisTool(BaseTool):
             if not os.path.exists(file_path):
                 return "chapters.txt file not found in knowledge directory"
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Look for the specific chapter in the content
-            lines = content.split('\n')
-            chapter_content = []
-            in_target_chapter = False
-            
-            for line in lines:
-                if f"Chapter {chapter_number}:" in line or f"#### Chapter {chapter_number}:" in line:
-                    in_target_chapter = True
-                    chapter_content.append(line)
-                elif in_target_chapter and line.startswith(('#### Chapter', '### Chapter')) and f"Chapter {chapter_number}" not in line:
-                    break
-                elif in_target_chapter:
-                    chapter_content.append(line)
-            
-            if chapter_content:
-                return f"=== CHAPTER {chapter_number} DETAILS ===\n\n" + '\n'.join(chapter_content)
-            else:
+            try:
+                chapter_numbers = parse_chapter_spec(chapter_number)
+            except ValueError as e:
+                return f"{e}. Use a chapter number like '5' or a range like '3-7'."
+            
+            index = get_chapter_plan_index(file_path)
+            
+            if len(chapter_numbers) == 1:
+                details = index.get(chapter_numbers[0])
+                if details:
+                    return f"=== CHAPTER {chapter_numbers[0]} DETAILS ===\n\n" + details
                 return f"Chapter {chapter_number} not found in chapters.txt. Please check the chapter number or refer to the full chapters.txt file."
+            
+            found = {num: details for num, details in index.get_many(chapter_numbers).items() if details}
+            if not found:
+                return f"Chapters {chapter_number} not found in chapters.txt. Planned chapters: {', '.join(map(str, index.chapter_numbers)) or 'none'}."
+            
+            result = f"=== CHAPTERS {chapter_number} DETAILS ===\n\n"
+            result += "\n\n".join(f"=== CHAPTER {num} ===\n\n{details}" for num, details in found.items())
+            missing = [str(num) for num in chapter_numbers if num not in found]
+            if missing:
+                result += f"\n\n(No plan found for chapters: {', '.join(missing)})"
+            return result
                 
         except Exception as e:
             return f"Error analyzing chapter: {str(e)}"
@@ -162,16 +167,8 @@ class PreviousChapterEndingTool(BaseTool):
             if not os.path.exists(chapter_file):
                 return f"Previous chapter (Chapter {previous_chapter_num}) file not found."
             
-            with open(chapter_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract the last 3-4 paragraphs for context
-            paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
-            
-            if len(paragraphs) >= 3:
-                ending = '\n\n'.join(paragraphs[-3:])
-            else:
-                ending = '\n\n'.join(paragraphs)
+            # Read only the last 3 paragraphs from the end of the file
+            ending = '\n\n'.join(read_tail_paragraphs(chapter_file, 3))
             
             return f"=== HOW CHAPTER {previous_chapter_num} ENDED ===\n\n{ending}\n\n=== CONTINUITY NOTE ===\nChapter {chapter_number} should begin exactly where this left off, maintaining the same emotional tone, character states, and immediate situation."
                 
@@ -2,7 +2,9 @@ from crewai.tools import BaseTool
 from typing import Type
 from pydantic import BaseModel, Field
 import os
-import re
+
+from ..core.story_digest import StoryDigest
+from ..utils.file_utils import read_tail_paragraphs
 
 
 class PreviousChapterReaderInput(BaseModel):
@@ -15,7 +17,7 @@ class PreviousChapterReaderInput(BaseModel):
 class PreviousChapterReaderTool(BaseTool):
     name: str = "Previous Chapter Reader"
     description: str = (
-        "Read and analyze all previously written chapters up to the target chapter number. Use this to maintain continuity, reference past events, and build upon character development from earlier chapters. Provides special focus on how the previous chapter ended to ensure seamless continuation."
+        "Summarize all previously written chapters up to the target chapter number. Use this to maintain continuity, reference past events, and build upon character development from earlier chapters. Provides special focus on how the previous chapter ended to ensure seamless continuation."
     )
     args_schema: Type[BaseModel] = PreviousChapterReaderInput
 
@@ -29,44 +31,32 @@ class PreviousChapterReaderTool(BaseTool):
                 
             # Get the chapters directory path
             current_dir = os.path.dirname(__file__)
-            chapters_dir = os.path.join(current_dir, '..', '..', '..', 'chapters')
+            project_root = os.path.join(current_dir, '..', '..', '..')
+            chapters_dir = os.path.join(project_root, 'chapters')
             
             if not os.path.exists(chapters_dir):
                 return "Chapters directory not found."
             
-            previous_chapters = []
-            
-            # Collect all previous chapters
-            for chapter_num in range(1, target_chapter_num):
-                chapter_file = os.path.join(chapters_dir, f'chapter_{chapter_num}.md')
-                
-                if os.path.exists(chapter_file):
-                    with open(chapter_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    previous_chapters.append((chapter_num, content))
+            # The digest holds the arc of all previous chapters plus the last few in detail
+            story = StoryDigest(project_root).story_so_far(target_chapter_num)
             
-            if not previous_chapters:
+            if not story.chapter_count:
                 return f"No previous chapters found for Chapter {target_chapter}."
             
             # Get the immediate previous chapter (most recent) for special focus
-            immediate_previous = previous_chapters[-1] if previous_chapters else None
+            immediate_previous = story.latest
             
             # Extract the ending of the immediate previous chapter for continuity focus
-            def extract_chapter_ending(content: str, paragraphs: int = 3) -> str:
-                """Extract the last few paragraphs of a chapter to focus on how it ended."""
-                # Split into paragraphs and get the last few non-empty ones
-                paragraphs_list = [p.strip() for p in content.split('\n\n') if p.strip()]
-                if len(paragraphs_list) >= paragraphs:
-                    return '\n\n'.join(paragraphs_list[-paragraphs:])
-                else:
-                    return '\n\n'.join(paragraphs_list)
+            def extract_chapter_ending(chapter_file: str, paragraphs: int = 3) -> str:
+                """Read the last few paragraphs of a chapter to focus on how it ended."""
+                return '\n\n'.join(read_tail_paragraphs(chapter_file, paragraphs))
             
             # Format the response with special focus on continuity
             result = f"=== PREVIOUS CHAPTERS ANALYSIS FOR CHAPTER {target_chapter} ===\n\n"
             
             if immediate_previous:
-                chapter_num, content = immediate_previous
-                ending = extract_chapter_ending(content)
+                chapter_num = immediate_previous['number']
+                ending = extract_chapter_ending(os.path.join(chapters_dir, f'chapter_{chapter_num}.md'))
                 result += f"=== IMMEDIATE PREVIOUS CHAPTER ({chapter_num}) ENDING - CRITICAL FOR CONTINUITY ===\n\n"
                 result += ending
                 result += "\n\n=== CONTINUITY REQUIREMENTS ===\n"
@@ -75,42 +65,35 @@ class PreviousChapterReaderTool(BaseTool):
                 result += "• Maintain the emotional tone and momentum established at the end of the previous chapter\n"
                 result += "• Reference the immediate situation, location, and character states from the previous chapter's conclusion\n\n"
             
-            # Include summaries of all previous chapters for broader context
-            result += "=== ALL PREVIOUS CHAPTERS SUMMARY ===\n\n"
+            # Condensed arc of the whole story so far
+            result += "=== STORY SO FAR ===\n\n"
+            result += story.format_arc() + "\n\n"
+            
+            # Key points of the most recent chapters
+            result += "=== RECENT CHAPTERS SUMMARY ===\n\n"
             
-            for chapter_num, content in previous_chapters:
-                # Extract key plot points and character moments
-                words = content.split()
-                if len(words) > 100:
-                    # Create a condensed summary focusing on key events
-                    result += f"--- CHAPTER {chapter_num} KEY POINTS ---\n"
+            for digest in story.recent:
+                chapter_num = digest['number']
+                if digest['text'] is not None:
+                    result += digest['text'] + "\n\n"
+                    continue
+                
+                result += f"--- CHAPTER {chapter_num} KEY POINTS ---\n"
+                if digest['paragraph_count'] >= 3:
+                    result += f"Opening: {digest['opening']}...\n\n"
                     
-                    # Try to extract the first and last paragraphs plus any dialogue for context
-                    paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+                    if digest['key_moments']:
+                        result += "Key moments:\n"
+                        for moment in digest['key_moments']:
+                            result += f"• {moment}\n"
+                        result += "\n"
                     
-                    if len(paragraphs) >= 3:
-                        result += f"Opening: {paragraphs[0][:200]}...\n\n"
-                        
-                        # Look for key dialogue or action sequences
-                        key_moments = []
-                        for p in paragraphs[1:-1]:
-                            if '"' in p or any(action in p.lower() for action in ['said', 'shouted', 'whispered', 'fought', 'attacked', 'discovered']):
-                                key_moments.append(p[:150] + "...")
-                        
-                        if key_moments:
-                            result += "Key moments:\n"
-                            for moment in key_moments[:3]:  # Limit to 3 key moments
-                                result += f"• {moment}\n"
-                            result += "\n"
-                        
-                        result += f"Ending: {paragraphs[-1][:200]}...\n\n"
-                    else:
-                        result += content[:300] + "...\n\n"
+                    result += f"Ending: {digest['ending']}...\n\n"
                 else:
-                    result += content + "\n\n"
+                    result += digest['opening'] + "...\n\n"
             
             result += "=== OVERALL STORY CONTINUITY NOTES ===\n\n"
-            result += f"Found and analyzed {len(previous_chapters)} previous chapters before Chapter {target_chapter}.\n"
+            result += f"Found and analyzed {story.chapter_count} previous chapters ({story.total_words:,} words) before Chapter {target_chapter}.\n"
             result += "Key considerations for Chapter " + target_chapter + ":\n"
             result += "• Maintain character development arcs established in previous chapters\n"
             result += "• Reference and build upon plot threads introduced earlier\n"
@@ -119,7 +102,7 @@ class PreviousChapterReaderTool(BaseTool):
             result += "• Address any foreshadowing or setup from earlier chapters\n"
             
             if immediate_previous:
-                result += f"\nCRITICAL: Pay special attention to how Chapter {immediate_previous[0]} ended. Chapter {target_chapter} should feel like a natural continuation, not a restart."
+                result += f"\nCRITICAL: Pay special attention to how Chapter {immediate_previous['number']} ended. Chapter {target_chapter} should feel like a natural continuation, not a restart."
             
             return result
                 
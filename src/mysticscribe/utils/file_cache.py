@@ -0,0 +1,172 @@
+"""
+File Cache
+
+Process-wide, size-bounded cache of decoded text files.
+
+Entries are keyed on the file path and validated against the file's
+``(mtime_ns, size)`` on every read, so a cache hit costs a single ``stat``
+and a modified file is transparently re-read. Least recently used entries
+are evicted once the total cached text exceeds the byte budget.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default budget for cached text (in characters of decoded content)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FileCache:
+    """
+    LRU cache of text file contents keyed on (path, mtime, size).
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the File Cache.
+
+        Args:
+            max_bytes: Maximum total size of cached content
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    def read_text(self, file_path: Union[str, Path], encoding: str = 'utf-8') -> str:
+        """
+        Read a text file through the cache.
+
+        Args:
+            file_path: Path to the file
+            encoding: File encoding
+
+        Returns:
+            File contents
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        with open(key, 'r', encoding=encoding) as f:
+            content = f.read()
+
+        with self._lock:
+            self._store(key, stat.st_mtime_ns, stat.st_size, content)
+        return content
+
+    def get(self, file_path: Union[str, Path], encoding: str = 'utf-8') -> Optional[str]:
+        """
+        Read a text file through the cache, returning None if it is missing or unreadable.
+
+        Args:
+            file_path: Path to the file
+            encoding: File encoding
+
+        Returns:
+            File contents or None
+        """
+        try:
+            return self.read_text(file_path, encoding)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Could not read {file_path} through cache: {e}")
+            return None
+
+    def invalidate(self, file_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Drop one file (or every file) from the cache.
+
+        Args:
+            file_path: File to drop, or None to clear the cache
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self._current_bytes = 0
+                return
+            entry = self._entries.pop(os.path.abspath(file_path), None)
+            if entry is not None:
+                self._current_bytes -= len(entry[2])
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and current usage
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def _store(self, key: str, mtime_ns: int, size: int, content: str) -> None:
+        """Insert an entry and evict least recently used entries over budget."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._current_bytes -= len(old[2])
+
+        if len(content) > self.max_bytes:
+            return
+
+        self._entries[key] = (mtime_ns, size, content)
+        self._current_bytes += len(content)
+
+        while self._current_bytes > self.max_bytes:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self._current_bytes -= len(evicted)
+            self.evictions += 1
+
+
+_file_cache = FileCache()
+
+
+def get_file_cache() -> FileCache:
+    """
+    Get the process-wide file cache.
+
+    Returns:
+        Shared FileCache instance
+    """
+    return _file_cache
+
+
+def cached_read_text(file_path: Union[str, Path], encoding: str = 'utf-8') -> str:
+    """
+    Read a text file through the process-wide cache.
+
+    Args:
+        file_path: Path to the file
+        encoding: File encoding
+
+    Returns:
+        File contents
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    return _file_cache.read_text(file_path, encoding)
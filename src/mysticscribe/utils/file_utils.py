@@ -6,11 +6,17 @@ Utility functions for safe file operations.
 
 import os
 from pathlib import Path
-from typing import Optional, Union
+from typing import Callable, List, Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Directory (relative to the project root) holding derived caches and indexes
+CACHE_DIR_NAME = '.mysticscribe'
+
+# Block size used when reading files backwards from the end
+TAIL_BLOCK_SIZE = 8192
+
 
 def ensure_directory(path: Union[str, Path]) -> Path:
     """
@@ -27,6 +33,20 @@ def ensure_directory(path: Union[str, Path]) -> Path:
     return dir_path
 
 
+def get_cache_dir(project_root: Union[str, Path], *parts: str) -> Path:
+    """
+    Get (and create) a cache directory under the project root.
+    
+    Args:
+        project_root: Path to the project root directory
+        *parts: Optional sub-directory components
+        
+    Returns:
+        Path object for the cache directory
+    """
+    return ensure_directory(Path(project_root, CACHE_DIR_NAME, *parts))
+
+
 def safe_read_file(file_path: Union[str, Path], encoding: str = 'utf-8') -> Optional[str]:
     """
     Safely read a file, returning None on error.
@@ -89,6 +109,121 @@ def safe_write_file(
         return False
 
 
+def _read_tail(
+    file_path: Union[str, Path],
+    is_enough: Callable[[str], bool],
+    block_size: int = TAIL_BLOCK_SIZE
+) -> Tuple[str, bool]:
+    """
+    Read a UTF-8 file backwards in blocks until enough of its tail is decoded.
+    
+    Each block is decoded once, and newlines are translated as when reading
+    in text mode (``\r\n`` and ``\r`` become ``\n``).
+    
+    Args:
+        file_path: Path to the file
+        is_enough: Called with the decoded tail after each block; stop when it returns True
+        block_size: Number of bytes read per step
+        
+    Returns:
+        Tuple of (decoded tail, whether the tail reaches the start of the file)
+    """
+    with open(file_path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        text = ''
+        # Continuation bytes at the start of the last block, decoded with the block before it
+        pending = b''
+        # Whether the text decoded so far started with "\n" before newline translation
+        starts_with_lf = False
+        
+        while True:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + pending
+            
+            # A block boundary may split a multi-byte character: keep its continuation bytes for later
+            skip = 0
+            if position > 0:
+                while skip < min(3, len(data)) and 0x80 <= data[skip] <= 0xBF:
+                    skip += 1
+            pending = data[:skip]
+            chunk = data[skip:].decode('utf-8')
+            
+            # A "\r\n" split between blocks is one newline, and its "\n" is already in the text
+            if starts_with_lf and chunk.endswith('\r'):
+                chunk = chunk[:-1]
+            starts_with_lf = chunk.startswith('\n')
+            text = chunk.replace('\r\n', '\n').replace('\r', '\n') + text
+            
+            if position == 0 or is_enough(text):
+                return text, position == 0
+
+
+def read_tail_text(
+    file_path: Union[str, Path],
+    max_chars: int,
+    block_size: int = TAIL_BLOCK_SIZE
+) -> Tuple[str, bool]:
+    """
+    Read the last characters of a UTF-8 file without reading the whole file.
+    
+    Args:
+        file_path: Path to the file
+        max_chars: Maximum number of characters to return
+        block_size: Number of bytes read per step
+        
+    Returns:
+        Tuple of (the last ``max_chars`` characters, whether the file is longer than that)
+        
+    Raises:
+        OSError: If the file cannot be read
+        UnicodeDecodeError: If the tail is not valid UTF-8
+    """
+    text, _ = _read_tail(file_path, lambda tail: len(tail) > max_chars, block_size)
+    if len(text) > max_chars:
+        return text[-max_chars:], True
+    return text, False
+
+
+def read_tail_paragraphs(
+    file_path: Union[str, Path],
+    count: int,
+    block_size: int = TAIL_BLOCK_SIZE
+) -> List[str]:
+    """
+    Read the last paragraphs of a UTF-8 file without reading the whole file.
+    
+    Paragraphs are separated by blank lines and stripped, exactly as
+    ``[p.strip() for p in content.split('\\n\\n') if p.strip()][-count:]``
+    would return them for the full content.
+    
+    Args:
+        file_path: Path to the file
+        count: Number of paragraphs to return
+        block_size: Number of bytes read per step
+        
+    Returns:
+        Up to ``count`` paragraphs in file order
+        
+    Raises:
+        OSError: If the file cannot be read
+        UnicodeDecodeError: If the tail is not valid UTF-8
+    """
+    def split(tail: str, complete: bool) -> List[str]:
+        pieces = tail.split('\n\n')
+        # Unless the tail reaches the start of the file, its first piece may be partial
+        if not complete:
+            pieces = pieces[1:]
+        return [p.strip() for p in pieces if p.strip()]
+    
+    if count <= 0:
+        return []
+    
+    text, complete = _read_tail(file_path, lambda tail: len(split(tail, False)) >= count, block_size)
+    return split(text, complete)[-count:]
+
+
 def get_file_stats(file_path: Union[str, Path]) -> Optional[dict]:
     """
     Get statistics for a file.
@@ -0,0 +1,310 @@
+"""
+Length Statistics Utilities
+
+Vectorized length distributions and rhythm metrics.
+
+Sentence, paragraph and dialogue lengths are gathered once into NumPy
+integer arrays; bucket counts, percentiles, variance and rolling-window
+variability are then derived with array operations instead of list
+comprehensions that re-split every item, so a whole manuscript of tens of
+thousands of sentences is summarized in milliseconds.
+
+Summaries are computed from a ``LengthHistogram`` and a ``RhythmTracker``,
+which can also be fed lengths batch by batch in constant memory; the
+result does not depend on how the lengths were batched.
+"""
+
+import math
+from typing import Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Number of consecutive sentences per rhythm window
+RHYTHM_WINDOW = 20
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Largest short and largest medium length, in words, of each kind of span
+LENGTH_BUCKETS = {
+    'sentences': (8, 20),
+    'dialogue': (5, 15),
+    'paragraphs': (30, 100),
+}
+
+Lengths = Union[np.ndarray, Sequence[int], Iterable[int]]
+
+
+def as_lengths(lengths: Lengths) -> np.ndarray:
+    """Convert word lengths to a one-dimensional int64 array."""
+    if isinstance(lengths, np.ndarray):
+        return lengths.astype(np.int64, copy=False)
+    if not isinstance(lengths, Sequence):
+        lengths = list(lengths)
+    return np.asarray(lengths, dtype=np.int64).reshape(-1)
+
+
+def lengths_from_histogram(histogram: Mapping[int, int]) -> np.ndarray:
+    """
+    Expand a length histogram into an array of lengths.
+
+    Args:
+        histogram: Mapping of word length to number of items with that length
+
+    Returns:
+        Sorted array with every length repeated by its count
+    """
+    if not histogram:
+        return np.zeros(0, dtype=np.int64)
+    values = np.fromiter((int(length) for length in histogram.keys()), dtype=np.int64, count=len(histogram))
+    counts = np.fromiter(histogram.values(), dtype=np.int64, count=len(histogram))
+    order = np.argsort(values)
+    return np.repeat(values[order], counts[order])
+
+
+def bucket_counts(lengths: Lengths, bounds: Tuple[int, int]) -> Tuple[int, int, int]:
+    """
+    Count short, medium and long items.
+
+    Args:
+        lengths: Word lengths
+        bounds: Largest short and largest medium length
+
+    Returns:
+        (short, medium, long) counts
+    """
+    array = as_lengths(lengths)
+    buckets = np.bincount(np.searchsorted(np.asarray(bounds), array, side='left'), minlength=3)
+    return int(buckets[0]), int(buckets[1]), int(buckets[2])
+
+
+class LengthHistogram:
+    """
+    Number of items of every word length, accumulated batch by batch.
+
+    Holds one counter per length up to the longest item, so lengths from a
+    manuscript of any size are summarized in constant memory.
+    """
+
+    __slots__ = ('counts',)
+
+    def __init__(self, lengths: Lengths = ()):
+        """
+        Create a histogram.
+
+        Args:
+            lengths: Optional first batch of word lengths
+        """
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.add(lengths)
+
+    def add(self, lengths: Lengths) -> None:
+        """Count a batch of word lengths."""
+        array = as_lengths(lengths)
+        if not array.size:
+            return
+        added = np.bincount(array)
+        if added.size > self.counts.size:
+            self.counts = np.concatenate((self.counts, np.zeros(added.size - self.counts.size, dtype=np.int64)))
+        self.counts[:added.size] += added
+
+    @property
+    def count(self) -> int:
+        """Number of items counted."""
+        return int(self.counts.sum())
+
+    def _values_at(self, ranks: np.ndarray) -> np.ndarray:
+        """Lengths at the given ranks of the sorted lengths."""
+        return np.searchsorted(np.cumsum(self.counts), ranks, side='right').astype(np.float64)
+
+    def distribution(self, bounds: Optional[Tuple[int, int]] = None) -> dict:
+        """
+        Summarize the distribution.
+
+        Args:
+            bounds: Largest short and largest medium length (adds bucket counts)
+
+        Returns:
+            Dictionary with count, total, mean, variance, std, percentiles and,
+            when bounds are given, short/medium/long counts
+        """
+        lengths = np.arange(self.counts.size, dtype=np.int64)
+        count = self.count
+        if count:
+            total = int(self.counts @ lengths)
+            squares = int(self.counts @ (lengths * lengths))
+            # Exact integer sums, so every statistic is rounded once
+            variance = (count * squares - total * total) / (count * count)
+            # Linear interpolation between order statistics, as numpy.percentile does
+            positions = (count - 1) * (np.asarray(PERCENTILES, dtype=np.float64) / 100)
+            below = np.floor(positions)
+            gamma = positions - below
+            low = self._values_at(below.astype(np.int64))
+            high = self._values_at(np.minimum(below.astype(np.int64) + 1, count - 1))
+            values = np.where(gamma >= 0.5, high - (high - low) * (1 - gamma), low + (high - low) * gamma)
+            stats = {
+                'count': count,
+                'total': total,
+                'mean': total / count,
+                'variance': variance,
+                'std': math.sqrt(variance),
+                'percentiles': {p: float(v) for p, v in zip(PERCENTILES, values)},
+            }
+        else:
+            stats = {
+                'count': 0,
+                'total': 0,
+                'mean': 0.0,
+                'variance': 0.0,
+                'std': 0.0,
+                'percentiles': {p: 0.0 for p in PERCENTILES},
+            }
+        if bounds is not None:
+            # Items no longer than each bound
+            short, medium = (int(self.counts[:bound + 1].sum()) for bound in bounds)
+            stats['short'], stats['medium'], stats['long'] = short, medium - short, count - medium
+        return stats
+
+
+def length_distribution(lengths: Lengths, bounds: Optional[Tuple[int, int]] = None) -> dict:
+    """
+    Summarize a length distribution.
+
+    Args:
+        lengths: Word lengths
+        bounds: Largest short and largest medium length (adds bucket counts)
+
+    Returns:
+        Dictionary with count, total, mean, variance, std, percentiles and,
+        when bounds are given, short/medium/long counts
+    """
+    return LengthHistogram(lengths).distribution(bounds)
+
+
+def window_variability(lengths: Lengths, window: int = RHYTHM_WINDOW) -> np.ndarray:
+    """
+    Standard deviation of sentence length in every window of consecutive sentences.
+
+    Uses running sums of lengths and squared lengths, so the cost is linear
+    in the number of sentences whatever the window size.
+
+    Args:
+        lengths: Sentence word lengths in text order
+        window: Sentences per window
+
+    Returns:
+        Array with one value per window start (empty if there are fewer
+        sentences than the window)
+    """
+    array = as_lengths(lengths)
+    if window <= 0 or array.size < window:
+        return np.zeros(0, dtype=np.float64)
+
+    sums = np.concatenate(([0], np.cumsum(array)))
+    squares = np.concatenate(([0], np.cumsum(array * array)))
+    window_sums = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    # window^2 * variance, exact in integers
+    scaled = window * window_squares - window_sums * window_sums
+    return np.sqrt(scaled.astype(np.float64)) / window
+
+
+# Float64 values are integer multiples of 2**-1126 (counting the 53-bit
+# mantissa of the smallest subnormal), so sums kept as integers in those
+# units are exact
+_SUM_UNIT_BITS = 1126
+
+
+def _exact_sum(values: np.ndarray) -> int:
+    """Exact sum of float64 values, in units of 2**-_SUM_UNIT_BITS."""
+    mantissas, exponents = np.frexp(values)
+    # Each value is mantissa * 2**(exponent - 53), with an integer mantissa below 2**53
+    mantissas = (mantissas * 2.0 ** 53).astype(np.int64)
+    total = 0
+    for exponent in np.unique(exponents).tolist():
+        group = mantissas[exponents == exponent]
+        # Halves of 26 bits cannot overflow int64 when summed
+        group_sum = (int((group >> 26).sum()) << 26) + int((group & ((1 << 26) - 1)).sum())
+        total += group_sum << (exponent - 53 + _SUM_UNIT_BITS)
+    return total
+
+
+class RhythmTracker:
+    """
+    Rolling-window sentence-length variability, fed sentence lengths batch by batch.
+
+    Keeps the last ``window - 1`` lengths so windows that span two batches
+    are measured, plus running totals of the per-window deviations.
+    """
+
+    __slots__ = ('window', 'tail', 'windows', 'total', 'min_std', 'max_std', 'flattest_start')
+
+    def __init__(self, lengths: Lengths = (), window: int = RHYTHM_WINDOW):
+        """
+        Create a tracker.
+
+        Args:
+            lengths: Optional first batch of sentence word lengths
+            window: Sentences per window
+        """
+        self.window = window
+        self.tail = np.zeros(0, dtype=np.int64)
+        self.windows = 0
+        self.total = 0
+        self.min_std = 0.0
+        self.max_std = 0.0
+        self.flattest_start: Optional[int] = None
+        self.add(lengths)
+
+    def add(self, lengths: Lengths) -> None:
+        """Add the next sentence lengths, in text order."""
+        array = np.concatenate((self.tail, as_lengths(lengths)))
+        variability = window_variability(array, self.window)
+        if variability.size:
+            flattest = int(variability.argmin())
+            if not self.windows or variability[flattest] < self.min_std:
+                self.min_std = float(variability[flattest])
+                self.flattest_start = self.windows + flattest
+            self.max_std = max(self.max_std, float(variability.max()))
+            self.total += _exact_sum(variability)
+            self.windows += int(variability.size)
+        self.tail = array[max(array.size - self.window + 1, 0):] if self.window > 1 else array[:0]
+
+    def metrics(self) -> dict:
+        """
+        Summarize the variability.
+
+        Returns:
+            Dictionary with the window size, number of windows and the mean,
+            minimum and maximum per-window standard deviation, plus the start
+            (sentence index) of the flattest window
+        """
+        if not self.windows:
+            return {'window': self.window, 'windows': 0, 'mean_std': 0.0, 'min_std': 0.0, 'max_std': 0.0,
+                    'flattest_start': None}
+        return {
+            'window': self.window,
+            'windows': self.windows,
+            'mean_std': self.total / (self.windows << _SUM_UNIT_BITS),
+            'min_std': self.min_std,
+            'max_std': self.max_std,
+            'flattest_start': self.flattest_start,
+        }
+
+
+def rhythm_metrics(lengths: Lengths, window: int = RHYTHM_WINDOW) -> dict:
+    """
+    Summarize how much sentence length varies within rolling windows.
+
+    Low values mean stretches of same-length sentences (a monotonous
+    rhythm); high values mean short and long sentences are mixed.
+
+    Args:
+        lengths: Sentence word lengths in text order
+        window: Sentences per window
+
+    Returns:
+        Dictionary with the window size, number of windows and the mean,
+        minimum and maximum per-window standard deviation, plus the start
+        (sentence index) of the flattest window
+    """
+    return RhythmTracker(lengths, window).metrics()
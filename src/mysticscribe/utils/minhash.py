@@ -0,0 +1,154 @@
+"""
+MinHash Utilities
+
+MinHash signatures and LSH band keys for near-duplicate text detection.
+
+A text is reduced to the set of its word n-gram shingles; the MinHash
+signature keeps, for each of ``NUM_PERMUTATIONS`` random hash functions, the
+smallest hash of any shingle. The fraction of positions on which two
+signatures agree estimates the Jaccard similarity of the shingle sets.
+Signatures are cut into ``BANDS`` bands of ``ROWS`` rows and each band is
+hashed to a single key, so texts that are likely similar share at least one
+band key and can be found by exact key lookups instead of comparing every
+pair.
+"""
+
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+from .text_index import TOKEN_PATTERN
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+# Signature length and its split into LSH bands; pairs with Jaccard
+# similarity s share a band with probability 1 - (1 - s**ROWS)**BANDS,
+# about 87% at 0.5 and 99% at 0.6
+NUM_PERMUTATIONS = 128
+BANDS = 32
+ROWS = NUM_PERMUTATIONS // BANDS
+
+SEED = 1
+
+# Hash functions h(x) = (a * x + b) >> 32 on 64-bit words (multiply-shift hashing)
+_rng = np.random.default_rng(SEED)
+_A = _rng.integers(1, 1 << 63, size=NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 1 << 63, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_BAND_MULTIPLIERS = _rng.integers(1, 1 << 63, size=ROWS, dtype=np.uint64) | np.uint64(1)
+_GRAM_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+_SHIFT = np.uint64(32)
+
+# Signature value of a text without shingles
+EMPTY = np.iinfo(np.uint32).max
+
+
+def _words(text: str) -> List[str]:
+    """Lowercase word tokens (the tokens of ``text_index.tokenize``, found with a single findall)."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _gram_hashes(words: List[str], ends: Sequence[int], size: int) -> np.ndarray:
+    """
+    Hash every run of ``size`` consecutive words.
+
+    Args:
+        words: Words of one or more texts, concatenated
+        ends: End offset of each text in ``words``; runs crossing an end are dropped
+        size: Words per run
+
+    Returns:
+        32-bit run hashes (as uint64), texts in order
+    """
+    table = {word: zlib.crc32(word.encode('utf-8')) for word in set(words)}
+    word_hashes = np.fromiter(map(table.__getitem__, words), dtype=np.uint64, count=len(words))
+    count = len(words) - size + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    combined = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        combined = combined * _GRAM_MULTIPLIER + word_hashes[offset:offset + count]
+
+    keep = np.ones(count, dtype=bool)
+    crossing = (np.asarray(ends[:-1], dtype=np.int64)[:, None] - np.arange(1, size)[None, :]).ravel()
+    keep[crossing[(crossing >= 0) & (crossing < count)]] = False
+    return combined[keep] >> _SHIFT
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """
+    Hash the word n-grams of a text.
+
+    Args:
+        text: Text to shingle
+        size: Words per shingle
+
+    Returns:
+        Sorted array of distinct shingle hashes (empty if the text has fewer
+        than ``size`` words)
+    """
+    words = _words(text)
+    return np.unique(_gram_hashes(words, [len(words)], size))
+
+
+def signatures(texts: Sequence[str]) -> np.ndarray:
+    """
+    Compute the MinHash signatures of several texts.
+
+    The words of all texts are hashed together and shingle hashes are built
+    with array arithmetic, so a whole chapter is signed in a handful of
+    vectorized operations.
+
+    Args:
+        texts: Texts to sign (each should have at least ``SHINGLE_SIZE`` words)
+
+    Returns:
+        Array of shape (len(texts), NUM_PERMUTATIONS); a text without
+        shingles gets an all-``EMPTY`` signature
+    """
+    result = np.full((len(texts), NUM_PERMUTATIONS), EMPTY, dtype=np.uint32)
+    word_lists = [_words(text) for text in texts]
+    lengths = np.array([len(words) for words in word_lists], dtype=np.int64)
+    gram_counts = np.maximum(lengths - SHINGLE_SIZE + 1, 0)
+    present = np.flatnonzero(gram_counts)
+    if not present.size:
+        return result
+
+    grams = _gram_hashes([word for words in word_lists for word in words], np.cumsum(lengths), SHINGLE_SIZE)
+
+    # Hash every shingle under every permutation, then take per-text minima
+    hashed = (_A[:, None] * grams[None, :] + _B[:, None]) >> _SHIFT
+    starts = np.concatenate(([0], np.cumsum(gram_counts)[:-1]))[present]
+    result[present] = np.minimum.reduceat(hashed, starts, axis=1).T
+    return result
+
+
+def band_keys(signature_matrix: np.ndarray) -> np.ndarray:
+    """
+    Hash each band of each signature to one 64-bit key.
+
+    Args:
+        signature_matrix: Array of shape (n, NUM_PERMUTATIONS)
+
+    Returns:
+        Array of shape (n, BANDS)
+    """
+    bands = np.asarray(signature_matrix, dtype=np.uint64).reshape(len(signature_matrix), BANDS, ROWS)
+    # Multiply-and-add mixing that wraps modulo 2**64
+    return (bands * _BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64)
+
+
+def similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """
+    Estimated Jaccard similarity between one signature and several others.
+
+    Args:
+        signature: Array of shape (NUM_PERMUTATIONS,)
+        others: Array of shape (n, NUM_PERMUTATIONS)
+
+    Returns:
+        Array of n similarities in [0, 1]
+    """
+    return (np.asarray(others) == np.asarray(signature)).mean(axis=1)
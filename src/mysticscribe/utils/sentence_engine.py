@@ -0,0 +1,121 @@
+"""
+Sentence Engine Utilities
+
+Linear-time, sentence-scoped pattern extraction.
+
+Regexes such as ``[^.!?]*{term}[^.!?]*`` or ``[A-Z][^.!?]*{term}[^.!?]*``
+find a term and its enclosing sentence in one expression, but the engine
+retries the leading ``[^.!?]*`` from every candidate start, which is
+quadratic on long passages without sentence punctuation. The engine here
+records the offsets of every sentence break once; patterns are then matched
+on their own and each match is expanded to its enclosing segment with a
+binary search. Searches skip to the end of a segment once it has matched,
+so every character is scanned a bounded number of times.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Iterator, List, Optional, Tuple
+
+Span = Tuple[int, int]
+
+SENTENCE_BREAKS = '.!?'
+CLAUSE_BREAKS = ',.!?'
+
+
+class SentenceEngine:
+    """
+    Break-offset table over a text for expanding matches to their segment.
+
+    A segment is the text between two break characters (exclusive), which
+    is exactly what ``[^.!?]*`` can span on either side of a match.
+    """
+
+    def __init__(self, text: str, breaks: str = SENTENCE_BREAKS):
+        """
+        Record the offset of every break character.
+
+        Args:
+            text: Text to index
+            breaks: Characters that end a segment
+        """
+        self.text = text
+        self.breaks: List[int] = [m.start() for m in re.finditer(f'[{re.escape(breaks)}]', text)]
+
+    def segment_start(self, offset: int) -> int:
+        """Start of the segment containing an offset."""
+        i = bisect_left(self.breaks, offset)
+        return self.breaks[i - 1] + 1 if i > 0 else 0
+
+    def segment_end(self, offset: int) -> int:
+        """End (exclusive) of the segment containing an offset."""
+        i = bisect_left(self.breaks, offset)
+        return self.breaks[i] if i < len(self.breaks) else len(self.text)
+
+    def segment_at(self, offset: int) -> Span:
+        """The (start, end) span of the segment containing an offset."""
+        return self.segment_start(offset), self.segment_end(offset)
+
+    def segments(self) -> Iterator[Span]:
+        """Yield every segment span in order."""
+        start = 0
+        for position in self.breaks:
+            yield start, position
+            start = position + 1
+        yield start, len(self.text)
+
+    def find_segments(self, pattern: re.Pattern, limit: Optional[int] = None) -> List[Tuple[Span, re.Match]]:
+        """
+        Find the segments containing a pattern, with their first match.
+
+        Args:
+            pattern: Compiled pattern to search for (must not span a break)
+            limit: Stop after this many segments
+
+        Returns:
+            List of (segment span, first match) pairs in text order
+        """
+        found = []
+        position = 0
+        while limit is None or len(found) < limit:
+            match = pattern.search(self.text, position)
+            if match is None:
+                break
+            span = self.segment_at(match.start())
+            found.append((span, match))
+            position = span[1] + 1
+        return found
+
+    def last_match(self, pattern: re.Pattern, start: int, end: int) -> Optional[re.Match]:
+        """Get the last non-overlapping match of a pattern within a range."""
+        last = None
+        for last in pattern.finditer(self.text, start, end):
+            pass
+        return last
+
+
+class OccurrenceIndex:
+    """
+    Sorted match offsets of a pattern for range queries.
+
+    Lets callers ask "is there a match between these offsets?" in
+    logarithmic time instead of re-searching the text.
+    """
+
+    def __init__(self, text: str, pattern: re.Pattern):
+        self.matches: List[re.Match] = list(pattern.finditer(text))
+        self.starts: List[int] = [m.start() for m in self.matches]
+
+    def first_between(self, start: int, end: int) -> Optional[re.Match]:
+        """First match starting in ``[start, end)``."""
+        i = bisect_left(self.starts, start)
+        if i < len(self.starts) and self.starts[i] < end:
+            return self.matches[i]
+        return None
+
+    def last_between(self, start: int, end: int) -> Optional[re.Match]:
+        """Last match starting in ``[start, end)``."""
+        i = bisect_right(self.starts, end - 1) - 1
+        if i >= 0 and self.starts[i] >= start:
+            return self.matches[i]
+        return None
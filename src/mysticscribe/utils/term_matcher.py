@@ -0,0 +1,183 @@
+"""
+Term Matcher Utilities
+
+Count many indicator words across many categories in a single pass.
+
+All terms of all categories are compiled into one case-folded regex whose
+alternation is factored into a prefix trie (``sh(?:adow|arp|iver)``), so the
+scan cost stays flat as indicator lists grow. The regex is used as a
+zero-width lookahead, which reports every position where some term starts;
+the longest term found there, together with every shorter term that is a
+prefix of it, gives the exact occurrence count of every term - the same
+counts as running ``re.findall(term, text, re.IGNORECASE)`` once per term
+for any term that cannot overlap itself.
+
+``PhraseFinder`` answers the narrower question "where does each phrase first
+occur?" with the same trie, run as an ordinary (consuming) regex over
+lower-cased text, which is several times faster than the lookahead scan.
+Phrases that could start inside a consumed match are checked directly at
+the few offsets where they can overlap it, so no first occurrence is missed.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional
+
+# Number of match offsets recorded per term
+DEFAULT_MAX_SAMPLES = 3
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Build a regex alternation factored into a prefix trie.
+
+    Longer terms are tried before their prefixes, so the regex matches the
+    longest term starting at a position.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+@dataclass
+class TermMatches:
+    """Per-category, per-term match counts and sample offsets."""
+    counts: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    positions: Dict[str, Dict[str, List[int]]] = field(default_factory=dict)
+
+    def total(self, category: str) -> int:
+        """Total matches of every term in a category."""
+        return sum(self.counts.get(category, {}).values())
+
+    def first_position(self, category: str, term: str) -> Optional[int]:
+        """Offset of the first match of a term, or None if it never matched."""
+        positions = self.positions.get(category, {}).get(term)
+        return positions[0] if positions else None
+
+
+class TermMatcher:
+    """
+    Single-pass, case-insensitive substring matcher for categorized term lists.
+    """
+
+    def __init__(self, categories: Mapping[str, Iterable[str]], max_samples: int = DEFAULT_MAX_SAMPLES):
+        """
+        Compile the matcher.
+
+        Args:
+            categories: Mapping of category name to its terms
+            max_samples: Number of match offsets to record per term
+        """
+        self.categories: Dict[str, List[str]] = {name: [t.lower() for t in terms] for name, terms in categories.items()}
+        self.max_samples = max_samples
+
+        # Every distinct term, and the shorter terms that are prefixes of it
+        self._terms = list(dict.fromkeys(term for terms in self.categories.values() for term in terms))
+        self._prefixes: Dict[str, List[str]] = {
+            term: [other for other in self._terms if other != term and term.startswith(other)]
+            for term in self._terms
+        }
+
+        self.pattern = re.compile(f'(?=({_trie_pattern(self._terms)}))', re.IGNORECASE)
+
+    def scan(self, text: str) -> TermMatches:
+        """
+        Count every term of every category in one pass over the text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            TermMatches with counts for every term (zero if absent) and up to
+            ``max_samples`` match offsets per matched term
+        """
+        counts = {term: 0 for term in self._terms}
+        positions: Dict[str, List[int]] = {}
+
+        if self._terms:
+            for match in self.pattern.finditer(text):
+                longest = match.group(1).lower()
+                if longest not in counts:
+                    continue  # Case folding that lower() does not reproduce
+                offset = match.start()
+                for term in [longest] + self._prefixes.get(longest, []):
+                    counts[term] += 1
+                    samples = positions.setdefault(term, [])
+                    if len(samples) < self.max_samples:
+                        samples.append(offset)
+
+        result = TermMatches()
+        for name, terms in self.categories.items():
+            result.counts[name] = {term: counts[term] for term in terms}
+            result.positions[name] = {term: positions[term] for term in terms if term in positions}
+        return result
+
+
+class PhraseFinder:
+    """
+    Single-pass finder of the first occurrence of each of a list of phrases.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        """
+        Compile the finder.
+
+        Args:
+            phrases: Phrases to look for (matched case-insensitively)
+        """
+        self.phrases: List[str] = list(dict.fromkeys(phrase.lower() for phrase in phrases))
+
+        # Other phrases that can start inside a match of a phrase, with the offsets where they can
+        self._overlaps: Dict[str, List[tuple]] = {
+            phrase: [
+                (other, offset)
+                for other in self.phrases
+                for offset in range(len(phrase))
+                if (other != phrase or offset) and phrase[offset:offset + len(other)] == other[:len(phrase) - offset]
+            ]
+            for phrase in self.phrases
+        }
+
+        self.pattern = re.compile(_trie_pattern(self.phrases)) if self.phrases else None
+
+    def first_positions(self, lowered_text: str) -> Dict[str, int]:
+        """
+        Find the first occurrence of every phrase in one pass.
+
+        Args:
+            lowered_text: Text to search, already passed through ``str.lower()``
+
+        Returns:
+            Dictionary mapping each phrase found (lower-cased) to the offset of
+            its first occurrence; phrases that do not occur are absent
+        """
+        first: Dict[str, int] = {}
+        if self.pattern is None:
+            return first
+
+        for match in self.pattern.finditer(lowered_text):
+            start = match.start()
+            phrase = match.group()
+            if phrase not in first:
+                first[phrase] = start
+            for other, offset in self._overlaps[phrase]:
+                position = start + offset
+                if (other not in first or position < first[other]) and lowered_text.startswith(other, position):
+                    first[other] = position
+            if len(first) == len(self.phrases):
+                break
+        return first
@@ -0,0 +1,219 @@
+"""
+Text Document
+
+A text with lazily computed, memoized word, sentence, paragraph and dialogue spans.
+
+``analyze_text_stats`` used to call four helpers that each re-split the same
+string, and callers in validation and style analysis split it yet again.
+A ``TextDocument`` computes each view the first time it is asked for, keeps
+it as ``(start, end)`` character offsets into the one text instead of copied
+substrings, and answers word counts of any span from the word offsets by
+binary search. Whitespace and quotes are located with array operations over
+the text's code points, and sentences with the shared segmenter (see
+``sentence_segmenter.py``). Every ``text_utils`` function accepts a
+``TextDocument`` in place of a string, and ``as_document`` returns the same
+document for the same text, so a chapter is tokenized once per process.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Union
+
+import numpy as np
+
+from .sentence_segmenter import Span, segment_sentences
+
+PARAGRAPH_BREAK = '\n\n'
+PARAGRAPH_BREAK_PATTERN = re.compile(re.escape(PARAGRAPH_BREAK))
+
+# At least 10 characters between single quotes, so contractions are not taken for dialogue
+SINGLE_QUOTE_MIN_CHARS = 10
+SINGLE_QUOTE_PATTERN = re.compile(rf"'([^']{{{SINGLE_QUOTE_MIN_CHARS},}}?)'")
+
+# Whitespace as ``str.split`` sees it; U+3000 is the highest whitespace code point
+_SPACE_TABLE = np.array([chr(code).isspace() for code in range(0x3002)], dtype=bool)
+
+# Distinct texts whose documents are kept by ``as_document``
+DOCUMENT_CACHE_SIZE = 16
+
+
+class TextDocument:
+    """
+    A text and its lazily computed spans.
+
+    Sentences come from ``sentence_segmenter.segment_sentences``;
+    paragraphs are the stripped, non-empty blocks between blank lines; words
+    follow ``str.split()``. Dialogue spans include their quotes: non-blank
+    double-quoted passages first, then single-quoted passages of at least
+    ten characters, as ``text_utils.find_dialogue`` reports them.
+    """
+
+    __slots__ = ('text', '_codes', '_nonspace', '_word_starts', '_word_ends',
+                 '_sentences', '_paragraphs', '_quotes', '_quote_pairs', '_dialogue')
+
+    def __init__(self, text: str):
+        """
+        Wrap a text; nothing is split until a view is first used.
+
+        Args:
+            text: Text to analyze
+        """
+        self.text = text or ''
+        self._codes = None
+        self._nonspace = None
+        self._word_starts = None
+        self._word_ends = None
+        self._sentences = None
+        self._paragraphs = None
+        self._quotes = None
+        self._quote_pairs = None
+        self._dialogue = None
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def __bool__(self) -> bool:
+        return bool(self.text)
+
+    def __repr__(self) -> str:
+        return f"TextDocument({len(self.text)} chars)"
+
+    def _scan(self) -> None:
+        """Classify every character as whitespace or not and find the word boundaries."""
+        codes = np.frombuffer(self.text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        space = _SPACE_TABLE[np.minimum(codes, len(_SPACE_TABLE) - 1)]
+        edges = np.diff(np.concatenate(([True], space, [True])).view(np.int8))
+        self._codes = codes
+        self._nonspace = np.flatnonzero(~space)
+        self._word_starts = np.flatnonzero(edges == -1)
+        self._word_ends = np.flatnonzero(edges == 1)
+
+    def _segments(self, starts: np.ndarray, ends: np.ndarray) -> List[Span]:
+        """Stripped, non-empty spans of the segments ``starts[i]:ends[i]``."""
+        if self._nonspace is None:
+            self._scan()
+        nonspace = self._nonspace
+        first = np.searchsorted(nonspace, starts, side='left')
+        last = np.searchsorted(nonspace, ends, side='left')
+        keep = last > first
+        return list(zip(nonspace[first[keep]].tolist(), (nonspace[last[keep] - 1] + 1).tolist()))
+
+    @property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words."""
+        if self._word_starts is None:
+            self._scan()
+        return len(self._word_starts)
+
+    @property
+    def words(self) -> List[Span]:
+        """Spans of the whitespace-separated words."""
+        if self._word_starts is None:
+            self._scan()
+        return list(zip(self._word_starts.tolist(), self._word_ends.tolist()))
+
+    @property
+    def sentences(self) -> List[Span]:
+        """Spans of the sentences."""
+        if self._sentences is None:
+            self._sentences = segment_sentences(self.text)
+        return self._sentences
+
+    @property
+    def paragraphs(self) -> List[Span]:
+        """Spans of the paragraphs."""
+        if self._paragraphs is None:
+            breaks = [match.start() for match in PARAGRAPH_BREAK_PATTERN.finditer(self.text)]
+            ends = np.array(breaks + [len(self.text)], dtype=np.int64)
+            starts = np.concatenate(([0], ends[:-1] + len(PARAGRAPH_BREAK)))
+            self._paragraphs = self._segments(starts, ends)
+        return self._paragraphs
+
+    @property
+    def quotes(self) -> np.ndarray:
+        """Offsets of the double quotes."""
+        if self._quotes is None:
+            if self._codes is None:
+                self._scan()
+            self._quotes = np.flatnonzero(self._codes == ord('"'))
+        return self._quotes
+
+    @property
+    def quote_pairs(self) -> List[Span]:
+        """Spans of the text inside every pair of double quotes, blank or not."""
+        if self._quote_pairs is None:
+            quotes = self.quotes
+            pairs = quotes[:len(quotes) // 2 * 2].reshape(-1, 2)
+            self._quote_pairs = list(zip((pairs[:, 0] + 1).tolist(), pairs[:, 1].tolist()))
+        return self._quote_pairs
+
+    @property
+    def dialogue(self) -> List[Span]:
+        """Spans of the quoted dialogue, quotes included."""
+        if self._dialogue is None:
+            text = self.text
+            dialogue = [
+                (start - 1, end + 1) for start, end in self.quote_pairs
+                if end > start and not text[start:end].isspace()
+            ]
+            dialogue.extend(
+                match.span() for match in SINGLE_QUOTE_PATTERN.finditer(text)
+                if not match.group(1).isspace()
+            )
+            self._dialogue = dialogue
+        return self._dialogue
+
+    def span_words(self, spans: List[Span]) -> List[int]:
+        """
+        Count the words of several spans, as ``len(text[start:end].split())`` would.
+
+        Every word a span overlaps contributes exactly one piece, so the count
+        is the number of words starting before the span ends minus the number
+        ending before it starts.
+
+        Args:
+            spans: (start, end) offsets
+
+        Returns:
+            Word count of each span
+        """
+        if not spans:
+            return []
+        if self._word_starts is None:
+            self._scan()
+        bounds = np.array(spans, dtype=np.int64).reshape(-1, 2)
+        counts = (np.searchsorted(self._word_starts, bounds[:, 1], side='left')
+                  - np.searchsorted(self._word_ends, bounds[:, 0], side='right'))
+        return np.where(bounds[:, 1] > bounds[:, 0], counts, 0).tolist()
+
+    def span_text(self, span: Span) -> str:
+        """Get the text of a span."""
+        return self.text[span[0]:span[1]]
+
+    def texts(self, spans: List[Span]) -> List[str]:
+        """Get the text of several spans."""
+        text = self.text
+        return [text[start:end] for start, end in spans]
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def _cached_document(text: str) -> TextDocument:
+    return TextDocument(text)
+
+
+def as_document(text: Union[str, TextDocument]) -> TextDocument:
+    """
+    Get the document of a text.
+
+    Documents of recently used texts are reused, so repeated analyses of the
+    same chapter share one tokenization.
+
+    Args:
+        text: Text or an existing document
+
+    Returns:
+        TextDocument for the text
+    """
+    if isinstance(text, TextDocument):
+        return text
+    return _cached_document(text or '')
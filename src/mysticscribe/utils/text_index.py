@@ -0,0 +1,277 @@
+"""
+Text Index Utilities
+
+A small positional inverted index over named text documents.
+
+Each document is tokenized once into lowercase word tokens. Postings record
+the line number, character offset and token position of every occurrence, so
+queries only touch the postings of the terms involved instead of rescanning
+every line of every document.
+"""
+
+import re
+from dataclasses import dataclass
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of lowercase tokens
+    """
+    return [match.group(0).lower() for match in TOKEN_PATTERN.finditer(text)]
+
+
+@dataclass(frozen=True)
+class Posting:
+    """A single occurrence of a token in an indexed document."""
+    line: int      # 1-based line number
+    offset: int    # character offset of the token within the document
+    position: int  # token position within the document
+
+
+class DocumentIndex:
+    """
+    Postings and line table for a single indexed document.
+
+    Postings are stored as parallel ``[line, offset, position]`` triples so
+    the structure serializes directly to JSON.
+    """
+
+    def __init__(self, line_starts: List[int], length: int, postings: Dict[str, List[List[int]]]):
+        self.line_starts = line_starts
+        self.length = length
+        self.postings = postings
+
+    @classmethod
+    def from_text(cls, text: str) -> "DocumentIndex":
+        """Tokenize text once and build its postings."""
+        line_starts = [0]
+        find = text.find
+        pos = find('\n')
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = find('\n', pos + 1)
+
+        postings: Dict[str, List[List[int]]] = {}
+        for position, match in enumerate(TOKEN_PATTERN.finditer(text)):
+            offset = match.start()
+            line = bisect_right(line_starts, offset)
+            postings.setdefault(match.group(0).lower(), []).append([line, offset, position])
+
+        return cls(line_starts, len(text), postings)
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """Return the (start, end) character span of a 1-based line, excluding the newline."""
+        start = self.line_starts[line - 1]
+        if line < len(self.line_starts):
+            end = self.line_starts[line] - 1
+        else:
+            end = self.length
+        return start, end
+
+    def to_dict(self) -> dict:
+        return {'line_starts': self.line_starts, 'length': self.length, 'postings': self.postings}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DocumentIndex":
+        return cls(data['line_starts'], data['length'], data['postings'])
+
+
+class InvertedIndex:
+    """
+    Positional inverted index over a collection of named documents.
+
+    Supports exact-token lookups, AND/OR boolean queries, quoted phrase
+    queries, and candidate-line lookups for substring searches.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, DocumentIndex] = {}
+        # token -> set of document ids containing it
+        self._vocabulary: Dict[str, Set[str]] = {}
+
+    @classmethod
+    def from_text(cls, text: str, doc_id: str = "text") -> "InvertedIndex":
+        """Build an index containing a single document."""
+        index = cls()
+        index.add_document(doc_id, text)
+        return index
+
+    def add_document(self, doc_id: str, text: str) -> None:
+        """Index (or re-index) a document."""
+        self.set_document(doc_id, DocumentIndex.from_text(text))
+
+    def set_document(self, doc_id: str, document: DocumentIndex) -> None:
+        """Install a pre-built document index, replacing any previous version."""
+        self.remove_document(doc_id)
+        self.documents[doc_id] = document
+        for token in document.postings:
+            self._vocabulary.setdefault(token, set()).add(doc_id)
+
+    def remove_document(self, doc_id: str) -> None:
+        """Drop a document and its postings from the index."""
+        document = self.documents.pop(doc_id, None)
+        if document is None:
+            return
+        for token in document.postings:
+            docs = self._vocabulary.get(token)
+            if docs is not None:
+                docs.discard(doc_id)
+                if not docs:
+                    del self._vocabulary[token]
+
+    def postings(self, token: str, doc_id: Optional[str] = None) -> Dict[str, List[Posting]]:
+        """
+        Get postings for a single token.
+
+        Args:
+            token: Token to look up (case-insensitive)
+            doc_id: Restrict to a single document
+
+        Returns:
+            Dictionary mapping document ids to postings
+        """
+        token = token.lower()
+        doc_ids = self._vocabulary.get(token, set())
+        if doc_id is not None:
+            doc_ids = doc_ids & {doc_id}
+        return {
+            d: [Posting(*entry) for entry in self.documents[d].postings[token]]
+            for d in doc_ids
+        }
+
+    def candidate_lines(self, search_term: str, doc_id: Optional[str] = None) -> Optional[Dict[str, Set[int]]]:
+        """
+        Find lines that may contain ``search_term`` as a case-insensitive substring.
+
+        Every word token of the search term must occur inside some token of a
+        matching line, so the result is a superset of the true matches and
+        callers confirm each candidate with a plain substring test.
+
+        Args:
+            search_term: Raw search term
+            doc_id: Restrict to a single document
+
+        Returns:
+            Dictionary mapping document ids to candidate line numbers, or None
+            if the term has no word tokens and cannot be served by the index
+        """
+        query_tokens = tokenize(search_term)
+        if not query_tokens:
+            return None
+
+        result: Optional[Dict[str, Set[int]]] = None
+        for query_token in dict.fromkeys(query_tokens):
+            expansions = [t for t in self._vocabulary if query_token in t]
+            lines_by_doc: Dict[str, Set[int]] = {}
+            for token in expansions:
+                for d in self._vocabulary[token]:
+                    if doc_id is not None and d != doc_id:
+                        continue
+                    if result is not None and d not in result:
+                        continue
+                    lines = lines_by_doc.setdefault(d, set())
+                    lines.update(entry[0] for entry in self.documents[d].postings[token])
+            if result is None:
+                result = lines_by_doc
+            else:
+                result = {
+                    d: result[d] & lines
+                    for d, lines in lines_by_doc.items()
+                    if result[d] & lines
+                }
+            if not result:
+                return {}
+        return result or {}
+
+    def search(self, query: str) -> Dict[str, List[Posting]]:
+        """
+        Run a boolean query against the index.
+
+        Whitespace-separated terms are ANDed together, ``OR`` separates
+        alternatives, and double-quoted text is matched as a phrase.
+        For example: ``wind "sword sect" OR shadow``.
+
+        Args:
+            query: Query string
+
+        Returns:
+            Dictionary mapping document ids to postings of the matched terms,
+            sorted by position
+        """
+        results: Dict[str, Set[Posting]] = {}
+        for clause in self._parse_query(query):
+            clause_hits = self._match_clause(clause)
+            for d, hits in clause_hits.items():
+                results.setdefault(d, set()).update(hits)
+        return {d: sorted(hits, key=lambda p: p.position) for d, hits in results.items()}
+
+    @staticmethod
+    def _parse_query(query: str) -> List[List[List[str]]]:
+        """Parse a query into OR-clauses of AND-ed phrases (lists of tokens)."""
+        clauses: List[List[List[str]]] = [[]]
+        for match in QUERY_PATTERN.finditer(query):
+            phrase, word = match.groups()
+            if word == 'OR':
+                clauses.append([])
+                continue
+            tokens = tokenize(phrase if phrase is not None else word)
+            if tokens:
+                clauses[-1].append(tokens)
+        return [clause for clause in clauses if clause]
+
+    def _match_clause(self, clause: List[List[str]]) -> Dict[str, List[Posting]]:
+        """Match an AND-clause, returning postings for documents containing every phrase."""
+        # Evaluate the rarest phrase first to keep intersections small
+        ordered = sorted(clause, key=lambda tokens: min(len(self._vocabulary.get(t, ())) for t in tokens))
+        matched: Optional[Dict[str, List[Posting]]] = None
+        for tokens in ordered:
+            restrict = None if matched is None else matched.keys()
+            hits = self._match_phrase(tokens, restrict)
+            if matched is None:
+                matched = hits
+            else:
+                matched = {d: matched[d] + hits[d] for d in matched if d in hits}
+            if not matched:
+                return {}
+        return matched or {}
+
+    def _match_phrase(self, tokens: List[str], restrict: Optional[Iterable[str]] = None) -> Dict[str, List[Posting]]:
+        """Find occurrences of consecutive tokens, returning postings of every token in each match."""
+        doc_ids = set.intersection(*(self._vocabulary.get(t, set()) for t in tokens))
+        if restrict is not None:
+            doc_ids &= set(restrict)
+
+        hits: Dict[str, List[Posting]] = {}
+        for d in doc_ids:
+            postings = self.documents[d].postings
+            if len(tokens) == 1:
+                hits[d] = [Posting(*entry) for entry in postings[tokens[0]]]
+                continue
+            by_position = [{entry[2]: entry for entry in postings[t]} for t in tokens[1:]]
+            doc_hits = []
+            for first in postings[tokens[0]]:
+                chain = [first]
+                for i, positions in enumerate(by_position, 1):
+                    entry = positions.get(first[2] + i)
+                    if entry is None:
+                        break
+                    chain.append(entry)
+                else:
+                    doc_hits.extend(Posting(*entry) for entry in chain)
+            if doc_hits:
+                hits[d] = doc_hits
+        return hits
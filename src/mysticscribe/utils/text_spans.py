@@ -0,0 +1,90 @@
+"""
+Text Span Utilities
+
+Shared tokenization of a text into word, sentence, paragraph and dialogue spans.
+
+Style analyses used to re-split the same corpus over and over (``split()``,
+``split('\\n\\n')``, ``re.split(r'[.!?]+')``, quote matching) once per
+analysis. ``TextSpans`` holds parallel arrays of ``(start, end)`` character
+offsets and per-span word counts, taken from the text's shared
+``TextDocument``, that every analysis then reads without copying the
+underlying text.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple, Union
+
+from .text_document import Span, TextDocument, as_document
+
+
+@dataclass
+class TextSpans:
+    """
+    Word, sentence, paragraph and dialogue spans of a text.
+
+    Sentences are those of ``sentence_segmenter.segment_sentences``;
+    paragraphs are the stripped, non-empty blocks between blank lines;
+    dialogue spans cover the text inside each pair of double quotes. Word
+    counts follow ``str.split()`` semantics for every span.
+    """
+    text: str
+    word_count: int = 0
+    sentences: List[Span] = field(default_factory=list)
+    sentence_words: List[int] = field(default_factory=list)
+    paragraphs: List[Span] = field(default_factory=list)
+    paragraph_words: List[int] = field(default_factory=list)
+    dialogue: List[Span] = field(default_factory=list)
+    dialogue_words: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_text(cls, text: Union[str, TextDocument]) -> "TextSpans":
+        """
+        Tokenize a text into spans.
+
+        The spans come from the text's shared ``TextDocument`` (see
+        ``text_document.as_document``), so a chapter already analyzed by
+        ``text_utils`` is not split again.
+
+        Args:
+            text: Text to tokenize, or its document
+
+        Returns:
+            TextSpans for the text
+        """
+        document = as_document(text)
+        spans = cls(text=document.text, word_count=document.word_count)
+        spans.sentences = document.sentences
+        spans.sentence_words = document.span_words(spans.sentences)
+        spans.paragraphs = document.paragraphs
+        spans.paragraph_words = document.span_words(spans.paragraphs)
+        spans.dialogue = document.quote_pairs
+        spans.dialogue_words = document.span_words(spans.dialogue)
+        return spans
+
+    def span_text(self, span: Span) -> str:
+        """Get the text of a span."""
+        return self.text[span[0]:span[1]]
+
+    def sentence_texts(self, min_chars: int = 0) -> List[Tuple[str, int]]:
+        """
+        Get sentence texts with their word counts.
+
+        Args:
+            min_chars: Skip sentences of at most this many characters
+
+        Returns:
+            List of (sentence, word count) pairs in text order
+        """
+        return [
+            (self.text[start:end], words)
+            for (start, end), words in zip(self.sentences, self.sentence_words)
+            if end - start > min_chars
+        ]
+
+    def dialogue_texts(self) -> List[Tuple[str, int]]:
+        """Get the text inside each pair of quotes with its word count."""
+        return [(self.text[start:end], words) for (start, end), words in zip(self.dialogue, self.dialogue_words)]
+
+    def paragraph_texts(self) -> List[Tuple[str, int]]:
+        """Get paragraph texts with their word counts."""
+        return [(self.text[start:end], words) for (start, end), words in zip(self.paragraphs, self.paragraph_words)]
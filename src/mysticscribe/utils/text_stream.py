@@ -0,0 +1,268 @@
+"""
+Streaming Text Statistics
+
+``analyze_text_stats`` for texts read chunk by chunk, such as a compiled
+manuscript file.
+
+``TextStatsStream`` buffers chunks until it holds about a segment's worth of
+text, then cuts the buffer after its last blank line or, failing that,
+before its last sentence, and analyzes everything before the cut as a
+``TextDocument`` of its own. A cut always falls in whitespace between two
+sentences, so no word or sentence is split. Paragraphs and quoted passages
+may continue past a cut; they are carried over as word counts (plus, for
+single quotes, the distance from the opening quote, which decides whether a
+passage is long enough to be dialogue). Lengths go into one
+``LengthHistogram`` per kind of span and sentence lengths into a
+``RhythmTracker``, so memory is bounded by the segment size and the longest
+sentence, and the statistics equal those of the whole text analyzed at once.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from .length_stats import LENGTH_BUCKETS, LengthHistogram, RhythmTracker
+from .sentence_segmenter import segment_sentences
+from .text_document import PARAGRAPH_BREAK, SINGLE_QUOTE_MIN_CHARS, SINGLE_QUOTE_PATTERN, TextDocument
+
+# Characters buffered before a segment is cut off and analyzed
+STREAM_SEGMENT_SIZE = 1 << 20
+
+_NONSPACE_PATTERN = re.compile(r'\S')
+
+
+def summarize_text_stats(
+    word_count: int,
+    character_count: int,
+    sentences: LengthHistogram,
+    paragraphs: LengthHistogram,
+    dialogue: LengthHistogram,
+    rhythm: RhythmTracker,
+) -> dict:
+    """
+    Build the ``analyze_text_stats`` dictionary from accumulated lengths.
+
+    Args:
+        word_count: Number of words
+        character_count: Number of characters
+        sentences: Sentence lengths
+        paragraphs: Paragraph lengths
+        dialogue: Dialogue lengths
+        rhythm: Sentence lengths in text order
+
+    Returns:
+        Dictionary with text statistics
+    """
+    sentence_count = sentences.count
+    paragraph_count = paragraphs.count
+    avg_sentence_length = word_count / sentence_count if sentence_count else 0
+    avg_paragraph_length = word_count / paragraph_count if paragraph_count else 0
+
+    return {
+        'word_count': word_count,
+        'character_count': character_count,
+        'sentence_count': sentence_count,
+        'paragraph_count': paragraph_count,
+        'dialogue_count': dialogue.count,
+        'avg_sentence_length': round(avg_sentence_length, 2),
+        'avg_paragraph_length': round(avg_paragraph_length, 2),
+        'sentence_lengths': sentences.distribution(LENGTH_BUCKETS['sentences']),
+        'paragraph_lengths': paragraphs.distribution(LENGTH_BUCKETS['paragraphs']),
+        'dialogue_lengths': dialogue.distribution(LENGTH_BUCKETS['dialogue']),
+        'rhythm': rhythm.metrics()
+    }
+
+
+@dataclass
+class _OpenQuote:
+    """A quoted passage whose closing quote has not been read yet."""
+    words: int
+    chars: int
+    has_text: bool
+
+    def extend(self, document: TextDocument) -> None:
+        """Add a segment without quotes to the passage."""
+        self.words += document.word_count
+        self.chars += len(document)
+        self.has_text = self.has_text or _NONSPACE_PATTERN.search(document.text) is not None
+
+
+def _open_quote(document: TextDocument, start: int) -> _OpenQuote:
+    """The passage opened by the quote at ``start``, up to the end of the segment."""
+    text = document.text
+    return _OpenQuote(
+        words=document.span_words([(start, len(text))])[0],
+        chars=len(text) - start - 1,
+        has_text=_NONSPACE_PATTERN.search(text, start + 1) is not None,
+    )
+
+
+class TextStatsStream:
+    """
+    Text statistics accumulated over chunks of one text.
+
+    Feed the chunks in order with ``feed`` and call ``result`` once all of
+    them are read.
+    """
+
+    def __init__(self, segment_size: int = STREAM_SEGMENT_SIZE):
+        """
+        Create an empty stream.
+
+        Args:
+            segment_size: Characters to buffer before analyzing a segment
+        """
+        self.segment_size = max(segment_size, 1)
+        self.word_count = 0
+        self.character_count = 0
+        self.sentences = LengthHistogram()
+        self.paragraphs = LengthHistogram()
+        self.dialogue = LengthHistogram()
+        self.rhythm = RhythmTracker()
+        self._chunks: List[str] = []
+        self._buffered = 0
+        self._limit = self.segment_size
+        # Words and trailing whitespace of the last paragraph analyzed, if it may continue
+        self._paragraph: Optional[Tuple[int, str]] = None
+        self._double_quote: Optional[_OpenQuote] = None
+        self._single_quote: Optional[_OpenQuote] = None
+
+    def feed(self, chunk: str) -> None:
+        """Add the next chunk of text."""
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._buffered += len(chunk)
+        if self._buffered >= self._limit:
+            self._cut()
+
+    def result(self) -> dict:
+        """
+        Analyze the rest of the text.
+
+        Returns:
+            Dictionary with text statistics, as ``analyze_text_stats`` returns them
+        """
+        text = ''.join(self._chunks)
+        self._chunks, self._buffered = [], 0
+        self._analyze(TextDocument(text), final=True)
+        return summarize_text_stats(self.word_count, self.character_count, self.sentences,
+                                    self.paragraphs, self.dialogue, self.rhythm)
+
+    def _cut(self) -> None:
+        """Analyze the buffered text up to its last blank line or sentence start."""
+        buffered = ''.join(self._chunks)
+        cut = buffered.rfind(PARAGRAPH_BREAK)
+        if cut >= 0:
+            cut += len(PARAGRAPH_BREAK)
+        else:
+            # The last sentence may continue in the next chunk
+            sentences = segment_sentences(buffered)
+            cut = sentences[-1][0] if len(sentences) > 1 else 0
+        if cut:
+            self._analyze(TextDocument(buffered[:cut]), final=False)
+            buffered = buffered[cut:]
+        self._chunks, self._buffered = [buffered], len(buffered)
+        # Wait for a segment's worth of new text, or twice the text if there was nothing to cut
+        self._limit = len(buffered) + max(self.segment_size, len(buffered))
+
+    def _analyze(self, document: TextDocument, final: bool) -> None:
+        """Count a segment that ends between sentences (or ends the text, if final)."""
+        self.word_count += document.word_count
+        self.character_count += len(document)
+        sentence_lengths = document.span_words(document.sentences)
+        self.sentences.add(sentence_lengths)
+        self.rhythm.add(sentence_lengths)
+        self._add_paragraphs(document, final)
+        self._add_double_quotes(document)
+        self._add_single_quotes(document)
+
+    def _add_paragraphs(self, document: TextDocument, final: bool) -> None:
+        text = document.text
+        stripped = text.strip()
+        lengths = document.span_words(document.paragraphs)
+        if self._paragraph is not None:
+            words, trailing = self._paragraph
+            self._paragraph = None
+            if not stripped:
+                if not final and PARAGRAPH_BREAK not in trailing + text:
+                    self._paragraph = (words, trailing + text)
+                    return
+                lengths = [words]
+            else:
+                leading = text[:len(text) - len(text.lstrip())]
+                # The paragraph continues unless the whitespace between the segments holds a blank line
+                if PARAGRAPH_BREAK in trailing + leading:
+                    lengths.insert(0, words)
+                else:
+                    lengths[0] += words
+        if lengths and not final:
+            trailing = text[len(text.rstrip()):]
+            if PARAGRAPH_BREAK not in trailing:
+                self._paragraph = (lengths.pop(), trailing)
+        self.paragraphs.add(lengths)
+
+    def _add_double_quotes(self, document: TextDocument) -> None:
+        text = document.text
+        quotes = document.quotes
+        lengths = []
+        if self._double_quote is not None:
+            if not quotes.size:
+                self._double_quote.extend(document)
+                return
+            close = int(quotes[0])
+            if self._double_quote.has_text or _NONSPACE_PATTERN.search(text, 0, close):
+                lengths.append(self._double_quote.words + document.span_words([(0, close + 1)])[0])
+            self._double_quote = None
+            quotes = quotes[1:]
+        pairs = quotes[:len(quotes) // 2 * 2].reshape(-1, 2).tolist()
+        lengths.extend(document.span_words([
+            (start, end + 1) for start, end in pairs
+            if end > start + 1 and not text[start + 1:end].isspace()
+        ]))
+        if len(quotes) % 2:
+            self._double_quote = _open_quote(document, int(quotes[-1]))
+        self.dialogue.add(lengths)
+
+    def _add_single_quotes(self, document: TextDocument) -> None:
+        text = document.text
+        lengths = []
+        start = 0
+        if self._single_quote is not None:
+            close = text.find("'")
+            if close < 0:
+                self._single_quote.extend(document)
+                return
+            # Too short a passage leaves the closing quote free to open the next one
+            if self._single_quote.chars + close >= SINGLE_QUOTE_MIN_CHARS:
+                if self._single_quote.has_text or _NONSPACE_PATTERN.search(text, 0, close):
+                    lengths.append(self._single_quote.words + document.span_words([(0, close + 1)])[0])
+                start = close + 1
+            self._single_quote = None
+        spans = []
+        for match in SINGLE_QUOTE_PATTERN.finditer(text, start):
+            if not match.group(1).isspace():
+                spans.append(match.span())
+            start = match.end()
+        lengths.extend(document.span_words(spans))
+        opening = text.rfind("'", start)
+        if opening >= 0:
+            self._single_quote = _open_quote(document, opening)
+        self.dialogue.add(lengths)
+
+
+def stream_text_stats(chunks: Iterable[str], segment_size: int = STREAM_SEGMENT_SIZE) -> dict:
+    """
+    Analyze a text given as consecutive chunks.
+
+    Args:
+        chunks: Pieces of the text in order, e.g. an open text file
+        segment_size: Characters to buffer before analyzing a segment
+
+    Returns:
+        Dictionary with text statistics, as ``analyze_text_stats`` returns them
+    """
+    stream = TextStatsStream(segment_size)
+    for chunk in chunks:
+        stream.feed(chunk)
+    return stream.result()
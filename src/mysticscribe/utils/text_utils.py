@@ -2,16 +2,39 @@
 Text Processing Utilities
 
 Utility functions for text processing and analysis.
+
+Every function accepts either a string or a ``TextDocument``; the analyses
+read the document's memoized spans (see ``text_document.py``), so passing
+one document to several of them splits the text only once.
 """
 
 import re
-from typing import List, Tuple, Optional
+from functools import partial
+from pathlib import Path
+from typing import List, Tuple, Optional, Union, TYPE_CHECKING
 import logging
 
+from .length_stats import LengthHistogram, RhythmTracker
+from .text_document import TextDocument, as_document
+from .text_stream import STREAM_SEGMENT_SIZE, stream_text_stats, summarize_text_stats
+
+if TYPE_CHECKING:
+    from .text_index import InvertedIndex
+
 logger = logging.getLogger(__name__)
 
+TextLike = Union[str, TextDocument]
+
+# Rule-of-thumb characters per token for English prose with GPT-style BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def _raw(text: TextLike) -> str:
+    """The string behind a text or document."""
+    return text.text if isinstance(text, TextDocument) else text
 
-def extract_word_count(text: str) -> int:
+
+def extract_word_count(text: TextLike) -> int:
     """
     Extract word count from text.
     
@@ -23,13 +46,35 @@ def extract_word_count(text: str) -> int:
     """
     if not text:
         return 0
+    if isinstance(text, TextDocument):
+        return text.word_count
     
     # Split on whitespace and filter out empty strings
     words = [word for word in text.split() if word.strip()]
     return len(words)
 
 
-def clean_text(text: str, remove_extra_whitespace: bool = True) -> str:
+def estimate_tokens(text: TextLike) -> int:
+    """
+    Estimate the number of LLM tokens in text.
+    
+    A rough heuristic: a fixed characters-per-token ratio, computed in
+    constant time. It has not been measured against a tokenizer and can be
+    well off for dialogue-heavy, punctuation-heavy or non-ASCII text, so
+    treat budgets built on it as approximate.
+    
+    Args:
+        text: Text to estimate
+        
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    return -(-len(_raw(text)) // CHARS_PER_TOKEN)
+
+
+def clean_text(text: TextLike, remove_extra_whitespace: bool = True) -> str:
     """
     Clean text by removing common formatting issues.
     
@@ -43,7 +88,7 @@ def clean_text(text: str, remove_extra_whitespace: bool = True) -> str:
     if not text:
         return ""
     
-    cleaned = text
+    cleaned = _raw(text)
     
     # Remove BOM if present
     cleaned = cleaned.replace('\ufeff', '')
@@ -65,7 +110,7 @@ def clean_text(text: str, remove_extra_whitespace: bool = True) -> str:
     return cleaned.strip()
 
 
-def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
+def truncate_text(text: TextLike, max_length: int, suffix: str = "...") -> str:
     """
     Truncate text to a maximum length.
     
@@ -77,6 +122,7 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     Returns:
         Truncated text
     """
+    text = _raw(text)
     if not text or len(text) <= max_length:
         return text
     
@@ -87,9 +133,9 @@ def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     return text[:truncated_length] + suffix
 
 
-def extract_sentences(text: str) -> List[str]:
+def extract_sentences(text: TextLike) -> List[str]:
     """
-    Extract sentences from text using basic punctuation rules.
+    Extract sentences from text (see ``sentence_segmenter.segment_sentences``).
     
     Args:
         text: Text to extract sentences from
@@ -100,16 +146,12 @@ def extract_sentences(text: str) -> List[str]:
     if not text:
         return []
     
-    # Split on sentence ending punctuation
-    sentences = re.split(r'[.!?]+', text)
-    
-    # Clean up and filter empty sentences
-    sentences = [s.strip() for s in sentences if s.strip()]
-    
-    return sentences
+    # Sentences keep their closing punctuation and quotes
+    document = as_document(text)
+    return document.texts(document.sentences)
 
 
-def extract_paragraphs(text: str) -> List[str]:
+def extract_paragraphs(text: TextLike) -> List[str]:
     """
     Extract paragraphs from text.
     
@@ -122,16 +164,12 @@ def extract_paragraphs(text: str) -> List[str]:
     if not text:
         return []
     
-    # Split on double newlines (paragraph breaks)
-    paragraphs = text.split('\n\n')
-    
-    # Clean up and filter empty paragraphs
-    paragraphs = [p.strip() for p in paragraphs if p.strip()]
-    
-    return paragraphs
+    # Stripped, non-empty blocks between double newlines (paragraph breaks)
+    document = as_document(text)
+    return document.texts(document.paragraphs)
 
 
-def find_dialogue(text: str) -> List[str]:
+def find_dialogue(text: TextLike) -> List[str]:
     """
     Find dialogue in text (quoted speech).
     
@@ -144,82 +182,109 @@ def find_dialogue(text: str) -> List[str]:
     if not text:
         return []
     
-    dialogue = []
-    
-    # Find double quotes dialogue
-    double_quote_pattern = r'"([^"]*)"'
-    double_quotes = re.findall(double_quote_pattern, text)
-    dialogue.extend([f'"{quote}"' for quote in double_quotes if quote.strip()])
-    
-    # Find single quote dialogue (but avoid contractions)
-    single_quote_pattern = r"'([^']{10,}?)'"  # At least 10 chars to avoid contractions
-    single_quotes = re.findall(single_quote_pattern, text)
-    dialogue.extend([f"'{quote}'" for quote in single_quotes if quote.strip()])
-    
-    return dialogue
+    # Double-quoted dialogue, then single-quoted dialogue long enough not to be contractions
+    document = as_document(text)
+    return document.texts(document.dialogue)
 
 
-def analyze_text_stats(text: str) -> dict:
+def analyze_text_stats(text: TextLike) -> dict:
     """
     Analyze text and return comprehensive statistics.
     
+    Sentence, paragraph and dialogue lengths are counted once and summarized
+    as distributions (see ``length_stats.LengthHistogram``); ``rhythm``
+    describes sentence-length variability over rolling windows. Lengths are
+    read from the document's spans, without copying any of them. For texts
+    too large to hold in memory, see ``analyze_file_stats`` and
+    ``text_stream.stream_text_stats``.
+    
     Args:
         text: Text to analyze
         
     Returns:
         Dictionary with text statistics
     """
-    if not text:
-        return {
-            'word_count': 0,
-            'character_count': 0,
-            'sentence_count': 0,
-            'paragraph_count': 0,
-            'dialogue_count': 0,
-            'avg_sentence_length': 0,
-            'avg_paragraph_length': 0
-        }
-    
-    words = extract_word_count(text)
-    characters = len(text)
-    sentences = extract_sentences(text)
-    paragraphs = extract_paragraphs(text)
-    dialogue = find_dialogue(text)
-    
-    avg_sentence_length = words / len(sentences) if sentences else 0
-    avg_paragraph_length = words / len(paragraphs) if paragraphs else 0
-    
-    return {
-        'word_count': words,
-        'character_count': characters,
-        'sentence_count': len(sentences),
-        'paragraph_count': len(paragraphs),
-        'dialogue_count': len(dialogue),
-        'avg_sentence_length': round(avg_sentence_length, 2),
-        'avg_paragraph_length': round(avg_paragraph_length, 2)
-    }
-
-
-def search_text(text: str, search_term: str, case_sensitive: bool = False) -> List[Tuple[int, str]]:
+    document = as_document(text)
+    sentence_lengths = document.span_words(document.sentences)
+    
+    return summarize_text_stats(
+        document.word_count,
+        len(document.text),
+        LengthHistogram(sentence_lengths),
+        LengthHistogram(document.span_words(document.paragraphs)),
+        LengthHistogram(document.span_words(document.dialogue)),
+        RhythmTracker(sentence_lengths)
+    )
+
+
+def analyze_file_stats(file_path: Union[str, Path], encoding: str = 'utf-8',
+                       chunk_size: int = STREAM_SEGMENT_SIZE) -> dict:
+    """
+    Analyze a text file without reading it into memory at once.
+    
+    The file is read in chunks and analyzed as a stream (see
+    ``text_stream.py``); the result equals ``analyze_text_stats`` of the
+    whole file's text.
+    
+    Args:
+        file_path: Path of the text file
+        encoding: Text encoding of the file
+        chunk_size: Characters to read at a time
+        
+    Returns:
+        Dictionary with text statistics
+    """
+    with open(file_path, 'r', encoding=encoding) as f:
+        return stream_text_stats(iter(partial(f.read, chunk_size), ''), chunk_size)
+
+
+def search_text(
+    text: TextLike,
+    search_term: str,
+    case_sensitive: bool = False,
+    index: Optional["InvertedIndex"] = None,
+    doc_id: Optional[str] = None
+) -> List[Tuple[int, str]]:
     """
     Search for a term in text and return matches with line numbers.
     
+    When an ``InvertedIndex`` built over ``text`` is supplied, only the lines
+    it reports as candidates are tested instead of every line.
+    
     Args:
         text: Text to search in
         search_term: Term to search for
         case_sensitive: Whether search should be case sensitive
+        index: Optional index built over ``text`` (see ``InvertedIndex.from_text``)
+        doc_id: Document id of ``text`` within ``index`` (defaults to its only document)
         
     Returns:
         List of tuples (line_number, line_content) for matches
     """
     if not text or not search_term:
         return []
+    text = _raw(text)
+    
+    search_target = search_term if case_sensitive else search_term.lower()
+    
+    if index is not None:
+        if doc_id is None:
+            doc_id = next(iter(index.documents), None)
+        document = index.documents.get(doc_id)
+        candidates = index.candidate_lines(search_term, doc_id) if document else None
+        if candidates is not None:
+            matches = []
+            for line_num in sorted(candidates.get(doc_id, ())):
+                start, end = document.line_span(line_num)
+                line = text[start:end]
+                search_line = line if case_sensitive else line.lower()
+                if search_target in search_line:
+                    matches.append((line_num, line))
+            return matches
     
     matches = []
     lines = text.split('\n')
     
-    search_target = search_term if case_sensitive else search_term.lower()
-    
     for line_num, line in enumerate(lines, 1):
         search_line = line if case_sensitive else line.lower()
         if search_target in search_line:
@@ -228,7 +293,7 @@ def search_text(text: str, search_term: str, case_sensitive: bool = False) -> Li
     return matches
 
 
-def format_text_for_display(text: str, max_width: int = 80, indent: int = 0) -> str:
+def format_text_for_display(text: TextLike, max_width: int = 80, indent: int = 0) -> str:
     """
     Format text for display with word wrapping and indentation.
     
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared sentence segmenter.
+
+Times segment_sentences against the regex split it replaces
+(``re.split(r'[.!?]+', ...)`` with stripping of the fragments, as
+extract_sentences did) over a manuscript built from the chapters in
+chapters/, and the sentences of every paragraph of each chapter
+(segment_paragraphs against the regex split called per paragraph, as the
+validation partials and the story digest did). Fails if the segmenter is
+slower on either.
+
+Usage:
+    python tests/benchmark_sentence_segmenter.py [--copies N] [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mysticscribe.utils.sentence_segmenter import segment_paragraphs, segment_sentences
+
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+
+
+def regex_split(text: str) -> list:
+    """The former sentence split: stripped, non-empty fragments between runs of .!?"""
+    return [s.strip() for s in SENTENCE_SPLIT.split(text) if s.strip()]
+
+
+def regex_split_paragraphs(text: str) -> list:
+    """The former per-paragraph callers: one regex split per paragraph."""
+    return [regex_split(paragraph) for paragraph in text.split('\n\n')]
+
+
+def load_chapters() -> list:
+    """Read the sample chapters."""
+    chapters_dir = Path(__file__).parent.parent / "chapters"
+    samples = [p.read_text(encoding='utf-8') for p in sorted(chapters_dir.glob("chapter_*.md"))]
+    if not samples:
+        raise SystemExit(f"No sample chapters found in {chapters_dir}")
+    return samples
+
+
+def compare(title: str, splitters: dict, texts: list, repeat: int) -> float:
+    """Time each splitter over the texts and print the results; returns the segmenter's speed-up."""
+    results = {name: float('inf') for name in splitters}
+    # Runs are interleaved so that load on the machine affects both alike
+    for _ in range(repeat):
+        for name, split in splitters.items():
+            results[name] = min(results[name], timeit.timeit(lambda: [split(text) for text in texts], number=1))
+
+    print(title)
+    for name, split in splitters.items():
+        print(f"  {name:<12} {results[name] * 1000:8.2f} ms  ({sum(len(split(text)) for text in texts):,} results)")
+    ratio = results["regex split"] / results["segmenter"]
+    print(f"  segmenter is {ratio:4.2f}x the speed of the regex split")
+    return ratio
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=20, help="Copies of the sample chapters (default: 20)")
+    parser.add_argument("--repeat", type=int, default=15, help="Timing runs; the fastest counts (default: 15)")
+    args = parser.parse_args()
+
+    chapters = load_chapters() * args.copies
+    text = "\n\n".join(chapters)
+    print(f"{len(text):,} characters, {len(text.split()):,} words, {len(chapters)} chapters")
+
+    ratios = [
+        compare("Manuscript", {"regex split": regex_split, "segmenter": segment_sentences},
+                [text], args.repeat),
+        compare("Paragraphs of each chapter",
+                {"regex split": regex_split_paragraphs, "segmenter": segment_paragraphs},
+                chapters, args.repeat),
+    ]
+    if min(ratios) < 1.0:
+        print("❌ segmenter is slower than the regex split")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel style feature extraction.
+
+Times extract_many over a synthetic back catalog built from the chapters in
+chapters/ with 1, 2, 4 and 8 worker processes, and checks that every run
+produces the same records.
+
+Usage:
+    python tests/benchmark_style_workers.py [--chapters N] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.mysticscribe.core.style_features import extract_many
+
+
+def load_catalog(count: int) -> list:
+    """Build a catalog of ``count`` distinct chapters from the sample chapters."""
+    chapters_dir = Path(__file__).parent.parent / "chapters"
+    samples = [p.read_text(encoding='utf-8') for p in sorted(chapters_dir.glob("chapter_*.md"))]
+    if not samples:
+        raise SystemExit(f"No sample chapters found in {chapters_dir}")
+    return [f"{samples[i % len(samples)]}\n\nChapter copy {i}." for i in range(count)]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters", type=int, default=200, help="Chapters in the synthetic catalog (default: 200)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="Worker counts to time")
+    args = parser.parse_args()
+
+    catalog = load_catalog(args.chapters)
+    words = sum(len(c.split()) for c in catalog)
+    print(f"{len(catalog)} chapters, {words:,} words, {os.cpu_count()} CPUs available")
+
+    baseline = None
+    reference = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        records = extract_many(catalog, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        if reference is None:
+            reference, baseline = records, elapsed
+        elif records != reference:
+            print(f"❌ {workers} workers produced different records")
+            return 1
+        print(f"  {workers:>2} workers: {elapsed:6.2f}s  ({baseline / elapsed:4.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
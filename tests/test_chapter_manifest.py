@@ -0,0 +1,121 @@
+"""
+Tests for the chapter manifest behind ChapterManager listings.
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from src.mysticscribe.core.chapter_manager import ChapterManager, ChapterInfo
+from src.mysticscribe.core.chapter_manifest import ChapterManifest
+
+
+class TestChapterManifest:
+    """Test suite for ChapterManifest."""
+
+    def test_refresh_records_drafts_and_outlines(self, temp_project_root):
+        """Test that drafts and outlines are merged by chapter number."""
+        (temp_project_root / "chapters" / "chapter_1.md").write_text("one two three")
+        (temp_project_root / "outlines" / "chapter_1.txt").write_text("outline")
+        (temp_project_root / "outlines" / "chapter_2.txt").write_text("outline")
+        (temp_project_root / "chapters" / "notes.md").write_text("ignored")
+
+        manifest = ChapterManifest(temp_project_root / "chapters", temp_project_root / "outlines")
+        entries = manifest.refresh()
+
+        assert sorted(entries) == [1, 2]
+        assert entries[1]['draft']['word_count'] == 3
+        assert entries[1]['draft']['sha1']
+        assert entries[2]['draft'] is None
+        assert entries[2]['outline'] is not None
+
+    def test_unchanged_drafts_are_not_reread(self, temp_project_root, monkeypatch):
+        """Test that a persisted manifest is reused without opening drafts."""
+        draft = temp_project_root / "chapters" / "chapter_1.md"
+        draft.write_text("one two three")
+        manifest_path = temp_project_root / ".mysticscribe" / "chapter_manifest.json"
+
+        ChapterManifest(temp_project_root / "chapters", temp_project_root / "outlines", manifest_path).refresh()
+        assert json.loads(manifest_path.read_text())['chapters']['1']['draft']['word_count'] == 3
+
+        def fail(*args, **kwargs):
+            raise AssertionError("draft was re-read")
+
+        monkeypatch.setattr(type(draft), "read_bytes", fail)
+        entries = ChapterManifest(temp_project_root / "chapters", temp_project_root / "outlines", manifest_path).refresh()
+        assert entries[1]['draft']['word_count'] == 3
+
+    def test_changed_and_removed_files_are_updated(self, temp_project_root):
+        """Test that stat changes and deletions are picked up."""
+        draft = temp_project_root / "chapters" / "chapter_1.md"
+        draft.write_text("one two three")
+        manifest = ChapterManifest(temp_project_root / "chapters", temp_project_root / "outlines")
+        manifest.refresh()
+
+        draft.write_text("one two three four five")
+        stat = draft.stat()
+        os.utime(draft, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert manifest.refresh()[1]['draft']['word_count'] == 5
+
+        draft.unlink()
+        assert manifest.refresh() == {}
+
+
+class TestChapterManagerListing:
+    """Test ChapterManager listings backed by the manifest."""
+
+    def test_list_chapters(self, temp_project_root):
+        """Test listing chapters with word counts."""
+        manager = ChapterManager(temp_project_root)
+        manager.save_chapter_content(1, "First chapter content here.", validate=False)
+        manager.save_outline(2, "Outline for chapter two.")
+
+        chapters = manager.list_chapters()
+
+        assert [c.number for c in chapters] == [1, 2]
+        assert chapters[0].draft_exists and chapters[0].word_count == 4
+        assert chapters[0].draft_path == temp_project_root / "chapters" / "chapter_1.md"
+        assert not chapters[1].draft_exists and chapters[1].outline_exists
+        assert chapters[1].word_count is None
+
+    def test_get_chapter_info_and_next_number(self, temp_project_root):
+        """Test single-chapter lookups and next chapter numbering."""
+        manager = ChapterManager(temp_project_root)
+        assert manager.get_next_chapter_number() == 1
+
+        manager.save_outline(3, "Outline")
+        manager.save_chapter_content(4, "Draft without an outline", validate=False)
+
+        assert manager.get_next_chapter_number() == 4
+        info = manager.get_chapter_info(4)
+        assert info.draft_exists and not info.outline_exists
+        assert info.word_count == 4
+
+        missing = manager.get_chapter_info(99)
+        assert not missing.draft_exists and not missing.outline_exists
+        assert missing.outline_path is None and missing.word_count is None
+
+    def test_paths_follow_a_moved_project(self, temp_project_root):
+        """Test that paths come from the project's location, not from the persisted manifest."""
+        ChapterManager(temp_project_root).save_chapter_content(1, "First chapter content here.", validate=False)
+        ChapterManager(temp_project_root).save_outline(1, "Outline")
+        assert ChapterManager(temp_project_root).get_chapter_info(1).draft_exists
+        moved = temp_project_root.parent / (temp_project_root.name + "_moved")
+        shutil.move(str(temp_project_root), str(moved))
+        try:
+            info = ChapterManager(moved).get_chapter_info(1)
+
+            assert info.draft_path == moved / "chapters" / "chapter_1.md"
+            assert info.outline_path == moved / "outlines" / "chapter_1.txt"
+            assert ChapterManager(moved).list_chapters()[0].draft_path == info.draft_path
+        finally:
+            shutil.move(str(moved), str(temp_project_root))
+
+    def test_chapter_info_uses_slots(self):
+        """Test that ChapterInfo has no per-instance __dict__."""
+        info = ChapterInfo(number=1, outline_exists=True, draft_exists=False)
+        assert not hasattr(info, '__dict__')
+        with pytest.raises(AttributeError):
+            info.unexpected = True
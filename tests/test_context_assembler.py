@@ -0,0 +1,56 @@
+"""
+Test the token-budgeted context assembler.
+"""
+
+import pytest
+
+from src.mysticscribe.core.context_assembler import ContextAssembler, budget_for_agents
+from src.mysticscribe.utils.text_utils import estimate_tokens
+
+
+class TestContextAssembler:
+    """Test suite for ContextAssembler."""
+    
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+    
+    def test_budget_for_agents_uses_smallest(self):
+        assert budget_for_agents(['architect']) == 24000
+        assert budget_for_agents(['writer', 'architect']) == 16000
+    
+    def test_packs_by_priority_and_reports_dropped(self):
+        assembler = ContextAssembler(budget=100)
+        assembler.add('outline', 'o' * 200, priority=100)                    # 50 tokens
+        assembler.add('knowledge', 'a' * 120, priority=50, label='regions')  # 30 tokens
+        assembler.add('knowledge', 'b' * 120, priority=50, label='society')  # 30 tokens, does not fit
+        assembler.add('previous', 'p' * 40, priority=90)                     # 10 tokens
+        
+        result = assembler.assemble()
+        
+        assert result.used_tokens == 90
+        assert result.inputs['outline'] == 'o' * 200
+        assert result.inputs['previous'] == 'p' * 40
+        assert result.inputs['knowledge'] == 'a' * 120
+        assert [f.label for f in result.dropped] == ['society']
+        assert 'society' in result.report()
+    
+    def test_truncates_keeping_tail(self):
+        assembler = ContextAssembler(budget=300)
+        assembler.add('previous', 'x' * 2000 + 'THE END', priority=90, truncatable=True, keep_tail=True)
+        
+        result = assembler.assemble()
+        
+        assert result.inputs['previous'].startswith('...')
+        assert result.inputs['previous'].endswith('THE END')
+        assert result.used_tokens <= 300
+        assert len(result.truncated) == 1
+    
+    def test_formatter_receives_kept_fragments_in_insertion_order(self):
+        assembler = ContextAssembler(budget=1000)
+        assembler.add('knowledge', 'second', priority=10, payload=2)
+        assembler.add('knowledge', 'first', priority=20, payload=1)
+        assembler.set_formatter('knowledge', lambda fragments: ','.join(str(f.payload) for f in fragments))
+        
+        assert assembler.assemble().inputs['knowledge'] == '2,1'
@@ -0,0 +1,141 @@
+"""
+Tests for MinHash signatures and the cross-chapter duplicate paragraph index.
+"""
+
+import random
+
+import numpy as np
+
+from src.mysticscribe.core.chapter_manager import ChapterManager
+from src.mysticscribe.core import duplicate_index
+from src.mysticscribe.core.duplicate_index import DuplicateIndex, index_paragraphs
+from src.mysticscribe.utils.minhash import shingles, signatures, similarity
+
+WORDS = ("mist lantern river jade sword elder courtyard pine shadow temple bell stone bridge "
+         "storm ember silk cloud moon archive gate banner horse road market scroll").split()
+
+RECYCLED = ("The old bridge creaked beneath the weight of the carts while mist rose from the river "
+            "and the lanterns of the night market swayed like drowsy fireflies above the stalls.")
+
+
+def paragraph(rng: random.Random, words: int = 40) -> str:
+    """A random paragraph that shares few word triples with any other."""
+    return " ".join(rng.choice(WORDS) for _ in range(words)) + "."
+
+
+def chapter(rng: random.Random, extra: str = "") -> str:
+    """A chapter of random paragraphs, optionally with an extra one."""
+    parts = ["# Chapter"] + [paragraph(rng) for _ in range(8)]
+    if extra:
+        parts.insert(4, extra)
+    return "\n\n".join(parts)
+
+
+class TestMinHash:
+    """Test suite for MinHash signatures."""
+
+    def test_similarity_estimates_jaccard(self):
+        """Test that signature agreement tracks the Jaccard similarity of shingles."""
+        text = RECYCLED
+        edited = text.replace("drowsy fireflies", "tired moths").replace("carts", "wagons")
+
+        a, b = set(shingles(text).tolist()), set(shingles(edited).tolist())
+        jaccard = len(a & b) / len(a | b)
+        first, second = signatures([text, edited])
+        estimate = float(similarity(first, second[None, :])[0])
+
+        assert abs(estimate - jaccard) < 0.15
+
+    def test_batch_signatures_match_single(self):
+        """Test that signing texts together equals signing them one at a time."""
+        texts = [RECYCLED, "too short", paragraph(random.Random(1)), ""]
+        batch = signatures(texts)
+
+        for text, row in zip(texts, batch):
+            assert np.array_equal(row, signatures([text])[0])
+
+
+class TestDuplicateIndex:
+    """Test suite for DuplicateIndex."""
+
+    def test_finds_recycled_paragraph(self, temp_project_root):
+        """Test that a lightly edited paragraph from another chapter is reported."""
+        rng = random.Random(3)
+        manager = ChapterManager(temp_project_root)
+        for number in range(1, 6):
+            manager.save_chapter_content(number, chapter(rng, RECYCLED if number == 2 else ""), validate=False)
+        new_chapter = chapter(rng, RECYCLED.replace("carts", "wagons"))
+
+        index = DuplicateIndex(temp_project_root)
+        assert index.refresh() == 5
+        matches = index.find_duplicates(new_chapter, chapter_number=6)
+
+        assert [(m.paragraph, m.other_chapter, m.other_paragraph) for m in matches] == [(5, 2, 5)]
+        assert matches[0].similarity > 0.6
+        assert matches[0].other_text == RECYCLED
+
+    def test_refresh_reindexes_only_changed_chapters(self, temp_project_root):
+        """Test that unchanged chapters are kept and edits are picked up."""
+        rng = random.Random(5)
+        manager = ChapterManager(temp_project_root)
+        for number in range(1, 4):
+            manager.save_chapter_content(number, chapter(rng), validate=False)
+
+        index = DuplicateIndex(temp_project_root)
+        index.refresh()
+        assert DuplicateIndex(temp_project_root).refresh() == 0
+
+        manager.save_chapter_content(3, chapter(rng, RECYCLED), validate=False)
+        assert DuplicateIndex(temp_project_root).refresh() == 1
+
+        matches = DuplicateIndex(temp_project_root).find_duplicates("\n\n".join(["Intro.", RECYCLED]))
+        assert [(m.paragraph, m.other_chapter) for m in matches] == [(2, 3)]
+
+    def test_new_chapters_are_appended_as_segments(self, temp_project_root, monkeypatch):
+        """Test that a refresh writes only the new chapters and merges once segments pile up."""
+        monkeypatch.setattr(duplicate_index, "MAX_SEGMENTS", 3)
+        rng = random.Random(7)
+        manager = ChapterManager(temp_project_root)
+        index_dir = temp_project_root / ".mysticscribe" / "duplicates"
+
+        manager.save_chapter_content(1, chapter(rng, RECYCLED), validate=False)
+        DuplicateIndex(temp_project_root).refresh()
+        first = {path.name: path.stat().st_mtime_ns for path in index_dir.glob("*.npy")}
+
+        manager.save_chapter_content(2, chapter(rng), validate=False)
+        assert DuplicateIndex(temp_project_root).refresh() == 1
+        second = {path.name: path.stat().st_mtime_ns for path in index_dir.glob("*.npy")}
+        assert all(second[name] == mtime for name, mtime in first.items())
+        assert len(second) == 2 * len(first)
+
+        # Editing chapter 1 leaves its old rows behind in the first segment, unused
+        manager.save_chapter_content(1, chapter(rng), validate=False)
+        assert DuplicateIndex(temp_project_root).refresh() == 1
+        assert DuplicateIndex(temp_project_root).find_duplicates(RECYCLED) == []
+
+        manager.save_chapter_content(3, chapter(rng, RECYCLED), validate=False)
+        DuplicateIndex(temp_project_root).refresh()
+        assert len(list(index_dir.glob("*.npy"))) == len(first)
+
+        matches = DuplicateIndex(temp_project_root).find_duplicates(RECYCLED)
+        assert [(m.paragraph, m.other_chapter) for m in matches] == [(1, 3)]
+
+    def test_failed_save_keeps_index_in_memory(self, temp_project_root, monkeypatch):
+        """Test that an index that could not be written is still used for queries."""
+        rng = random.Random(9)
+        ChapterManager(temp_project_root).save_chapter_content(1, chapter(rng, RECYCLED), validate=False)
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(duplicate_index.np, "save", fail)
+        index = DuplicateIndex(temp_project_root)
+        index.refresh()
+
+        assert [m.other_chapter for m in index.find_duplicates(RECYCLED)] == [1]
+
+    def test_short_paragraphs_are_not_indexed(self):
+        """Test that headings and short lines are skipped but still numbered."""
+        content = "# Chapter 1\n\n\"Stay,\" she said.\n\n" + RECYCLED
+
+        assert index_paragraphs(content) == [(3, RECYCLED)]
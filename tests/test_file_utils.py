@@ -0,0 +1,87 @@
+"""
+Tests for file utilities.
+"""
+
+import random
+
+import pytest
+
+from src.mysticscribe.utils.file_utils import read_tail_paragraphs, read_tail_text
+
+
+def full_read_paragraphs(content: str, count: int) -> list:
+    """Reference implementation reading the whole file."""
+    return [p.strip() for p in content.split('\n\n') if p.strip()][-count:]
+
+
+class TestTailReader:
+    """Test suite for the tail-seek readers."""
+
+    def test_paragraphs_match_full_read(self, tmp_path):
+        """Test that tail paragraphs match splitting the whole file, across block sizes."""
+        rng = random.Random(7)
+        words = ["mist", "qi", "sword", "dao", "lotus", "ember", "—", "é", "山", "🌙", "\"Yes,\""]
+        separators = ["\n\n", "\n\n\n", "\n", "\n \n", "\n\n\n\n"]
+
+        for trial in range(30):
+            content = "".join(
+                " ".join(rng.choice(words) for _ in range(rng.randint(1, 12))) + rng.choice(separators)
+                for _ in range(rng.randint(0, 20))
+            )
+            path = tmp_path / f"chapter_{trial}.md"
+            path.write_text(content, encoding='utf-8')
+
+            for block_size in (1, 2, 5, 64, 8192):
+                for count in (1, 3, 50):
+                    assert read_tail_paragraphs(path, count, block_size) == full_read_paragraphs(content, count)
+
+    def test_windows_newlines_match_text_mode_read(self, tmp_path):
+        """Test that CRLF and CR newlines are translated as a text-mode read would, across block sizes."""
+        rng = random.Random(11)
+        words = ["mist", "qi", "sword", "é", "山", "🌙"]
+        separators = ["\r\n\r\n", "\r\n", "\r\r", "\r\n\r\n\r\n", "\n\r\n", "\r"]
+
+        for trial in range(30):
+            content = "".join(
+                " ".join(rng.choice(words) for _ in range(rng.randint(1, 8))) + rng.choice(separators)
+                for _ in range(rng.randint(0, 15))
+            )
+            path = tmp_path / f"chapter_{trial}.md"
+            path.write_bytes(content.encode('utf-8'))
+            with open(path, 'r', encoding='utf-8') as f:
+                translated = f.read()
+
+            for block_size in (1, 2, 5, 64, 8192):
+                for count in (1, 3, 50):
+                    assert read_tail_paragraphs(path, count, block_size) == full_read_paragraphs(translated, count)
+                assert read_tail_text(path, 20, block_size) == (translated[-20:], len(translated) > 20)
+
+    def test_crlf_file_reads_only_its_ending(self, tmp_path):
+        """Test that the paragraphs of a CRLF chapter are found without reading it all."""
+        path = tmp_path / "chapter.md"
+        # Invalid UTF-8 at the start would fail any read that reaches it
+        path.write_bytes(b"\xff\xfe" + "\r\n\r\n".join(f"Paragraph {i} of the chapter." for i in range(40)).encode('utf-8'))
+
+        assert read_tail_paragraphs(path, 3, 64) == [f"Paragraph {i} of the chapter." for i in (37, 38, 39)]
+
+    def test_long_file(self, tmp_path):
+        """Test reading the ending of a long file."""
+        path = tmp_path / "long.md"
+        path.write_text("Filler paragraph.\n\n" * 100000 + "Second to last.\n\nThe end.", encoding='utf-8')
+
+        assert read_tail_paragraphs(path, 2) == ["Second to last.", "The end."]
+
+    def test_tail_text(self, tmp_path):
+        """Test reading the last characters with multi-byte boundaries."""
+        content = "前" * 500 + "abc" + "—" * 700
+        path = tmp_path / "chapter.md"
+        path.write_text(content, encoding='utf-8')
+
+        for block_size in (1, 3, 100, 8192):
+            assert read_tail_text(path, 1000, block_size) == (content[-1000:], True)
+            assert read_tail_text(path, 5000, block_size) == (content, False)
+
+    def test_missing_file_raises(self, tmp_path):
+        """Test that missing files raise like a normal read."""
+        with pytest.raises(FileNotFoundError):
+            read_tail_paragraphs(tmp_path / "missing.md", 3)
@@ -8,6 +8,10 @@ import shutil
 from pathlib import Path
 
 from src.mysticscribe.core import KnowledgeManager
+from src.mysticscribe.core.chapter_plan_index import ChapterPlanIndex, get_chapter_plan_index, parse_chapter_spec
+from src.mysticscribe.core.knowledge_pack import KnowledgePack
+from src.mysticscribe.core.knowledge_retrieval import chunk_by_heading
+from src.mysticscribe.utils.file_cache import FileCache
 
 
 class TestKnowledgeManager:
@@ -132,6 +136,144 @@ class TestKnowledgeManager:
         results = knowledge_manager.search_knowledge("hero", case_sensitive=True)
         assert len(results) == 0  # "hero" != "Hero"
     
+    def test_search_knowledge_matches_substrings(self, knowledge_manager):
+        """Test that indexed search keeps substring semantics and line numbers."""
+        results = knowledge_manager.search_knowledge("level 2")
+        assert results == {"cultivation_system.txt": ["Line 2: Power Level 2: Advanced"]}
+        
+        # Partial tokens still match
+        results = knowledge_manager.search_knowledge("ovic")
+        assert results == {"cultivation_system.txt": ["Line 1: Power Level 1: Novice"]}
+    
+    def test_search_crlf_knowledge_file(self, knowledge_manager, temp_project_root):
+        """Test that files with Windows line endings return the right lines."""
+        lines = ["Act 1: Setup", "Act 2: Conflict", "", "Regions:", "The Wind Kingdom rises.",
+                 "Its capital is old.", "The Wind Kingdom borders Windmoore"]
+        (temp_project_root / "knowledge" / "plot.txt").write_bytes("\r\n".join(lines).encode('utf-8'))
+        
+        assert knowledge_manager.search_knowledge("Wind Kingdom") == {"plot.txt": [
+            "Line 5: The Wind Kingdom rises.",
+            "Line 7: The Wind Kingdom borders Windmoore",
+        ]}
+        assert knowledge_manager.query_knowledge("Windmoore") == {
+            "plot.txt": ["Line 7: The Wind Kingdom borders Windmoore"]
+        }
+    
+    def test_query_knowledge(self, knowledge_manager):
+        """Test boolean and phrase queries against the knowledge index."""
+        results = knowledge_manager.query_knowledge("novice advanced")
+        assert results == {"cultivation_system.txt": [
+            "Line 1: Power Level 1: Novice",
+            "Line 2: Power Level 2: Advanced",
+        ]}
+        assert knowledge_manager.query_knowledge("novice hero") == {}
+        
+        results = knowledge_manager.query_knowledge("hero OR conflict")
+        assert set(results) == {"core_story_elements.txt", "plot.txt"}
+        
+        results = knowledge_manager.query_knowledge('"good vs evil"')
+        assert results == {"core_story_elements.txt": ["Line 2: Theme: Good vs Evil"]}
+        
+        assert knowledge_manager.query_knowledge('"evil vs good"') == {}
+    
+    def test_index_refreshes_only_changed_files(self, knowledge_manager, temp_project_root):
+        """Test that the persisted index only re-indexes modified files."""
+        knowledge_manager.search_knowledge("Hero")
+        
+        index_path = temp_project_root / ".mysticscribe" / "knowledge_index.json"
+        assert index_path.exists()
+        
+        # A fresh manager reuses the persisted index
+        fresh = KnowledgeManager(temp_project_root)
+        assert fresh.index.refresh() == []
+        
+        plot_file = temp_project_root / "knowledge" / "plot.txt"
+        plot_file.write_text("Act 1: Setup\nAct 2: Betrayal")
+        assert fresh.index.refresh() == ["plot.txt"]
+        assert fresh.search_knowledge("Betrayal") == {"plot.txt": ["Line 2: Act 2: Betrayal"]}
+    
+    def test_chunk_by_heading(self):
+        """Test splitting a knowledge file into heading sections."""
+        text = "Intro line\n\n### === REGIONS ===\nWind Kingdom\n\n### Chapter 2: Journey\nTravel north"
+        sections = chunk_by_heading(text, "plot.txt")
+        
+        assert [s.heading for s in sections] == ["plot.txt", "REGIONS", "Chapter 2: Journey"]
+        assert sections[1].level == 3
+        assert sections[2].text.endswith("Travel north")
+    
+    def test_load_relevant_knowledge(self, knowledge_manager, temp_project_root):
+        """Test BM25 retrieval returns only relevant sections."""
+        (temp_project_root / "knowledge" / "chapters.txt").write_text(
+            "### Chapter 1: Dawn\nThe village burns.\n\n"
+            "### Chapter 2: Journey\nCassian walks to Windmoore.\n"
+        )
+        
+        context = knowledge_manager.load_relevant_knowledge("cultivation power levels", top_k=1)
+        assert "Power Level 1: Novice" in context
+        assert "Act 1: Setup" not in context
+        
+        # The plan for the requested chapter is always included
+        context = knowledge_manager.load_relevant_knowledge("power", top_k=2, chapter_number=2)
+        assert "Cassian walks to Windmoore" in context
+        assert "The village burns" not in context
+    
+    def test_file_cache_hits_and_invalidation(self, temp_project_root):
+        """Test that the shared file cache serves repeat reads and tracks changes."""
+        cache = FileCache(max_bytes=1024)
+        plot_file = temp_project_root / "knowledge" / "plot.txt"
+        
+        assert "Act 1" in cache.read_text(plot_file)
+        assert "Act 1" in cache.read_text(plot_file)
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        
+        plot_file.write_text("Rewritten plot with a different length")
+        assert cache.read_text(plot_file) == "Rewritten plot with a different length"
+        assert cache.stats()['misses'] == 2
+    
+    def test_file_cache_lru_eviction(self, temp_project_root):
+        """Test that least recently used entries are evicted over budget."""
+        knowledge_dir = temp_project_root / "knowledge"
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (knowledge_dir / name).write_text(name[0] * 40)
+        
+        cache = FileCache(max_bytes=100)
+        cache.read_text(knowledge_dir / "a.txt")
+        cache.read_text(knowledge_dir / "b.txt")
+        cache.read_text(knowledge_dir / "a.txt")  # a is now most recent
+        cache.read_text(knowledge_dir / "c.txt")  # evicts b
+        
+        stats = cache.stats()
+        assert stats['evictions'] == 1
+        assert stats['bytes'] == 80
+        
+        cache.read_text(knowledge_dir / "a.txt")
+        assert cache.stats()['hits'] == 2
+    
+    def test_compile_knowledge_pack(self, knowledge_manager, temp_project_root):
+        """Test compiling and memory-mapping a knowledge pack."""
+        (temp_project_root / "knowledge" / "regions.txt").write_text(
+            "## === REGIONS ===\nOverview\n\n### Wind Kingdom\nHigh peaks\n"
+        )
+        pack_path = knowledge_manager.compile_pack()
+        assert pack_path == temp_project_root / ".mysticscribe" / "knowledge.pack"
+        
+        with KnowledgePack.open(pack_path) as pack:
+            assert pack.is_fresh(knowledge_manager.knowledge_dir)
+            assert pack.file_names[:2] == ["core_story_elements.txt", "plot.txt"]
+            assert pack.file_text("plot.txt").startswith("Act 1: Setup")
+            
+            sections = pack.sections()
+            wind = next(s for s in sections if s.heading == "Wind Kingdom")
+            assert wind.text == "### Wind Kingdom\nHigh peaks"
+            assert sections[wind.parent].heading == "REGIONS"
+            assert wind.token_estimate > 0
+        
+        # Loaders read through the pack while it is fresh
+        assert knowledge_manager.load_knowledge_file("plot.txt").startswith("Act 1: Setup")
+        (temp_project_root / "knowledge" / "plot.txt").write_text("Act 1: Rewritten opening")
+        assert knowledge_manager.load_knowledge_file("plot.txt") == "Act 1: Rewritten opening"
+    
     def test_empty_knowledge_directory(self):
         """Test behavior with empty knowledge directory."""
         temp_dir = Path(tempfile.mkdtemp())
@@ -150,5 +292,51 @@ class TestKnowledgeManager:
             shutil.rmtree(temp_dir)
 
 
+
+class TestChapterPlanIndex:
+    """Test suite for the chapter plan index."""
+    
+    PLAN = (
+        "### === CHAPTER GUIDELINES ===\nKeep it tight.\n\n"
+        "### Chapter 1: Dawn\nVillage burns.\n\n"
+        "### Chapter 2 Outline: Journey\n- Walk north\n\n"
+        "### Chapter 10: Academy\nEntrance exam.\n\n"
+        "### === APPENDIX ===\nNotes.\n"
+    )
+    
+    def test_exact_chapter_lookup(self):
+        index = ChapterPlanIndex(self.PLAN)
+        
+        assert index.chapter_numbers == [1, 2, 10]
+        assert index.get(1) == "### Chapter 1: Dawn\nVillage burns."
+        assert index.get(2).endswith("- Walk north")
+        # The entry ends at the next heading of the same level
+        assert "Notes" not in index.get(10)
+        assert index.get(3) is None
+    
+    def test_parse_chapter_spec(self):
+        assert parse_chapter_spec("5") == [5]
+        assert parse_chapter_spec("3-5") == [3, 4, 5]
+        assert parse_chapter_spec("1, 4, 6-7") == [1, 4, 6, 7]
+        with pytest.raises(ValueError):
+            parse_chapter_spec("five")
+        with pytest.raises(ValueError):
+            parse_chapter_spec("5-3")
+        with pytest.raises(ValueError):
+            parse_chapter_spec("1-20000000")
+        with pytest.raises(ValueError):
+            parse_chapter_spec("1-60, 61-120")
+        assert len(parse_chapter_spec("1-100")) == 100
+    
+    def test_index_is_cached_until_file_changes(self, tmp_path):
+        plan_file = tmp_path / "chapters.txt"
+        plan_file.write_text(self.PLAN)
+        
+        index = get_chapter_plan_index(plan_file)
+        assert get_chapter_plan_index(plan_file) is index
+        
+        plan_file.write_text(self.PLAN + "\n### Chapter 11: Trials\nFirst trial.\n")
+        assert get_chapter_plan_index(plan_file).get(11) == "### Chapter 11: Trials\nFirst trial."
+
 if __name__ == "__main__":
     pytest.main([__file__])
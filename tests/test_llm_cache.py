@@ -0,0 +1,156 @@
+"""
+Tests for the LLM response cache.
+"""
+
+import logging
+import os
+import zlib
+
+import pytest
+
+from src.mysticscribe.core.llm_cache import LLMResponseCache, completion_key
+from src.mysticscribe.core.validation import GenerationAborted, StreamingValidator
+
+
+MESSAGES = [
+    {"role": "system", "content": "You are the writer."},
+    {"role": "user", "content": "Write Chapter 3.\n\nOutline: Cassian reaches the gate."},
+]
+
+
+class TestCompletionKey:
+    """Test suite for request keys."""
+
+    def test_key_covers_every_input(self):
+        """Test that model, parameters, messages and tools all change the key."""
+        key = completion_key("gpt-4o", {"temperature": 0.8}, MESSAGES)
+        transcript = MESSAGES + [{"role": "assistant", "content": "Observation: the gate is sealed."}]
+
+        assert key == completion_key("gpt-4o", {"temperature": 0.8}, [dict(m) for m in MESSAGES])
+        assert key != completion_key("gpt-4.1", {"temperature": 0.8}, MESSAGES)
+        assert key != completion_key("gpt-4o", {"temperature": 0.7}, MESSAGES)
+        assert key != completion_key("gpt-4o", {"temperature": 0.8}, transcript)
+        assert key != completion_key("gpt-4o", {"temperature": 0.8}, MESSAGES, [{"name": "knowledge_lookup"}])
+
+    def test_parameter_order_does_not_matter(self):
+        """Test that keys do not depend on dictionary order."""
+        assert (completion_key("gpt-4o", {"temperature": 0.8, "stop": ["\n"]}, MESSAGES)
+                == completion_key("gpt-4o", {"stop": ["\n"], "temperature": 0.8}, MESSAGES))
+
+
+class TestLLMResponseCache:
+    """Test suite for LLMResponseCache."""
+
+    def test_round_trip_is_compressed(self, tmp_path):
+        """Test that a stored completion is returned and stored compressed."""
+        cache = LLMResponseCache(tmp_path)
+        key = completion_key("gpt-4o", {}, MESSAGES)
+        response = "Final Answer: The gate groaned open. " * 200
+
+        assert cache.get(key) is None
+        cache.put(key, response)
+
+        assert cache.get(key) == response
+        assert cache.stats()['bytes'] < len(response) // 10
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        """Test that the oldest unused entries go once the budget is exceeded."""
+        cache = LLMResponseCache(tmp_path)
+        keys = [completion_key("gpt-4o", {}, f"prompt {i}") for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.put(key, f"response {i} " + os.urandom(200).hex())
+            # Distinct modification times, oldest first
+            path = cache._path(key)
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        cache.max_bytes = cache.stats()['bytes']
+        os.utime(cache._path(keys[0]), ns=(10 * 10**9, 10 * 10**9))
+
+        cache.put(completion_key("gpt-4o", {}, "prompt 4"), "response 4 " + os.urandom(200).hex())
+
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.stats()['bytes'] <= cache.max_bytes
+        assert cache.evictions >= 1
+
+    def test_unreadable_and_stale_entries_miss(self, tmp_path):
+        """Test that corrupt entries and entries from another version are ignored."""
+        cache = LLMResponseCache(tmp_path)
+        key = completion_key("gpt-4o", {}, MESSAGES)
+        cache.cache_dir.mkdir(parents=True)
+
+        cache._path(key).write_bytes(b"not compressed")
+        assert cache.get(key) is None
+
+        cache._path(key).write_bytes(zlib.compress(b'{"version": 0, "key": "%s", "response": "old"}' % key.encode()))
+        assert cache.get(key) is None
+
+    def test_clear(self, tmp_path):
+        """Test that clear removes every entry."""
+        cache = LLMResponseCache(tmp_path)
+        cache.put("a" * 64, "one")
+        cache.put("b" * 64, "two")
+
+        cache.clear()
+
+        assert cache.stats()['entries'] == 0
+        assert cache.get("a" * 64) is None
+
+    def test_discard(self, tmp_path):
+        """Test that discard removes one entry and ignores missing ones."""
+        cache = LLMResponseCache(tmp_path)
+        cache.put("a" * 64, "one")
+        cache.put("b" * 64, "two")
+
+        cache.discard("a" * 64)
+        cache.discard("c" * 64)
+
+        assert cache.get("a" * 64) is None
+        assert cache.get("b" * 64) == "two"
+
+
+class TestCachedLLM:
+    """Test suite for the cached stage LLMs."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        """Replace the model call with one returning the next queued response."""
+        from crewai.llm import LLM
+        calls = []
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setattr(LLM, "call", lambda self, messages, tools=None, *args, **kwargs: calls.pop(0))
+        return calls
+
+    def test_guarded_stage_uses_cache_only_inside_guard(self, tmp_path, calls, caplog):
+        """Test that unguarded calls bypass the cache and replays are announced."""
+        from src.mysticscribe.crew import CachedLLM, guard_llm_stream
+        llm = CachedLLM(model="gpt-4o", temperature=0.8, stage="writer", guarded=True,
+                        response_cache=LLMResponseCache(tmp_path))
+        caplog.set_level(logging.INFO, logger="src.mysticscribe.crew")
+
+        calls.extend(["Final Answer: Unchecked draft.", "Final Answer: Checked draft."])
+        assert llm.call(MESSAGES) == "Final Answer: Unchecked draft."
+        with guard_llm_stream(StreamingValidator(start_marker="Final Answer:")):
+            assert llm.call(MESSAGES) == "Final Answer: Checked draft."
+            assert llm.call(MESSAGES) == "Final Answer: Checked draft."
+
+        assert calls == []
+        assert llm.response_cache.hits == 1
+        assert "Writer response replayed from the LLM cache" in caplog.text
+
+    def test_replayed_response_is_validated(self, tmp_path, calls):
+        """Test that a cached response failing the active guard is dropped and aborts the call."""
+        from src.mysticscribe.crew import CachedLLM, guard_llm_stream
+        cache = LLMResponseCache(tmp_path)
+        llm = CachedLLM(model="gpt-4o", stage="editor", guarded=True, response_cache=cache)
+        validator = StreamingValidator(start_marker="Final Answer:")
+
+        # The stubbed call streams nothing, so the guard only sees the text once it is replayed
+        calls.append("Final Answer: Here is Chapter 3, polished.")
+        with guard_llm_stream(validator):
+            llm.call(MESSAGES)
+        with pytest.raises(GenerationAborted):
+            with guard_llm_stream(validator):
+                llm.call(MESSAGES)
+
+        assert cache.stats()['entries'] == 0
@@ -0,0 +1,123 @@
+"""
+Tests for the incremental story-so-far digest.
+"""
+
+import pytest
+
+from src.mysticscribe.core.chapter_manager import ChapterManager
+from src.mysticscribe.core.story_digest import (
+    StoryDigest, compact_arc, summarize_chapter, ARC_MAX_ENTRIES
+)
+
+
+def chapter_text(number: int) -> str:
+    """Build a chapter long enough to be summarized rather than kept verbatim."""
+    return "\n\n".join([
+        f"# Chapter {number}",
+        f"Lin Wei climbed the misty mountain path toward the sect gates in chapter {number}, the jade token warm in his palm.",
+        f"\"The elders are waiting,\" Mei said, watching the lanterns sway above the training courtyard and the old pines.",
+        " ".join(["The wind carried the scent of incense across the silent courtyard stones."] * 8),
+        f"Lin Wei bowed before the elders and the jade token began to glow with a cold light, ending chapter {number}.",
+    ])
+
+
+class TestSummarizeChapter:
+    """Test suite for single-chapter digests."""
+
+    def test_digest_fields(self):
+        """Test the opening, key moments, ending and summary of a chapter."""
+        digest = summarize_chapter(3, chapter_text(3))
+
+        assert digest['number'] == 3
+        assert digest['text'] is None
+        assert digest['opening'] == "# Chapter 3"
+        assert digest['ending'].startswith("Lin Wei bowed")
+        assert any('Mei said' in moment for moment in digest['key_moments'])
+        assert 0 < len(digest['summary']) <= 3
+
+    def test_short_chapter_kept_verbatim(self):
+        """Test that very short chapters are stored whole."""
+        digest = summarize_chapter(1, "A short chapter.")
+        assert digest['text'] == "A short chapter."
+
+
+class TestCompactArc:
+    """Test suite for arc compaction."""
+
+    def test_arc_is_bounded_and_covers_every_chapter(self):
+        """Test that merging keeps chapter coverage and totals."""
+        entries = [
+            {'start': n, 'end': n, 'chapters': 1, 'words': 10, 'sentences': [[float(n), f"s{n}"]]}
+            for n in range(1, 101)
+        ]
+        arc = compact_arc(entries)
+
+        assert len(arc) == ARC_MAX_ENTRIES
+        assert arc[0]['start'] == 1 and arc[-1]['end'] == 100
+        assert all(a['end'] + 1 == b['start'] for a, b in zip(arc, arc[1:]))
+        assert sum(e['chapters'] for e in arc) == 100
+        assert sum(e['words'] for e in arc) == 1000
+        assert arc[-1]['chapters'] <= arc[0]['chapters']
+
+
+class TestStoryDigest:
+    """Test suite for StoryDigest."""
+
+    def test_saving_chapters_updates_digest(self, temp_project_root):
+        """Test that ChapterManager saves keep the digest current."""
+        manager = ChapterManager(temp_project_root)
+        for number in range(1, 21):
+            manager.save_chapter_content(number, chapter_text(number), validate=False)
+
+        story = StoryDigest(temp_project_root).story_so_far(21)
+
+        assert story.chapter_count == 20
+        assert len(story.arc) <= ARC_MAX_ENTRIES
+        assert [d['number'] for d in story.recent] == [18, 19, 20]
+        assert story.latest['number'] == 20
+        assert "Chapters 1-" in story.format_arc()
+
+    def test_story_so_far_does_not_read_old_chapters(self, temp_project_root, monkeypatch):
+        """Test that only the recent window is checked against disk."""
+        manager = ChapterManager(temp_project_root)
+        for number in range(1, 11):
+            manager.save_chapter_content(number, chapter_text(number), validate=False)
+
+        digest = StoryDigest(temp_project_root)
+        checked = []
+        original = StoryDigest.chapter_digest
+
+        def tracking(self, chapter_number):
+            checked.append(chapter_number)
+            return original(self, chapter_number)
+
+        monkeypatch.setattr(StoryDigest, 'chapter_digest', tracking)
+        story = digest.story_so_far(11)
+
+        assert story.chapter_count == 10
+        assert checked == [8, 9, 10]
+
+    def test_earlier_target_and_external_edits(self, temp_project_root):
+        """Test rewriting an earlier chapter and picking up edited files."""
+        manager = ChapterManager(temp_project_root)
+        for number in range(1, 8):
+            manager.save_chapter_content(number, chapter_text(number), validate=False)
+
+        digest = StoryDigest(temp_project_root)
+        story = digest.story_so_far(4)
+        assert story.chapter_count == 3
+        assert max(e['end'] for e in story.arc) == 3
+
+        # Edited outside ChapterManager: picked up through the file's stat
+        (temp_project_root / "chapters" / "chapter_7.md").write_text("Rewritten ending.")
+        assert digest.story_so_far(8).latest['text'] == "Rewritten ending."
+
+    def test_rebuild_without_existing_digest(self, temp_project_root):
+        """Test that a missing digest is rebuilt from the chapters on disk."""
+        for number in (1, 2, 5):
+            (temp_project_root / "chapters" / f"chapter_{number}.md").write_text(chapter_text(number))
+
+        story = StoryDigest(temp_project_root).story_so_far(6)
+
+        assert story.chapter_count == 3
+        assert [d['number'] for d in story.recent] == [5]
@@ -0,0 +1,114 @@
+"""
+Test the per-chapter style features and their aggregation.
+"""
+
+import json
+
+import pytest
+
+from src.mysticscribe.core import style_features
+from src.mysticscribe.core.style_features import (
+    FEATURES_VERSION,
+    StyleAggregate,
+    StyleFeatureCache,
+    extract_chapter_features,
+    extract_many,
+)
+
+
+CHAPTER_ONE = (
+    "# Chapter 1\n\n"
+    "The wind howled across the ridge. Cassian pulled his cloak tight against the cold.\n\n"
+    "\"We should turn back before the mist rises,\" Rygar said, watching the pale sky.\n\n"
+    "Cassian shook his head. \"Not yet.\""
+)
+
+CHAPTER_TWO = (
+    "# Chapter 2\n\n"
+    "Dawn broke slowly over the shattered valley, painting the ruined watchtowers in a soft and warm light "
+    "that did nothing to ease the ache in his shoulders or the fear coiled tight in his chest.\n\n"
+    "\"Move,\" Rygar whispered."
+)
+
+
+class TestStyleFeatures:
+    """Test suite for extract_chapter_features and StyleAggregate."""
+    
+    def test_features_are_json_serializable(self):
+        """Test that a feature record survives a JSON round trip."""
+        features = extract_chapter_features(CHAPTER_ONE)
+        
+        assert json.loads(json.dumps(features)) == features
+        assert features['version'] == FEATURES_VERSION
+        assert features['opening'].startswith("The wind howled")
+    
+    def test_aggregate_sums_counts_and_histograms(self):
+        """Test that merged statistics add up the per-chapter ones."""
+        one = extract_chapter_features(CHAPTER_ONE)
+        two = extract_chapter_features(CHAPTER_TWO)
+        
+        stats = StyleAggregate.from_features([(1, one), (2, two)])
+        
+        assert stats.chapters == [1, 2]
+        assert stats.word_count == one['word_count'] + two['word_count']
+        dialogue = stats.distribution('dialogue')
+        assert (dialogue['count'], dialogue['short'], dialogue['medium'], dialogue['long']) == (3, 2, 1, 0)
+        assert stats.distribution('sentences')['long'] == 1
+        assert stats.sentence_lengths == one['sentence_lengths'] + two['sentence_lengths']
+        assert stats.long_sentences == two['long_sentences']
+        assert sum(stats.speakers.values()) == 2
+        assert stats.indicator_total('atmosphere') == (
+            sum(one['indicators']['atmosphere'].values()) + sum(two['indicators']['atmosphere'].values())
+        )
+        assert [n for n, _ in stats.openings] == [1, 2]
+        assert 0 < stats.dialogue_ratio < 1
+    
+    def test_aggregate_keeps_earliest_examples(self):
+        """Test that examples come from the earliest chapter that has them."""
+        stats = StyleAggregate.from_features([
+            (1, extract_chapter_features(CHAPTER_ONE)),
+            (2, extract_chapter_features(CHAPTER_TWO)),
+        ])
+        
+        examples = stats.indicator_examples_for('atmosphere', ['wind', 'mist', 'dawn'])
+        assert examples[0].startswith("wind howled")
+        assert examples[2].startswith("Dawn broke")
+
+
+class TestStyleFeatureCache:
+    """Test suite for StyleFeatureCache."""
+    
+    def test_unchanged_content_is_not_reanalyzed(self, tmp_path, monkeypatch):
+        """Test that features are extracted once per distinct content."""
+        calls = []
+        extract = style_features.extract_chapter_features
+        monkeypatch.setattr(style_features, 'extract_chapter_features', lambda text: calls.append(text) or extract(text))
+        
+        cache = StyleFeatureCache(tmp_path)
+        first = cache.features(CHAPTER_ONE)
+        second = StyleFeatureCache(tmp_path).features(CHAPTER_ONE)
+        cache.features(CHAPTER_TWO)
+        
+        assert first == second
+        assert calls == [CHAPTER_ONE, CHAPTER_TWO]
+        assert len(list(cache.cache_dir.glob('*.json'))) == 2
+    
+    def test_outdated_record_is_replaced(self, tmp_path):
+        """Test that records from another feature version are re-extracted."""
+        cache = StyleFeatureCache(tmp_path)
+        cache.features(CHAPTER_ONE)
+        path = next(cache.cache_dir.glob('*.json'))
+        path.write_text(json.dumps({'version': FEATURES_VERSION - 1}), encoding='utf-8')
+        
+        assert cache.features(CHAPTER_ONE)['version'] == FEATURES_VERSION
+        assert json.loads(path.read_text(encoding='utf-8'))['version'] == FEATURES_VERSION
+    
+    def test_parallel_extraction_is_deterministic(self, tmp_path):
+        """Test that worker processes give the same records in the same order."""
+        contents = [CHAPTER_ONE, CHAPTER_TWO, CHAPTER_ONE + "\n\nMore.", CHAPTER_TWO]
+        
+        serial = extract_many(contents, workers=1)
+        parallel = StyleFeatureCache(tmp_path).features_many(contents, workers=2)
+        
+        assert parallel == serial
+        assert StyleAggregate.from_features(enumerate(parallel)) == StyleAggregate.from_features(enumerate(serial))
@@ -0,0 +1,82 @@
+"""
+Test style fingerprints and voice drift scoring.
+"""
+
+import pytest
+
+from src.mysticscribe.core.style_features import chapter_drift
+from src.mysticscribe.core.style_fingerprint import (
+    FEATURE_NAMES,
+    VoiceProfile,
+    fingerprint,
+    load_style_profiles,
+    nearest_style,
+)
+
+
+THIRD_PERSON = (
+    "Cassian walked along the ridge while the wind pulled at his cloak. He watched the valley below, "
+    "and the river wound through it like a thread of silver. The old watchtower stood at the edge of the cliff.\n\n"
+    "\"We should go,\" Rygar said. The mist was rising, and the light was fading from the sky."
+)
+
+FIRST_PERSON = (
+    "I couldn't sleep. I never can, not after a fight; my hands won't stop shaking and my head won't stop "
+    "spinning. So I lay there — staring at the ceiling — wondering what my father would say... wondering "
+    "if I'd even care! Would I? I don't know. I really don't."
+)
+
+
+class TestFingerprint:
+    """Test suite for fingerprint and VoiceProfile."""
+    
+    def test_fingerprint_features(self):
+        """Test that the fingerprint has named, normalized features."""
+        vector = fingerprint(THIRD_PERSON)
+        
+        assert vector.shape == (len(FEATURE_NAMES),)
+        features = dict(zip(FEATURE_NAMES, vector))
+        assert features['word:the'] > features['word:i'] == 0
+        assert 0 < features['dialogue_share'] < 1
+        assert features['punctuation:comma'] > 0
+        assert not fingerprint("").any()
+    
+    def test_drift_separates_voices(self):
+        """Test that a different voice drifts further than the same voice."""
+        voice = VoiceProfile.from_texts('third', [THIRD_PERSON, THIRD_PERSON.replace('Cassian', 'Tessa')])
+        
+        assert voice.drift(fingerprint(THIRD_PERSON)) < 0.1
+        assert voice.drift(fingerprint(FIRST_PERSON)) > 1.0
+        assert voice.top_deviations(fingerprint(FIRST_PERSON), count=1)[0][1] != 0
+    
+    def test_style_profiles_from_directory(self, tmp_path):
+        """Test loading style samples and ranking them against a text."""
+        (tmp_path / "close.txt").write_text(FIRST_PERSON, encoding='utf-8')
+        (tmp_path / "third.txt").write_text(THIRD_PERSON, encoding='utf-8')
+        
+        profiles = load_style_profiles(tmp_path)
+        
+        assert sorted(profiles) == ['close', 'third']
+        assert nearest_style(fingerprint(FIRST_PERSON + " I sighed."), profiles)[0][0] == 'close'
+        assert load_style_profiles(tmp_path / "missing") == {}
+
+
+class TestChapterDrift:
+    """Test suite for chapter_drift."""
+    
+    def test_new_chapter_scored_against_previous(self, tmp_path):
+        """Test that a chapter in a different voice is flagged."""
+        chapters_dir = tmp_path / "chapters"
+        chapters_dir.mkdir()
+        (chapters_dir / "chapter_1.md").write_text(THIRD_PERSON, encoding='utf-8')
+        (chapters_dir / "chapter_2.md").write_text(THIRD_PERSON.replace('Cassian', 'Tessa'), encoding='utf-8')
+        
+        assert chapter_drift(tmp_path, 1) is None
+        
+        consistent = chapter_drift(tmp_path, 3, THIRD_PERSON.replace('ridge', 'road'))
+        drifting = chapter_drift(tmp_path, 3, FIRST_PERSON)
+        
+        assert consistent.reference_chapters == [1, 2]
+        assert not consistent.flagged
+        assert drifting.flagged
+        assert drifting.drift > consistent.drift
@@ -0,0 +1,432 @@
+"""
+Test the text processing utilities.
+"""
+
+import random
+import re
+import time
+
+import numpy as np
+import pytest
+
+from src.mysticscribe.utils.text_utils import (
+    analyze_file_stats, analyze_text_stats, extract_paragraphs, extract_sentences, extract_word_count, find_dialogue, search_text
+)
+from src.mysticscribe.utils.text_document import TextDocument, as_document
+from src.mysticscribe.utils.sentence_segmenter import (
+    BOUNDARY_PATTERN, WORD_CHAR_PATTERN, segment_paragraphs, segment_sentences
+)
+from src.mysticscribe.utils.length_stats import (
+    LengthHistogram, RhythmTracker, bucket_counts, length_distribution, rhythm_metrics, window_variability
+)
+from src.mysticscribe.utils.text_stream import stream_text_stats
+from src.mysticscribe.utils.text_index import InvertedIndex
+from src.mysticscribe.utils.text_spans import TextSpans
+from src.mysticscribe.utils.term_matcher import PhraseFinder, TermMatcher
+from src.mysticscribe.utils.sentence_engine import CLAUSE_BREAKS, OccurrenceIndex, SentenceEngine
+from src.mysticscribe.core.style_features import find_metaphors, find_signature_phrases, find_transitions
+
+
+class TestSearchText:
+    """Test suite for search_text."""
+    
+    TEXT = "The wind rose at dawn.\nCassian drew his sword.\nThe Wind Kingdom slept."
+    
+    def test_search_text_linear(self):
+        """Test plain line-by-line search."""
+        assert search_text(self.TEXT, "wind") == [
+            (1, "The wind rose at dawn."),
+            (3, "The Wind Kingdom slept."),
+        ]
+        assert search_text(self.TEXT, "wind", case_sensitive=True) == [(1, "The wind rose at dawn.")]
+    
+    def test_search_text_with_index_matches_linear(self):
+        """Test that an index-backed search returns the same results."""
+        index = InvertedIndex.from_text(self.TEXT)
+        for term in ["wind", "Wind K", "ass", "sword.", ".", "missing"]:
+            assert search_text(self.TEXT, term, index=index) == search_text(self.TEXT, term)
+            assert (search_text(self.TEXT, term, case_sensitive=True, index=index)
+                    == search_text(self.TEXT, term, case_sensitive=True))
+
+
+class TestInvertedIndex:
+    """Test suite for InvertedIndex queries."""
+    
+    @pytest.fixture
+    def index(self):
+        index = InvertedIndex()
+        index.add_document("a", "the wind sword sect\nshadow falls")
+        index.add_document("b", "a sword in the wind")
+        return index
+    
+    def test_and_query(self, index):
+        assert set(index.search("wind sword")) == {"a", "b"}
+        assert set(index.search("wind shadow")) == {"a"}
+    
+    def test_or_query(self, index):
+        assert set(index.search("shadow OR missing")) == {"a"}
+    
+    def test_phrase_query(self, index):
+        hits = index.search('"wind sword"')
+        assert set(hits) == {"a"}
+        assert [p.position for p in hits["a"]] == [1, 2]
+    
+    def test_remove_document(self, index):
+        index.remove_document("a")
+        assert index.search("shadow") == {}
+
+
+class TestTextDocument:
+    """Test suite for the lazily split TextDocument."""
+    
+    def test_views_match_string_splits(self):
+        """Test that every view matches splitting the string directly."""
+        rng = random.Random(11)
+        alphabet = ['a', 'b', ' ', '\n', '\n\n', '.', '!', '?', '"', "'", '...', ' x y ', '\u3000', '\xa0', 'long quote text ']
+        
+        for _ in range(500):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            document = TextDocument(text)
+            
+            sentences = [text[start:end] for start, end in segment_sentences(text)]
+            paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+            dialogue = [f'"{q}"' for q in re.findall(r'"([^"]*)"', text) if q.strip()]
+            dialogue += [f"'{q}'" for q in re.findall(r"'([^']{10,}?)'", text) if q.strip()]
+            
+            assert document.word_count == len(text.split())
+            assert document.texts(document.words) == text.split()
+            assert document.texts(document.sentences) == sentences
+            assert document.texts(document.paragraphs) == paragraphs
+            assert document.texts(document.dialogue) == dialogue
+            assert document.span_words(document.sentences) == [len(s.split()) for s in sentences]
+    
+    def test_views_are_computed_once(self):
+        """Test that views are memoized and documents are shared per text."""
+        text = 'She paused. "Who goes there?" he asked.\n\nNo answer came.'
+        document = as_document(text)
+        
+        assert document.sentences is document.sentences
+        assert as_document(text) is document
+        assert as_document(document) is document
+        assert not hasattr(document, '__dict__')
+    
+    def test_text_utils_accept_documents(self):
+        """Test that text_utils functions give the same results for a document."""
+        text = 'She paused. "Who goes there?" he asked.\n\nNo answer came.'
+        document = TextDocument(text)
+        
+        assert extract_word_count(document) == extract_word_count(text) == 10
+        assert extract_sentences(document) == extract_sentences(text)
+        assert extract_paragraphs(document) == ['She paused. "Who goes there?" he asked.', 'No answer came.']
+        assert find_dialogue(document) == ['"Who goes there?"']
+        assert analyze_text_stats(document) == analyze_text_stats(text)
+        assert search_text(document, 'answer') == [(3, 'No answer came.')]
+
+
+def split_with_pattern(text: str) -> list:
+    """Sentences from a plain pass over the segmenter's regular expression."""
+    sentences, start = [], 0
+    for match in BOUNDARY_PATTERN.finditer(text):
+        sentences.append((text[start:match.start()] + match.group().rstrip()).strip())
+        start = match.end()
+    sentences.append(text[start:].strip())
+    return [s for s in sentences if WORD_CHAR_PATTERN.search(s)]
+
+
+class TestSentenceSegmenter:
+    """Test suite for the shared sentence segmenter."""
+    
+    def segment(self, text: str) -> list:
+        return [text[start:end] for start, end in segment_sentences(text)]
+    
+    def test_ellipses_abbreviations_and_quotes(self):
+        """Test the cases a split on runs of .!? gets wrong."""
+        assert self.segment('Mr. Chen arrived. J. R. Tolkien wrote it, e.g. Paris. Pi is 3.14 exactly.') == [
+            'Mr. Chen arrived.', 'J. R. Tolkien wrote it, e.g. Paris.', 'Pi is 3.14 exactly.'
+        ]
+        assert self.segment('Wait... what was that? Nothing... Nothing at all.') == [
+            'Wait... what was that?', 'Nothing...', 'Nothing at all.'
+        ]
+        assert self.segment('"Go!" she said. He asked, "Why?" "Because," she said.') == [
+            '"Go!" she said.', 'He asked, "Why?"', '"Because," she said.'
+        ]
+        assert self.segment('"Wait—" The door burst open. "But I—" she began. So did I. Then we left.') == [
+            '"Wait—"', 'The door burst open.', '"But I—" she began.', 'So did I.', 'Then we left.'
+        ]
+    
+    def test_blank_lines_end_sentences(self):
+        """Test that headings and scene breaks end sentences without punctuation and are dropped if empty."""
+        text = '# Chapter 1\n\nThe mist rolled in.\nIt was cold!\n  \n* * *\n\nLater, it cleared'
+        
+        assert self.segment(text) == ['# Chapter 1', 'The mist rolled in.', 'It was cold!', 'Later, it cleared']
+        assert segment_sentences('') == segment_sentences(' ... ! ') == []
+    
+    def test_matches_pattern_reference(self):
+        """Test that the segmenter's shortcuts give the sentences of a plain pass over its pattern."""
+        rng = random.Random(7)
+        alphabet = ['Mr', 'Prof', 'e.g', 'J', 'I', ' ', '.', '!', '?', '…', '—', '"', "'", '”', '(', ')',
+                    '\n', '\t', '\r', 'a', 'B', '_', '1', 'é', '中', '　', '\xa0', 'word ', 'The ']
+        
+        for _ in range(1000):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            assert self.segment(text) == split_with_pattern(text)
+    
+    def test_paragraphs_segment_independently(self):
+        """Test that segmenting each paragraph alone gives the same sentences as the whole text."""
+        rng = random.Random(5)
+        alphabet = ['Dr', ' ', '.', '?', '"', ')', '\n', '\n\n', ' \n\n', 'x', 'Y', '...', 'word ']
+        
+        for _ in range(300):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            by_paragraph = [self.segment(p) for p in text.split('\n\n')]
+            assert self.segment(text) == [s for sentences in by_paragraph for s in sentences]
+            assert [[text[start:end] for start, end in spans] for spans in segment_paragraphs(text)] == by_paragraph
+
+
+class TestTextSpans:
+    """Test suite for TextSpans tokenization."""
+    
+    def test_spans_match_independent_splits(self):
+        """Test that the single scan matches split(), the segmenter and quote matching."""
+        rng = random.Random(3)
+        alphabet = ['a', 'b', ' ', '\n', '\n\n', '.', '!', '?', '"', '...', ' x y ']
+        
+        for _ in range(500):
+            text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            spans = TextSpans.from_text(text)
+            
+            sentences = [text[start:end] for start, end in segment_sentences(text)]
+            paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+            dialogue = re.findall(r'"([^"]*)"', text)
+            
+            assert spans.word_count == len(text.split())
+            assert spans.sentence_texts() == [(s, len(s.split())) for s in sentences]
+            assert spans.paragraph_texts() == [(p, len(p.split())) for p in paragraphs]
+            assert spans.dialogue_texts() == [(d, len(d.split())) for d in dialogue]
+    
+    def test_sentence_min_chars(self):
+        """Test filtering out short sentences."""
+        spans = TextSpans.from_text('Yes. "The mist rolled in," she said. No!')
+        assert spans.sentence_texts(min_chars=10) == [('"The mist rolled in," she said.', 6)]
+        assert spans.dialogue == [(6, 25)]
+
+
+class TestTermMatcher:
+    """Test suite for the single-pass TermMatcher."""
+    
+    def test_counts_match_per_term_findall(self):
+        """Test that one scan gives the same counts as one findall per term."""
+        categories = {
+            'action': ['struck', 'burst', 'rushed'],
+            'visual': ['dark', 'darkness', 'light', 'lightning', 'glow'],
+            'tension': ['tight', 'coiled'],
+        }
+        text = ("Darkness struck. The dark coiled tight; LIGHTNING burst and lit the glowing dark sky. "
+                "He rushed, then struck again in the light.")
+        
+        matches = TermMatcher(categories).scan(text)
+        
+        for category, terms in categories.items():
+            for term in terms:
+                assert matches.counts[category][term] == len(re.findall(term, text, re.IGNORECASE))
+        assert matches.total('action') == 4
+    
+    def test_sample_positions(self):
+        """Test that the first match offsets are recorded per term."""
+        text = "Mist. More mist. Mist again."
+        matches = TermMatcher({'weather': ['mist', 'rain']}, max_samples=2).scan(text)
+        
+        assert matches.positions['weather'] == {'mist': [0, 11]}
+        assert matches.first_position('weather', 'mist') == 0
+        assert matches.first_position('weather', 'rain') is None
+    
+    def test_terms_shared_between_categories(self):
+        """Test that a term listed in several categories counts in each."""
+        matches = TermMatcher({'visual': ['shadow'], 'mystery': ['shadow', 'secret']}).scan("Shadows kept a secret.")
+        assert matches.counts == {'visual': {'shadow': 1}, 'mystery': {'shadow': 1, 'secret': 1}}
+
+
+class TestPhraseFinder:
+    """Test suite for the single-pass PhraseFinder."""
+    
+    def test_first_positions_match_str_find(self):
+        """Test that one pass finds the same first occurrences as one find per phrase."""
+        phrases = ['this chapter', 'in this chapter', 'chapter summary:', 'the story', 'story continues', 'abab']
+        fragments = ['In this ', 'chapter', ' summary:', 'The story', ' continues', 'ab', 'x ', '\n']
+        rng = random.Random(7)
+        finder = PhraseFinder(phrases)
+        
+        for _ in range(500):
+            text = ''.join(rng.choice(fragments) for _ in range(rng.randint(0, 20))).lower()
+            expected = {p: text.find(p) for p in phrases if p in text}
+            assert finder.first_positions(text) == expected
+    
+    def test_overlapping_phrases(self):
+        """Test that phrases hidden inside or across another match are found."""
+        finder = PhraseFinder(['In this chapter', 'This chapter', 'Chapter summary:'])
+        
+        positions = finder.first_positions("in this chapter summary:")
+        
+        assert positions == {'in this chapter': 0, 'this chapter': 3, 'chapter summary:': 8}
+
+
+class TestSentenceEngine:
+    """Test suite for SentenceEngine and the extractions built on it."""
+    
+    TEXT = "The wind rose. It hummed like a kettle, low and long! Then it stopped"
+    
+    def test_segments_follow_break_offsets(self):
+        """Test that segments are the text between break characters."""
+        engine = SentenceEngine(self.TEXT)
+        
+        assert engine.breaks == [13, 52]
+        assert list(engine.segments()) == [(0, 13), (14, 52), (53, len(self.TEXT))]
+        assert engine.segment_at(self.TEXT.index('hummed')) == (14, 52)
+        assert engine.segment_end(self.TEXT.index('stopped')) == len(self.TEXT)
+    
+    def test_find_segments_matches_sentence_regex(self):
+        """Test that expanded matches equal the enclosing-sentence regex."""
+        pattern = re.compile(r'wind|hummed|then', re.IGNORECASE)
+        engine = SentenceEngine(self.TEXT)
+        
+        found = [self.TEXT[start:end] for (start, end), _ in engine.find_segments(pattern)]
+        
+        assert found == re.findall(r'[^.!?]*(?:wind|hummed|then)[^.!?]*', self.TEXT, re.IGNORECASE)
+    
+    def test_occurrence_index_range_queries(self):
+        """Test first and last match lookups within a range."""
+        index = OccurrenceIndex("a said b said c", re.compile('said'))
+        
+        assert index.first_between(0, 15).start() == 2
+        assert index.last_between(0, 15).start() == 9
+        assert index.first_between(3, 9) is None
+    
+    def test_metaphors_scoped_to_clauses(self):
+        """Test that metaphor matches stop at the end of their clause."""
+        matches = find_metaphors(SentenceEngine(self.TEXT, CLAUSE_BREAKS))
+        
+        assert matches[0] == ['like a kettle']
+    
+    def test_signature_phrases_and_transitions(self):
+        """Test sentence extraction from the first letter of the sentence."""
+        engine = SentenceEngine(self.TEXT)
+        
+        assert find_signature_phrases(engine)[0] == ['It hummed like a kettle, low and long']
+        assert find_transitions(SentenceEngine("The wind rose. It now stopped. Now what")) == ['It now stopped']
+    
+    def test_unpunctuated_text_is_linear(self):
+        """Test that a long passage without sentence breaks is handled quickly."""
+        text = "word " * 200000
+        engine = SentenceEngine(text)
+        
+        start = time.perf_counter()
+        assert not any(find_signature_phrases(engine))
+        assert find_transitions(engine) == []
+        assert all(not matches for matches in find_metaphors(SentenceEngine(text, CLAUSE_BREAKS)))
+        assert time.perf_counter() - start < 2.0
+
+
+class TestLengthStats:
+    """Test suite for the vectorized length statistics."""
+    
+    def test_bucket_bounds_are_inclusive(self):
+        """Test that bucket bounds are the largest short and medium lengths."""
+        assert bucket_counts([1, 8, 9, 20, 21], (8, 20)) == (2, 2, 1)
+    
+    def test_distribution_summary(self):
+        """Test count, mean, variance and percentiles."""
+        stats = length_distribution([2, 4, 4, 4, 5, 5, 7, 9])
+        
+        assert stats['count'] == 8
+        assert stats['mean'] == 5.0
+        assert stats['std'] == 2.0
+        assert stats['percentiles'][50] == 4.5
+        assert length_distribution([])['count'] == 0
+    
+    def test_percentiles_match_numpy(self):
+        """Test histogram percentiles against numpy.percentile."""
+        rng = random.Random(11)
+        lengths = [rng.randint(0, 60) for _ in range(501)]
+        
+        percentiles = length_distribution(lengths)['percentiles']
+        
+        assert list(percentiles.values()) == np.percentile(lengths, list(percentiles)).tolist()
+    
+    def test_batches_give_the_same_summary(self):
+        """Test that lengths added batch by batch summarize like one batch."""
+        rng = random.Random(5)
+        lengths = [rng.randint(1, 40) for _ in range(300)]
+        histogram = LengthHistogram()
+        tracker = RhythmTracker()
+        for start in range(0, len(lengths), 7):
+            histogram.add(lengths[start:start + 7])
+            tracker.add(lengths[start:start + 7])
+        
+        assert histogram.distribution((8, 20)) == length_distribution(lengths, (8, 20))
+        assert tracker.metrics() == rhythm_metrics(lengths)
+    
+    def test_window_variability_matches_direct_std(self):
+        """Test the running-sum window deviation against numpy.std per window."""
+        rng = random.Random(7)
+        lengths = [rng.randint(1, 40) for _ in range(200)]
+        
+        expected = [np.std(lengths[i:i + 20]) for i in range(len(lengths) - 19)]
+        
+        assert np.allclose(window_variability(lengths, 20), expected)
+        assert rhythm_metrics(lengths[:19])['windows'] == 0
+    
+    def test_text_stats_include_distributions(self):
+        """Test that analyze_text_stats reports length distributions and rhythm."""
+        text = "Short one. " * 15 + "This sentence is a good deal longer than the others. " * 10
+        stats = analyze_text_stats(text)
+        
+        assert stats['sentence_count'] == 25
+        assert stats['sentence_lengths']['short'] == 15
+        assert stats['sentence_lengths']['medium'] == 10
+        assert stats['rhythm']['windows'] == 6
+        assert stats['rhythm']['min_std'] > 0
+        assert analyze_text_stats("")['rhythm']['windows'] == 0
+    
+    def test_manuscript_rhythm_is_fast(self):
+        """Test that rhythm metrics over a whole manuscript take well under a second."""
+        rng = random.Random(3)
+        lengths = [rng.randint(1, 40) for _ in range(200000)]
+        
+        start = time.perf_counter()
+        rhythm_metrics(lengths)
+        length_distribution(lengths, (8, 20))
+        assert time.perf_counter() - start < 1.0
+
+
+class TestTextStatsStream:
+    """Test suite for text statistics over streamed chunks."""
+    
+    PIECES = ['word', 'Hello', 'Mr.', ' ', '  ', '\n', '\n\n', '\n \n', '.', '!', '?', '"', "'", '...', '—',
+              "isn't", '"Go!"', 'a long stretch of words']
+    
+    def test_chunked_stats_match_whole_text(self):
+        """Test that every chunking of a text gives the statistics of the whole text."""
+        rng = random.Random(7)
+        for _ in range(300):
+            text = ''.join(rng.choice(self.PIECES) for _ in range(rng.randint(0, 400)))
+            cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 30))))
+            chunks = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+            
+            assert stream_text_stats(chunks, rng.randint(1, 200)) == analyze_text_stats(text)
+    
+    def test_quotes_and_paragraphs_across_chunks(self):
+        """Test passages that are still open when a chunk is analyzed."""
+        text = ('"It was a long night," she said.\n\nThen quiet. \'Not a sound in the house.\' Mr. Chen slept. '
+                'He dreamt.\n \nThe end. "  " It was \'short\' here.')
+        
+        for size in range(1, 12):
+            chunks = [text[start:start + size] for start in range(0, len(text), size)]
+            assert stream_text_stats(chunks, size) == analyze_text_stats(text)
+    
+    def test_file_stats(self, tmp_path):
+        """Test that a file read in small chunks gives the statistics of its text."""
+        text = "Chapter One\n\n" + "She walked on. \"Where now?\" he asked.\n\n" * 50
+        path = tmp_path / "manuscript.txt"
+        path.write_text(text, encoding='utf-8')
+        
+        assert analyze_file_stats(path, chunk_size=64) == analyze_text_stats(text)
@@ -2,8 +2,17 @@
 Test the Content Validation functionality.
 """
 
+import json
+import time
+
 import pytest
-from src.mysticscribe.core import ContentValidator, ValidationIssue
+from src.mysticscribe.core import (
+    ContentValidator, GenerationAborted, IncrementalValidator, StreamingValidator, ValidationDocument, ValidationIssue
+)
+from src.mysticscribe.core import batch_validation
+from src.mysticscribe.core.batch_validation import ValidationResultCache
+from src.mysticscribe.core.chapter_manager import ChapterManager
+from src.mysticscribe.cli import main
 
 
 class TestContentValidator:
@@ -121,10 +130,10 @@ class TestContentValidator:
     
     def test_content_quality_validation(self, validator):
         """Test content quality validation."""
-        # Content with repetitive sentence starts
+        # Content with repetitive sentence starts (the rule compares their first 20 characters)
         repetitive_content = """
-        The hero walked forward. The hero looked around. The hero stopped suddenly.
-        The hero walked forward again. The hero was confused. The hero decided to rest.
+        The hero walked forward. The hero looked around. The hero walked forward again.
+        The hero was confused. The hero walked forward once more. The hero decided to rest.
         """
         
         issues = validator._validate_content_quality(repetitive_content)
@@ -201,5 +210,236 @@ class TestContentValidator:
         assert "✅ Content validation passed" in report
 
 
+
+class TestValidationDocument:
+    """Test suite for the shared ValidationDocument spans."""
+    
+    @pytest.fixture
+    def validator(self):
+        """Create a ContentValidator instance for testing."""
+        return ContentValidator()
+    
+    def test_ai_pattern_line_numbers(self, validator):
+        """Test that patterns are reported once each, in order, with their first line."""
+        content = "A quiet opening.\nOur hero waited.\n\nIn this chapter, our hero rests.\nTHIS CHAPTER ends."
+        
+        issues = validator._validate_ai_patterns(content)
+        
+        found = [(i.message.split("'")[1], i.line_number) for i in issues]
+        assert found == [("This chapter", 4), ("In this chapter", 4), ("Our hero", 2)]
+    
+    def test_sentence_count_uses_segmenter(self):
+        """Test that an ellipsis or a run like '?!' ends one sentence."""
+        content = "Wait... What?! Go. Now!"
+        document = ValidationDocument(content)
+        
+        assert document.sentence_count == 4
+        assert document.sentences.very_short_count == 4
+    
+    def test_document_is_reused_by_every_rule(self, validator):
+        """Test that validating a document gives the same issues as validating its text."""
+        content = ("The lamp flickered. \"Stay,\" she said.\n\n" * 40) + "This story ends here."
+        document = ValidationDocument(content)
+        
+        assert validator.validate_chapter_content(document) == validator.validate_chapter_content(content)
+    
+    def test_validation_speed(self, validator):
+        """Test that a 4,000-word chapter validates in a few milliseconds."""
+        paragraph = ("The wind rose over the harbor, and the lamps along the quay guttered one by one. "
+                     "\"Not tonight,\" Mara said. She pulled her coat tighter and walked on!\n\n")
+        content = paragraph * 140
+        assert 3900 < len(content.split()) < 4300
+        
+        validator.validate_chapter_content(content)
+        start = time.perf_counter()
+        for _ in range(20):
+            validator.validate_chapter_content(content)
+        elapsed = (time.perf_counter() - start) / 20
+        
+        assert elapsed < 0.02
+
+
+
+class TestIncrementalValidator:
+    """Test suite for paragraph-cached re-validation."""
+    
+    CHAPTER = (
+        "# Chapter 9\n\n"
+        "The hero walked forward. The hero walked forward again. The hero walked forward once more.\n\n"
+        "\"Stay,\" she said. He did not answer\n\n"
+        "and the lamp went out. Our hero slept.\n\n\n\n"
+        "Dawn came!"
+    )
+    
+    @staticmethod
+    def as_tuples(issues):
+        """Issues as comparable tuples."""
+        return [(i.severity, i.category, i.message, i.line_number) for i in issues]
+    
+    def test_matches_full_validation(self):
+        """Test that results assembled from paragraphs equal a full validation."""
+        full = ContentValidator().validate_chapter_content(self.CHAPTER)
+        incremental = IncrementalValidator().validate_chapter_content(self.CHAPTER)
+        
+        assert self.as_tuples(incremental) == self.as_tuples(full)
+        assert ("warning", "ai_patterns", "Found potential AI meta-commentary pattern: 'Our hero'", 7) in self.as_tuples(full)
+    
+    def test_only_changed_paragraphs_rechecked(self):
+        """Test that an edit re-checks one paragraph and still matches a full validation."""
+        validator = IncrementalValidator()
+        validator.validate_chapter_content(self.CHAPTER)
+        assert validator.checked_paragraphs == 6
+        
+        edited = self.CHAPTER.replace("Dawn came!", "Dawn came. This chapter ends.")
+        issues = validator.validate_chapter_content(edited)
+        
+        assert validator.checked_paragraphs == 1
+        assert self.as_tuples(issues) == self.as_tuples(ContentValidator().validate_chapter_content(edited))
+    
+    def test_resave_validates_incrementally(self, temp_project_root):
+        """Test that a new chapter is validated in full and re-saves keep paragraph results."""
+        manager = ChapterManager(temp_project_root)
+        cache_path = temp_project_root / ".mysticscribe" / "validation" / "chapter_9.json"
+        
+        manager.save_chapter_content(9, self.CHAPTER)
+        assert not cache_path.exists()
+        
+        manager.save_chapter_content(9, self.CHAPTER)
+        assert cache_path.exists()
+        
+        validator = IncrementalValidator(cache_path)
+        validator.validate_chapter_content(self.CHAPTER + "\n\nThe end.")
+        assert validator.checked_paragraphs == 1
+    
+    def test_cache_file_reused_between_runs(self, tmp_path):
+        """Test that paragraph results written to a cache file are reused by a new validator."""
+        cache_path = tmp_path / "chapter_9.json"
+        IncrementalValidator(cache_path).validate_chapter_content(self.CHAPTER)
+        assert cache_path.exists()
+        
+        validator = IncrementalValidator(cache_path)
+        validator.validate_chapter_content(self.CHAPTER + "\n\nThe end.")
+        assert validator.checked_paragraphs == 1
+
+
+class TestBatchValidation:
+    """Test suite for cached, parallel validation of many chapters."""
+    
+    GOOD = ("The lamp burned low while the rain kept on. \"Stay,\" she said.\n\n" * 300).strip()
+    SHORT = "Only a few words here.\n\nAnd a few more.\n\nThe end."
+    
+    def test_unchanged_chapters_are_not_revalidated(self, tmp_path, monkeypatch):
+        """Test that results are cached by content and returned in input order."""
+        calls = []
+        validate = batch_validation.validate_to_dicts
+        monkeypatch.setattr(batch_validation, 'validate_to_dicts', lambda text: calls.append(text) or validate(text))
+        
+        first = list(ValidationResultCache(tmp_path).validate_many([self.GOOD, self.SHORT]))
+        second = list(ValidationResultCache(tmp_path).validate_many([self.SHORT, self.GOOD, self.SHORT]))
+        
+        assert calls == [self.GOOD, self.SHORT]
+        assert [cached for _, cached in first] == [False, False]
+        assert [cached for _, cached in second] == [True, True, True]
+        assert second[0][0] == first[1][0]
+        assert second[0][0][0].severity == "error"
+    
+    def test_parallel_results_match_serial(self, tmp_path):
+        """Test that worker processes give the same issues in the same order."""
+        contents = [self.SHORT, self.GOOD, self.SHORT + " Our hero waits.", self.GOOD + " Extra."]
+        
+        serial = list(batch_validation.validate_many(contents, workers=1))
+        parallel = [[vars(issue) for issue in issues]
+                    for issues, _ in ValidationResultCache(tmp_path).validate_many(contents, workers=2)]
+        
+        assert parallel == serial
+    
+    def test_cli_report_and_exit_code(self, temp_project_root, capsys):
+        """Test that validate --all writes one report line per chapter and fails on errors."""
+        manager = ChapterManager(temp_project_root)
+        manager.save_chapter_content(1, self.GOOD, validate=False)
+        report = temp_project_root / "report.jsonl"
+        
+        assert main(["--project-root", str(temp_project_root), "validate", "--all", "--report", str(report)]) == 0
+        
+        manager.save_chapter_content(2, self.SHORT, validate=False)
+        assert main(["--project-root", str(temp_project_root), "validate", "--all", "--report", str(report)]) == 1
+        
+        lines = [json.loads(line) for line in report.read_text(encoding='utf-8').splitlines()]
+        assert [(line['chapter'], line['cached'], line['summary']['errors']) for line in lines] == [(1, True, 0), (2, False, 1)]
+        assert "Validated 2 chapters (1 unchanged, from cache): 1 errors" in capsys.readouterr().out
+
+
+class TestStreamingValidator:
+    """Test suite for validating streamed generation output."""
+    
+    @staticmethod
+    def feed_all(validator, text, size):
+        """Feed text in fixed-size chunks; return the first issue."""
+        for i in range(0, len(text), size):
+            issue = validator.feed(text[i:i + size])
+            if issue:
+                return issue
+        return None
+    
+    def test_pattern_split_across_chunks(self):
+        """Test that a pattern is caught whatever the chunk boundaries."""
+        text = "The gate opened.\nShe stepped through.\nHere is Chapter 5 of the tale."
+        for size in (1, 2, 3, 7, 100):
+            issue = self.feed_all(StreamingValidator(), text, size)
+            assert issue is not None
+            assert issue.category == "ai_patterns"
+            assert "Here is Chapter" in issue.message
+            assert issue.line_number == 3
+    
+    def test_runaway_length(self):
+        """Test that words split across chunks are counted once."""
+        validator = StreamingValidator(max_word_count=10)
+        text = "lantern " * 10
+        
+        assert self.feed_all(validator, text, 3) is None
+        assert validator.word_count == 10
+        
+        issue = validator.feed("more")
+        assert issue.category == "word_count"
+        assert issue.severity == "error"
+    
+    def test_only_text_after_start_marker(self):
+        """Test that reasoning before the start marker is ignored."""
+        validator = StreamingValidator(start_marker="Final Answer:")
+        text = "Thought: Here is Chapter 5 in outline.\nFinal Answer: Here is Chapter 5, polished."
+        
+        issue = self.feed_all(validator, text, 4)
+        
+        assert "'Here is Chapter'" in issue.message
+        assert issue.line_number == 1
+        
+        validator.reset()
+        assert validator.feed("Thought: Here is Chapter 5") is None
+    
+    def test_only_openers_abort(self):
+        """Test that titles, dialogue and late mentions are left to the post-hoc warnings."""
+        prose = "She waited by the gate while the lanterns guttered one by one. " * 5
+        texts = [
+            "**Chapter 5: The Gate**\n\nThe rain fell.",
+            '"This story is a lie," she said. "This chapter of my life is over."',
+            prose + "Here is Chapter 5, he wrote in the margin.",
+        ]
+        for text in texts:
+            for size in (1, 7, 1000):
+                assert self.feed_all(StreamingValidator(), text, size) is None
+    
+    def test_guard_cancels_streamed_call(self):
+        """Test that the stream guard aborts on the first bad chunk and detaches afterwards."""
+        from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+        from src.mysticscribe.crew import guard_llm_stream
+        
+        with pytest.raises(GenerationAborted) as excinfo:
+            with guard_llm_stream(StreamingValidator()):
+                crewai_event_bus.emit(None, LLMStreamChunkEvent(chunk="Here is Chapter 5."))
+        
+        assert excinfo.value.issue.category == "ai_patterns"
+        crewai_event_bus.emit(None, LLMStreamChunkEvent(chunk="Here is Chapter 5."))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])